@@ -1,11 +1,13 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 
+# images/background_baked.png is produced by `PYTHONPATH=src python -m app.assets images`
+# (build_app.py runs it before PyInstaller).
 a = Analysis(
     ['src/app/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('/Users/jonaszeihemacbookpro/Desktop/dev/InkGrid/images/background.jpeg', 'images')],
+    datas=[('/Users/jonaszeihemacbookpro/Desktop/dev/InkGrid/images/background.jpeg', 'images'), ('/Users/jonaszeihemacbookpro/Desktop/dev/InkGrid/images/background_baked.png', 'images')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
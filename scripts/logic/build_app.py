@@ -30,7 +30,14 @@ def main():
     _rmdir(dist_path)
     _rmdir(build_path)
 
+    print("Baking GUI assets...")
+    _run_in_venv(
+        ["python", "-m", "app.assets", "images"],
+        env=dict(os.environ, PYTHONPATH=os.path.join(root, "src")),
+    )
+
     image_path = os.path.join(root, "images", "background.jpeg")
+    baked_path = os.path.join(root, "images", "background_baked.png")
     pyinstaller_cmd = [
         "pyinstaller",
         "--onefile",
@@ -41,13 +48,28 @@ def main():
 
     if os.path.exists(image_path):
         pyinstaller_cmd.append(f"--add-data={image_path}{os.pathsep}images")
+    if os.path.exists(baked_path):
+        pyinstaller_cmd.append(f"--add-data={baked_path}{os.pathsep}images")
 
     print("Building with PyInstaller...")
     _run_in_venv(pyinstaller_cmd)
     print("Build complete. Executable is in 'dist' folder.")
 
+    executable = os.path.join(
+        dist_path, "Application.exe" if os.name == "nt" else "Application"
+    )
+    print("Measuring start-up time...")
+    _run_in_venv(
+        [
+            "python",
+            "src/benchmarks/bench_importtime.py",
+            "--executable",
+            f'"{executable}"',
+        ]
+    )
+
 
-def _run_in_venv(cmd, check_install=False):
+def _run_in_venv(cmd, check_install=False, env=None):
     """
     Runs a command inside the virtual environment. If check_install=True and
     the module isn't installed, it installs it before continuing.
@@ -68,7 +90,7 @@ def _run_in_venv(cmd, check_install=False):
         if "Name: PyInstaller" not in ret.stdout:
             _install_pyinstaller(activate)
 
-    subprocess.run(shell_prefix + " ".join(cmd), shell=True, check=True)
+    subprocess.run(shell_prefix + " ".join(cmd), shell=True, check=True, env=env)
 
 
 def _install_pyinstaller(activate):
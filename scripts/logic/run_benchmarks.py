@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# (C) 2025 Jonas Zeihe, MIT License. Developer: Jonas Zeihe. Contact: JonasZeihe@gmail.com
+
+"""
+Runs the benchmark suite and compares the results with the stored baseline.
+Extra arguments are passed to the suite (e.g. --full, --update-baseline).
+"""
+
+import os
+import sys
+import subprocess
+
+
+def main():
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+    os.chdir(root)
+
+    os.environ["PYTHONPATH"] = os.path.join(root, "src")
+
+    venv_python = get_venv_python()
+
+    if not os.path.exists(venv_python):
+        print("No virtual environment found. Please initialize the project first.")
+        input("Press Enter to exit...")
+        sys.exit(1)
+
+    print("Running benchmarks...")
+    result = subprocess.run(
+        [venv_python, "-m", "benchmarks.suite"] + sys.argv[1:], env=os.environ
+    )
+
+    print()
+    if result.returncode:
+        print("Benchmarks found regressions. Press Enter to exit...")
+    else:
+        print("Benchmarks completed. Press Enter to exit...")
+    input()
+    sys.exit(result.returncode)
+
+
+def get_venv_python():
+    if os.name == "nt":
+        return os.path.join("venv", "Scripts", "python.exe")
+    else:
+        return os.path.join("venv", "bin", "python")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Background asset pipeline for the InkGrid GUI.
+The window background is the source JPEG resized to the window size and faded with a
+white overlay. The build bakes that result into a PNG that records a hash of its source,
+so the GUI can load it directly and only runs the pipeline when the asset is missing
+or stale.
+
+Usage: PYTHONPATH=src python -m app.assets [images_dir]
+"""
+
+import hashlib
+import os
+import sys
+
+BACKGROUND_SOURCE = "background.jpeg"
+BAKED_BACKGROUND = "background_baked.png"
+BACKGROUND_SIZE = (720, 520)
+BACKGROUND_OPACITY = 0.2
+SOURCE_HASH_KEY = "inkgrid-source-sha256"
+SETTINGS_KEY = "inkgrid-settings"
+
+
+def process_background(source_path: str):
+    """
+    Runs the full pipeline on the source image.
+
+    Returns:
+        PIL.Image.Image: RGBA image at BACKGROUND_SIZE with the white overlay applied.
+    """
+    from PIL import Image
+
+    img = Image.open(source_path).convert("RGBA")
+    img = img.resize(BACKGROUND_SIZE, Image.Resampling.LANCZOS)
+    return adjust_opacity(img, BACKGROUND_OPACITY)
+
+
+def adjust_opacity(img, alpha):
+    from PIL import Image
+
+    overlay = Image.new("RGBA", img.size, (255, 255, 255, int(255 * alpha)))
+    return Image.alpha_composite(img, overlay)
+
+
+def source_hash(source_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bake_background(source_path: str, baked_path: str) -> str:
+    """
+    Writes the processed background as a PNG tagged with the source hash and settings.
+
+    Args:
+        source_path (str): Path to the source JPEG.
+        baked_path (str): Destination PNG path.
+
+    Returns:
+        str: baked_path
+    """
+    from PIL.PngImagePlugin import PngInfo
+
+    metadata = PngInfo()
+    metadata.add_text(SOURCE_HASH_KEY, source_hash(source_path))
+    metadata.add_text(SETTINGS_KEY, _settings_signature())
+    temp_path = f"{baked_path}.{os.getpid()}.tmp"
+    process_background(source_path).save(temp_path, format="PNG", pnginfo=metadata)
+    os.replace(temp_path, baked_path)
+    return baked_path
+
+
+def load_baked_background(baked_path: str, source_path: str = None):
+    """
+    Opens a baked background if it is current.
+
+    Args:
+        baked_path (str): Path to the baked PNG.
+        source_path (str, optional): Source JPEG. When given, its hash must match the
+          one recorded in the PNG; when the source is not shipped, the PNG is trusted.
+
+    Returns:
+        PIL.Image.Image or None: The baked image, or None if it is unreadable or stale.
+    """
+    from PIL import Image
+
+    try:
+        img = Image.open(baked_path)
+    except (OSError, ValueError):
+        return None
+    if (
+        img.size != BACKGROUND_SIZE
+        or img.info.get(SETTINGS_KEY) != _settings_signature()
+    ):
+        return None
+    if source_path and img.info.get(SOURCE_HASH_KEY) != source_hash(source_path):
+        return None
+    return img
+
+
+def _settings_signature() -> str:
+    return f"{BACKGROUND_SIZE[0]}x{BACKGROUND_SIZE[1]}@{BACKGROUND_OPACITY}"
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    images_dir = argv[0] if argv else "images"
+    source_path = os.path.join(images_dir, BACKGROUND_SOURCE)
+    if not os.path.exists(source_path):
+        print(f"No background found at {source_path}; nothing to bake.")
+        return 0
+    baked_path = os.path.join(images_dir, BAKED_BACKGROUND)
+    if load_baked_background(baked_path, source_path) is not None:
+        print(f"Background asset is up to date: {baked_path}")
+        return 0
+    print(f"Baked background asset: {bake_background(source_path, baked_path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,576 @@
+"""
+Headless batch rendering for InkGrid.
+Collects palette files from directories and glob patterns and renders them
+into SVGs (and optional Figma JSON, other token formats and PNG previews) across a
+process pool, without opening the GUI. Output mirrors the subdirectories the files
+were found in, so equally named palettes do not overwrite each other. Files with
+identical content are rendered once and their output is copied to the other names;
+groups that recur across palettes are serialized once per worker by the string
+backends (see app.svg_writer.GroupTemplates). Large palettes that only need an SVG and
+Figma JSON are streamed from disk instead of being parsed into memory.
+"""
+
+import os
+import glob
+import hashlib
+import shutil
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.generate import generate_svg_from_groups, generate_svg_streaming
+from app.palette import Palette
+from app.export import figma_json_path, stream_json_for_figma
+from app.exporters import export_formats, exporter_path
+from app.cache import RenderCache
+from app.profiling import PROFILER, stage
+from app.raster import render_png
+from app.svg_writer import GroupTemplates, swatch_fragment
+from app.utils import compressed_path
+
+PALETTE_EXTENSION = ".txt"
+TEMPLATE_BACKENDS = ("string", "shared")
+# Palette files at least this large are streamed by the string backend when no output
+# other than the SVG and the Figma JSON needs the parsed palette.
+STREAM_THRESHOLD = 4 * 1024 * 1024
+
+BatchResult = namedtuple(
+    "BatchResult",
+    [
+        "path",
+        "svg_path",
+        "json_path",
+        "seconds",
+        "error",
+        "cached",
+        "timings",
+        "duplicate_of",
+        "fragments",
+    ],
+    defaults=(False, None, None, None),
+)
+
+# One per process, so each worker reuses the groups it has already serialized.
+GROUP_TEMPLATES = GroupTemplates()
+
+
+def collect_palette_files(inputs) -> list:
+    """
+    Expands files, directories and glob patterns into a list of palette files.
+
+    Directories are searched recursively for *.txt files. Duplicates are dropped
+    while keeping the first occurrence, so the order of the inputs is preserved.
+
+    Args:
+        inputs (list): File paths, directory paths or glob patterns.
+
+    Returns:
+        list: Absolute paths of all matching palette files.
+    """
+    return list(collect_palette_sources(inputs))
+
+
+def collect_palette_sources(inputs) -> OrderedDict:
+    """
+    Like collect_palette_files, but also returns where each file sits below the
+    directory or the fixed part of the glob pattern it was found through.
+
+    Returns:
+        OrderedDict: Absolute path of each palette file mapped to its relative
+          subdirectory ("" for files given directly or found at the top level).
+    """
+    sources = OrderedDict()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            root = entry
+            pattern = os.path.join(entry, "**", f"*{PALETTE_EXTENSION}")
+            matches = sorted(glob.glob(pattern, recursive=True))
+        elif glob.has_magic(entry):
+            root = entry
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+            matches = sorted(glob.glob(entry, recursive=True))
+        else:
+            root = None
+            matches = [entry]
+        for match in matches:
+            if not os.path.isfile(match):
+                continue
+            path = os.path.abspath(match)
+            subdir = ""
+            if root is not None:
+                subdir = os.path.relpath(
+                    os.path.dirname(path), os.path.abspath(root or os.curdir)
+                )
+                if subdir == os.curdir or subdir.startswith(os.pardir):
+                    subdir = ""
+            sources.setdefault(path, subdir)
+    return sources
+
+
+def plan_outputs(
+    inputs,
+    output_dir: str,
+    export_json: bool = True,
+    formats=(),
+    compression: str = None,
+    png_scale: float = None,
+) -> tuple:
+    """
+    Assigns every palette file its output directory, mirroring the subdirectory it was
+    found in, creates the directories and finds files whose output names would
+    overwrite those of an earlier file (e.g. two brand.txt given directly).
+
+    Returns:
+        tuple: (OrderedDict of path -> output directory for the files to render,
+          dict of colliding path -> the earlier path that claimed its outputs)
+    """
+    dirs = OrderedDict()
+    collisions = {}
+    claimed = {}
+    for path, subdir in collect_palette_sources(inputs).items():
+        directory = os.path.join(output_dir, subdir) if subdir else output_dir
+        targets = output_targets(
+            path, directory, export_json, formats, compression, png_scale
+        )
+        targets = [os.path.abspath(target) for target in targets.values()]
+        owner = next((claimed[t] for t in targets if t in claimed), None)
+        if owner is not None:
+            collisions[path] = owner
+            continue
+        claimed.update(dict.fromkeys(targets, path))
+        dirs[path] = directory
+    for directory in set(dirs.values()) | {output_dir}:
+        os.makedirs(directory, exist_ok=True)
+    return dirs, collisions
+
+
+def render_file(
+    path: str,
+    output_dir: str,
+    export_json: bool = True,
+    svg_path: str = None,
+    cache: RenderCache = None,
+    compact_json: bool = False,
+    formats=(),
+    backend: str = "svgwrite",
+    compression: str = None,
+    compression_level: int = None,
+    png_scale: float = None,
+) -> BatchResult:
+    """
+    Renders a single palette file. Runs inside the worker processes.
+
+    Args:
+        path (str): Palette file to render.
+        output_dir (str): Directory for the SVG and JSON output.
+        export_json (bool): Whether to export JSON for the Figma plugin.
+        svg_path (str, optional): SVG destination. Defaults to <output_dir>/<name>.svg.
+        cache (RenderCache, optional): Cache to reuse output of unchanged palettes from.
+        compact_json (bool): Write the Figma JSON without indentation.
+        formats (iterable): Additional export formats from app.exporters, written
+          concurrently with the Figma JSON from the same parsed palette.
+        backend (str): SVG backend, one of app.generate.BACKENDS.
+        compression (str, optional): Compress every output while writing it (see
+          app.utils.open_output); default paths get the matching suffix.
+        compression_level (int, optional): Level for the compressor.
+        png_scale (float, optional): Also render <output_dir>/<name>.png at this scale
+          (see app.raster).
+
+    Returns:
+        BatchResult: Output paths and wall time; error is set if rendering failed.
+    """
+    start = time.perf_counter()
+    targets = output_targets(
+        path, output_dir, export_json, formats, compression, png_scale, svg_path
+    )
+    svg_path = targets["svg"]
+    formats = [name for name in formats if name != "figma"]
+
+    if cache is not None:
+        key = cache.key_for(
+            path,
+            cache_options(
+                compact_json, backend, compression, compression_level, png_scale
+            ),
+        )
+        if cache.fetch(key, targets):
+            return BatchResult(
+                path,
+                svg_path,
+                targets.get("json"),
+                time.perf_counter() - start,
+                None,
+                True,
+            )
+
+    if (
+        backend == "string"
+        and not formats
+        and not png_scale
+        and os.path.getsize(path) >= STREAM_THRESHOLD
+    ):
+        try:
+            json_path = _stream_file(
+                path,
+                output_dir,
+                svg_path,
+                export_json,
+                compact_json,
+                compression,
+                compression_level,
+            )
+        except ValueError as error:
+            return BatchResult(
+                path, None, None, time.perf_counter() - start, str(error)
+            )
+        if cache is not None:
+            cache.store(key, targets)
+        return BatchResult(path, svg_path, json_path, time.perf_counter() - start, None)
+
+    colors = Palette.from_file(path)
+    if not colors:
+        return BatchResult(
+            path, None, None, time.perf_counter() - start, "No valid colors found."
+        )
+
+    generate_svg_from_groups(
+        colors,
+        path,
+        output_file=svg_path,
+        backend=backend,
+        compression=compression,
+        compression_level=compression_level,
+        group_templates=GROUP_TEMPLATES if backend in TEMPLATE_BACKENDS else None,
+    )
+    if png_scale:
+        render_png(colors, targets["png"], png_scale)
+    exports = (["figma"] if export_json else []) + formats
+    artifacts = export_formats(
+        colors,
+        path,
+        output_dir,
+        exports,
+        compact_json,
+        compression,
+        compression_level,
+    )
+    json_path = artifacts.get("figma")
+    if cache is not None:
+        cache.store(key, targets)
+
+    return BatchResult(path, svg_path, json_path, time.perf_counter() - start, None)
+
+
+def _stream_file(
+    path, output_dir, svg_path, export_json, compact_json, compression, level
+):
+    """
+    Writes the SVG and the Figma JSON of path straight from the file, holding at most
+    one group in memory. The SVG matches the string backend's; groups split across
+    the file keep their swatches in file order.
+
+    Returns:
+        str: Path of the Figma JSON, or None if export_json is False.
+
+    Raises:
+        ValueError: If the file has no valid colors.
+    """
+    generate_svg_streaming(path, svg_path, compression, level)
+    if not export_json:
+        return None
+    return stream_json_for_figma(path, output_dir, compact_json, compression, level)
+
+
+def cache_options(
+    compact_json: bool = False,
+    backend: str = "svgwrite",
+    compression: str = None,
+    compression_level: int = None,
+    png_scale: float = None,
+) -> tuple:
+    """
+    Returns the render options that change the output, for RenderCache.key_for.
+    """
+    options = ("compact-json",) if compact_json else ()
+    if backend != "svgwrite":
+        options += (backend,)
+    if compression:
+        options += (compression, compression_level)
+    if png_scale:
+        options += ("png", png_scale)
+    return options
+
+
+def output_targets(
+    path: str,
+    output_dir: str,
+    export_json: bool = True,
+    formats=(),
+    compression: str = None,
+    png_scale: float = None,
+    svg_path: str = None,
+) -> dict:
+    """
+    Returns the output paths render_file writes for path, keyed by artifact
+    ("svg", "json", one per format and "png").
+    """
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    if svg_path is None:
+        svg_path = compressed_path(
+            os.path.join(output_dir, f"{base_name}.svg"), compression
+        )
+    targets = {"svg": svg_path}
+    if export_json:
+        targets["json"] = compressed_path(
+            figma_json_path(path, output_dir), compression
+        )
+    for name in formats:
+        if name != "figma":
+            targets[name] = compressed_path(
+                exporter_path(name, path, output_dir), compression
+            )
+    if png_scale:
+        targets["png"] = os.path.join(output_dir, f"{base_name}.png")
+    return targets
+
+
+def group_duplicates(paths) -> OrderedDict:
+    """
+    Groups palette files by a SHA-256 hash of their content.
+
+    Returns:
+        OrderedDict: The first path of each distinct content (in input order) mapped
+          to the later paths with the same content. Unreadable files stand alone.
+    """
+    groups = OrderedDict()
+    first_by_digest = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).digest()
+        except OSError:
+            groups[path] = []
+            continue
+        first = first_by_digest.setdefault(digest, path)
+        if first == path:
+            groups[path] = []
+        else:
+            groups[first].append(path)
+    return groups
+
+
+def run_batch(
+    inputs,
+    output_dir: str,
+    workers: int = None,
+    export_json: bool = True,
+    logger=None,
+    cache: RenderCache = None,
+    compact_json: bool = False,
+    formats=(),
+    backend: str = "svgwrite",
+    compression: str = None,
+    compression_level: int = None,
+    png_scale: float = None,
+) -> list:
+    """
+    Renders all palette files matched by inputs, fanned out over a process pool.
+
+    Args:
+        inputs (list): File paths, directory paths or glob patterns.
+        output_dir (str): Directory for the SVG and JSON output.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+          A value of 1 renders in the current process.
+        export_json (bool): Whether to export JSON for the Figma plugin.
+        logger (Logger, optional): Logger for per-file timings and the summary.
+        cache (RenderCache, optional): Cache shared by all workers; evicted once at the end.
+        compact_json (bool): Write the Figma JSON without indentation.
+        formats (iterable): Additional export formats from app.exporters.
+        backend (str): SVG backend, one of app.generate.BACKENDS.
+        compression (str, optional): Compress every output while writing it.
+        compression_level (int, optional): Level for the compressor.
+        png_scale (float, optional): Also render PNG previews at this scale.
+
+    Returns:
+        list: One BatchResult per palette file, in completion order.
+    """
+    dirs, collisions = plan_outputs(
+        inputs, output_dir, export_json, formats, compression, png_scale
+    )
+    duplicates = group_duplicates(dirs)
+    if logger:
+        count = len(dirs) + len(collisions)
+        skipped = len(dirs) - len(duplicates)
+        logger.info(
+            f"Batch: {count} palette files ({skipped} duplicates) -> {output_dir}"
+        )
+
+    options = {
+        "compact_json": compact_json,
+        "formats": formats,
+        "backend": backend,
+        "compression": compression,
+        "compression_level": compression_level,
+        "png_scale": png_scale,
+    }
+    results = [
+        _report(collision_result(path, owner), logger)
+        for path, owner in collisions.items()
+    ]
+    PROFILER.reset()
+    start = time.perf_counter()
+
+    def collect(result):
+        results.append(_report(result, logger))
+        for path in duplicates[result.path]:
+            copy = _fan_out(result, path, dirs, export_json, **options)
+            results.append(_report(copy, logger))
+
+    if workers == 1 or len(duplicates) <= 1:
+        for path in duplicates:
+            collect(_safe_render(path, dirs[path], export_json, cache, **options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    render_task,
+                    path,
+                    dirs[path],
+                    export_json,
+                    cache,
+                    **options,
+                ): path
+                for path in duplicates
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    result = BatchResult(futures[future], None, None, 0.0, str(error))
+                if result.timings:
+                    PROFILER.merge(result.timings)
+                collect(result)
+    elapsed = time.perf_counter() - start
+
+    if cache is not None:
+        rendered = [r for r in results if r.duplicate_of is None]
+        cache.hits = sum(1 for r in rendered if r.cached)
+        cache.misses = len(rendered) - cache.hits
+        cache.evict()
+        cache.log_stats()
+    if logger:
+        failed = sum(1 for r in results if r.error)
+        rate = len(results) / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Batch finished: {len(results) - failed} rendered, {failed} failed "
+            f"in {elapsed:.2f}s ({rate:.1f} files/s)"
+        )
+    _log_fragment_stats(results, logger)
+    PROFILER.log_summary(logger)
+    return results
+
+
+def render_task(
+    path: str,
+    output_dir: str,
+    export_json: bool = True,
+    cache: RenderCache = None,
+    svg_path: str = None,
+    **options,
+) -> BatchResult:
+    """
+    Process pool entry point: render_file, with the stage timings of this render
+    attached to the result so the parent can merge them (see app.profiling), and the
+    swatch fragment cache hits and misses it caused.
+    Keyword options (compact_json, formats, backend, compression...) are passed to
+    render_file.
+    """
+    PROFILER.reset()
+    before = swatch_fragment.cache_info()
+    result = render_file(path, output_dir, export_json, svg_path, cache, **options)
+    return result._replace(timings=PROFILER.drain(), fragments=_fragments_since(before))
+
+
+def _safe_render(path, output_dir, export_json, cache, **options):
+    before = swatch_fragment.cache_info()
+    try:
+        result = render_file(path, output_dir, export_json, cache=cache, **options)
+    except Exception as error:
+        return BatchResult(path, None, None, 0.0, str(error))
+    return result._replace(fragments=_fragments_since(before))
+
+
+def _fragments_since(before) -> tuple:
+    info = swatch_fragment.cache_info()
+    return info.hits - before.hits, info.misses - before.misses
+
+
+def _log_fragment_stats(results, logger) -> None:
+    """
+    Logs the swatch fragment cache hit rate summed over the renders of all workers.
+    """
+    counts = [r.fragments for r in results if r.fragments]
+    hits = sum(h for h, _ in counts)
+    misses = sum(m for _, m in counts)
+    if logger and hits + misses:
+        rate = hits / (hits + misses) * 100
+        logger.info(
+            f"Swatch fragments: {hits} hits, {misses} misses ({rate:.0f}% hit rate)"
+        )
+
+
+def collision_result(path: str, owner: str) -> BatchResult:
+    """
+    Failed result for a file whose output names are already taken by owner.
+    """
+    return BatchResult(
+        path, None, None, 0.0, f"Output names collide with those of {owner}"
+    )
+
+
+def _fan_out(result, path, dirs, export_json, **options) -> BatchResult:
+    """
+    Copies the output of result to the output names of path, a file with the same
+    content, or passes on its error. dirs maps both files to their output directory.
+    """
+    if result.error:
+        return BatchResult(
+            path, None, None, 0.0, result.error, duplicate_of=result.path
+        )
+    start = time.perf_counter()
+    keys = ("formats", "compression", "png_scale")
+    settings = [options.get(key) for key in keys]
+    sources = output_targets(result.path, dirs[result.path], export_json, *settings)
+    sources["svg"] = result.svg_path
+    targets = output_targets(path, dirs[path], export_json, *settings)
+    try:
+        with stage("fan_out"):
+            for name, target in targets.items():
+                source = sources[name]
+                if os.path.abspath(source) != os.path.abspath(target):
+                    shutil.copyfile(source, target)
+    except OSError as error:
+        return BatchResult(path, None, None, 0.0, str(error), duplicate_of=result.path)
+    return BatchResult(
+        path,
+        targets["svg"],
+        targets.get("json"),
+        time.perf_counter() - start,
+        None,
+        duplicate_of=result.path,
+    )
+
+
+def _report(result, logger):
+    if logger:
+        if result.error:
+            logger.error(f"Failed {result.path}: {result.error}")
+        else:
+            if result.duplicate_of:
+                source = f"copy of {result.duplicate_of}"
+            else:
+                source = "cache" if result.cached else "rendered"
+            logger.info(
+                f"Done {result.path} in {result.seconds * 1000:.1f} ms ({source})"
+            )
+    return result
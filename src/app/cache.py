@@ -0,0 +1,154 @@
+"""
+Content-addressed output cache for InkGrid.
+Stores rendered SVG, Figma JSON and token files under a hash of the palette file content
+and the layout constants, so unchanged palettes are copied instead of re-rendered.
+The cache is bounded in size and evicts least recently used entries.
+"""
+
+import hashlib
+import os
+import shutil
+from app.exporters import FORMATS
+from app.generate import layout_signature
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".inkgrid", "cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ARTIFACTS = ("svg", "json", "png") + tuple(name for name in FORMATS if name != "figma")
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered artifacts keyed by palette content and layout.
+    Safe to share between processes: entries are written atomically and each
+    process keeps its own hit/miss counters.
+    """
+
+    def __init__(
+        self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, logger=None
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["logger"] = None
+        return state
+
+    def key_for(self, input_file: str, options=()) -> str:
+        """
+        Hashes the raw palette file together with the layout constants and any
+        render options that change the output.
+
+        Args:
+            input_file (str): Path to the palette file.
+            options (tuple): Extra values that influence the rendered output.
+
+        Returns:
+            str: Hex digest identifying the rendered artifacts.
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((layout_signature(), tuple(options))).encode("utf-8"))
+        with open(input_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def fetch(self, key: str, targets: dict, link: bool = False) -> bool:
+        """
+        Copies (or hard-links) cached artifacts to their target paths.
+
+        Args:
+            key (str): Cache key from key_for.
+            targets (dict): Artifact name ("svg", "json", "png" or an export format) to destination path.
+            link (bool): Hard-link instead of copying where the filesystem allows it.
+
+        Returns:
+            bool: True on a hit; False if any requested artifact is missing.
+        """
+        entries = {name: self._entry_path(key, name) for name in targets}
+        if not all(os.path.exists(entry) for entry in entries.values()):
+            self.misses += 1
+            self._log(f"Cache miss: {key[:12]}")
+            return False
+        for name, entry in entries.items():
+            _place(entry, targets[name], link)
+            os.utime(entry)
+        self.hits += 1
+        self._log(f"Cache hit: {key[:12]}")
+        return True
+
+    def store(self, key: str, artifacts: dict) -> None:
+        """
+        Copies freshly rendered artifacts into the cache.
+
+        Args:
+            key (str): Cache key from key_for.
+            artifacts (dict): Artifact name ("svg", "json", "png" or an export format) to rendered file path.
+        """
+        for name, path in artifacts.items():
+            entry = self._entry_path(key, name)
+            temp_path = f"{entry}.{os.getpid()}.tmp"
+            shutil.copyfile(path, temp_path)
+            os.replace(temp_path, entry)
+
+    def evict(self) -> int:
+        """
+        Removes least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of files removed.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            self._log(f"Cache evicted {removed} files")
+        return removed
+
+    def log_stats(self) -> None:
+        if self.logger:
+            lookups = self.hits + self.misses
+            rate = self.hits / lookups * 100 if lookups else 0.0
+            self.logger.info(
+                f"Render cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+            )
+
+    def _entry_path(self, key: str, name: str) -> str:
+        if name not in ARTIFACTS:
+            raise ValueError(f"Unknown cache artifact: {name}")
+        return os.path.join(self.directory, f"{key}.{name}")
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.debug(message)
+
+
+def _place(source: str, target: str, link: bool) -> None:
+    if os.path.exists(target):
+        os.remove(target)
+    if link:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source, target)
@@ -3,33 +3,181 @@
 JSON generation for InkGrid.
 Creates a JSON file for the InkGrid-Tokens Figma plugin,
 to import it as color styles directly in Figma.
+Group objects are written one at a time, either indented (identical to json.dump with
+indent=2) or compact for machine consumers.
 """
 
 import json
 import os
 from collections import defaultdict
+from app.palette import Palette
+from app.profiling import timed
+from app.utils import iter_color_file, compressed_path, open_output
 
 
-def export_json_for_figma(colors, input_filename: str, output_dir: str):
+@timed("export_json")
+def export_json_for_figma(
+    colors,
+    input_filename: str,
+    output_dir: str,
+    compact: bool = False,
+    compression: str = None,
+    compression_level: int = None,
+):
     """
     Converts color list into plugin-compatible JSON and writes to file.
 
     Args:
-        colors (list): List of (main_group, full_label, hex) tuples
+        colors (Palette or list): Palette or list of (main_group, full_label, hex) tuples
         input_filename (str): Used to generate a matching filename
         output_dir (str): Directory where JSON will be saved
+        compact (bool): Write without indentation or whitespace
+        compression (str, optional): Compress while writing, adding the matching suffix
+          (see app.utils.open_output)
+        compression_level (int, optional): Level for the compressor
+
+    Returns:
+        str: Path of the written JSON file.
     """
-    grouped = defaultdict(dict)
-    for group, label, hex_code in colors:
-        grouped[group][label] = hex_code
+    return _export_json(
+        colors, input_filename, output_dir, compact, compression, compression_level
+    )
 
-    output_data = dict(grouped)
 
-    base_name = os.path.splitext(os.path.basename(input_filename))[0]
-    json_filename = f"{base_name}_figma_tokens.json"
-    json_path = os.path.join(output_dir, json_filename)
+@timed("export_json")
+def stream_json_for_figma(
+    input_file: str,
+    output_dir: str,
+    compact: bool = False,
+    compression: str = None,
+    compression_level: int = None,
+):
+    """
+    Exports a color file straight to plugin JSON, holding only one group in memory.
+
+    Each group is written as soon as its block of lines ends. If a group reappears
+    later in the file, its entries have to be merged, so the partial output is
+    discarded and the palette is exported in memory with export_json_for_figma.
+
+    Args:
+        input_file (str): Path to the color file.
+        output_dir (str): Directory where JSON will be saved
+        compact (bool): Write without indentation or whitespace
+        compression (str, optional): Compress while writing (see app.utils.open_output)
+        compression_level (int, optional): Level for the compressor
+
+    Returns:
+        str: Path of the written JSON file.
+    """
+    json_path = compressed_path(figma_json_path(input_file, output_dir), compression)
+    try:
+        with open_output(json_path, compression, compression_level) as f:
+            write_json_groups(f, _iter_group_blocks(input_file), compact)
+    except _SplitGroup:
+        return _export_json(
+            list(iter_color_file(input_file)),
+            input_file,
+            output_dir,
+            compact,
+            compression,
+            compression_level,
+        )
+    return json_path
+
+
+def write_json_groups(fileobj, groups, compact: bool = False) -> None:
+    """
+    Writes {group: {label: hex}} as JSON, one group object at a time.
+
+    Args:
+        fileobj: Writable text file object.
+        groups (iterable): (group name, {label: hex}) pairs; group names must be unique.
+        compact (bool): Use json.dump's compact separators instead of indent=2.
+    """
+    if compact:
+        group_prefix, entry_prefix, group_suffix, key_separator = "", "", "", ":"
+    else:
+        group_prefix, entry_prefix, group_suffix, key_separator = (
+            "\n  ",
+            "\n    ",
+            "\n  ",
+            ": ",
+        )
+    dumps = json.dumps
+    write = fileobj.write
+    write("{")
+    separator = ""
+    for group, entries in groups:
+        write(f"{separator}{group_prefix}{dumps(group)}{key_separator}")
+        separator = ","
+        if not entries:
+            write("{}")
+            continue
+        write("{")
+        write(
+            ",".join(
+                f"{entry_prefix}{dumps(label)}{key_separator}{dumps(hex_code)}"
+                for label, hex_code in entries.items()
+            )
+        )
+        write(f"{group_suffix}}}")
+    if separator and not compact:
+        write("\n")
+    write("}")
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2)
+
+def _export_json(
+    colors, input_filename, output_dir, compact, compression, compression_level
+):
+    """
+    Untimed body of export_json_for_figma, shared with the stream_json_for_figma
+    fallback so that a fallback export is recorded once.
+    """
+    if isinstance(colors, Palette):
+        groups = ((group, dict(entries)) for group, entries in colors.items())
+    else:
+        grouped = defaultdict(dict)
+        for group, label, hex_code in colors:
+            grouped[group][label] = hex_code
+        groups = grouped.items()
+
+    json_path = compressed_path(
+        figma_json_path(input_filename, output_dir), compression
+    )
+
+    with open_output(json_path, compression, compression_level) as f:
+        write_json_groups(f, groups, compact)
 
     return json_path
+
+
+class _SplitGroup(Exception):
+    """
+    Raised when a group reappears after another group, so it cannot be streamed.
+    """
+
+
+def _iter_group_blocks(input_file: str):
+    seen = set()
+    current = None
+    entries = {}
+    for group, label, hex_code in iter_color_file(input_file):
+        if group != current:
+            if group in seen:
+                raise _SplitGroup(group)
+            seen.add(group)
+            if current is not None:
+                yield current, entries
+            current = group
+            entries = {}
+        entries[label] = hex_code
+    if current is not None:
+        yield current, entries
+
+
+def figma_json_path(input_filename: str, output_dir: str) -> str:
+    """
+    Returns the path export_json_for_figma writes for input_filename.
+    """
+    base_name = os.path.splitext(os.path.basename(input_filename))[0]
+    return os.path.join(output_dir, f"{base_name}_figma_tokens.json")
@@ -0,0 +1,225 @@
+"""
+Token exporters for InkGrid.
+A registry of output formats (Figma plugin JSON, CSS custom properties, SCSS variables,
+a Tailwind config and Style Dictionary tokens) that all read the same parsed Palette,
+so one parse produces every artifact. Several formats are written concurrently.
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from app.export import write_json_groups
+from app.palette import Palette
+from app.profiling import stage
+from app.utils import compressed_path, open_output
+
+Exporter = namedtuple("Exporter", ["name", "suffix", "write", "stage"])
+
+EXPORTERS = {}
+
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def register_exporter(name: str, suffix: str, stage_name: str = None):
+    """
+    Decorator registering write(palette, fileobj, compact) as an output format.
+
+    Args:
+        name (str): Format name used on the command line.
+        suffix (str): Appended to the palette's base name to form the output file name.
+        stage_name (str, optional): Profiling stage. Defaults to export_<name>.
+    """
+
+    def decorator(write):
+        EXPORTERS[name] = Exporter(name, suffix, write, stage_name or f"export_{name}")
+        return write
+
+    return decorator
+
+
+def exporter_path(name: str, input_filename: str, output_dir: str) -> str:
+    """
+    Returns the path the given format writes for input_filename.
+    """
+    base_name = os.path.splitext(os.path.basename(input_filename))[0]
+    return os.path.join(output_dir, f"{base_name}{_get_exporter(name).suffix}")
+
+
+def export_formats(
+    palette: Palette,
+    input_filename: str,
+    output_dir: str,
+    formats,
+    compact: bool = False,
+    compression: str = None,
+    compression_level: int = None,
+) -> dict:
+    """
+    Writes the palette in every requested format, concurrently when there are several.
+
+    Args:
+        palette (Palette): The parsed palette shared by all exporters.
+        input_filename (str): Used to generate matching filenames.
+        output_dir (str): Directory where the files are written.
+        formats (iterable): Names of registered formats.
+        compact (bool): Ask formats that support it for minified output.
+        compression (str, optional): Compress every file while writing, adding the
+          matching suffix (see app.utils.open_output).
+        compression_level (int, optional): Level for the compressor.
+
+    Returns:
+        dict: Format name to written path, in the requested order.
+
+    Raises:
+        ValueError: If a format is not registered.
+    """
+    exporters = [_get_exporter(name) for name in formats]
+    jobs = [
+        (
+            exporter,
+            compressed_path(
+                exporter_path(exporter.name, input_filename, output_dir), compression
+            ),
+        )
+        for exporter in exporters
+    ]
+    options = (compact, compression, compression_level)
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [
+                pool.submit(_write_format, exporter, palette, path, *options)
+                for exporter, path in jobs
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for exporter, path in jobs:
+            _write_format(exporter, palette, path, *options)
+    return {exporter.name: path for exporter, path in jobs}
+
+
+def _get_exporter(name: str) -> Exporter:
+    try:
+        return EXPORTERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown export format: {name} (available: {', '.join(EXPORTERS)})"
+        ) from None
+
+
+def _write_format(exporter, palette, path, compact, compression, level):
+    with stage(exporter.stage):
+        with open_output(path, compression, level) as f:
+            exporter.write(palette, f, compact)
+
+
+def slugify(text: str) -> str:
+    """
+    Lowercases text and joins its alphanumeric runs with hyphens.
+    """
+    return _NON_SLUG.sub("-", text.lower()).strip("-")
+
+
+def _shade_name(group: str, label: str) -> str:
+    """
+    Returns the part of a label after its group name, e.g. "1-light" for
+    "Primary 1 (Light)" in group "Primary", or "DEFAULT" if nothing is left.
+    """
+    rest = label[len(group) :] if label.startswith(group) else label
+    return slugify(rest) or "DEFAULT"
+
+
+def _unique(base: str, used: set) -> str:
+    """
+    Returns base, or base with the first free numeric suffix ("primary-1-2") if it
+    is already in used, and adds the result to used.
+    """
+    name = base
+    count = 1
+    while name in used:
+        count += 1
+        name = f"{base}-{count}"
+    used.add(name)
+    return name
+
+
+def _variables(palette: Palette):
+    """
+    Yields (variable name, hex) per color. Names that would start with a digit get a
+    "color-" prefix (invalid in SCSS), and labels that slugify to a name already used
+    (e.g. "Primary 1" and "primary-1") get a numeric suffix ("primary-1-2").
+    """
+    used = set()
+    for _, label, hex_code in palette:
+        base = slugify(label) or "color"
+        if base[0].isdigit():
+            base = f"color-{base}"
+        yield _unique(base, used), hex_code
+
+
+def _nested_keys(palette: Palette):
+    """
+    Yields (group key, [(shade key, hex), ...]) per group for the nested exporters.
+    Group keys fall back to "color" and, like shade keys within a group, get a
+    numeric suffix when they collide ("Primary 1 (Light)" and "Primary 1 Light").
+    """
+    groups = set()
+    for group, entries in palette.items():
+        shades = set()
+        yield _unique(slugify(group) or "color", groups), [
+            (_unique(_shade_name(group, label), shades), hex_code)
+            for label, hex_code in entries
+        ]
+
+
+@register_exporter("figma", "_figma_tokens.json", "export_json")
+def write_figma(palette, fileobj, compact=False):
+    groups = ((group, dict(entries)) for group, entries in palette.items())
+    write_json_groups(fileobj, groups, compact)
+
+
+@register_exporter("css", ".css")
+def write_css(palette, fileobj, compact=False):
+    fileobj.write(":root {\n")
+    for name, hex_code in _variables(palette):
+        fileobj.write(f"  --{name}: {hex_code};\n")
+    fileobj.write("}\n")
+
+
+@register_exporter("scss", ".scss")
+def write_scss(palette, fileobj, compact=False):
+    for name, hex_code in _variables(palette):
+        fileobj.write(f"${name}: {hex_code};\n")
+
+
+@register_exporter("tailwind", ".tailwind.js")
+def write_tailwind(palette, fileobj, compact=False):
+    colors = {group: dict(shades) for group, shades in _nested_keys(palette)}
+    body = json.dumps(colors, indent=None if compact else 2)
+    fileobj.write(
+        "module.exports = {\n  theme: {\n    extend: {\n      colors: "
+        + body.replace("\n", "\n      ")
+        + ",\n    },\n  },\n};\n"
+    )
+
+
+@register_exporter("style-dictionary", ".tokens.json")
+def write_style_dictionary(palette, fileobj, compact=False):
+    tokens = {
+        "color": {
+            group: {
+                shade: {"value": hex_code, "type": "color"}
+                for shade, hex_code in shades
+            }
+            for group, shades in _nested_keys(palette)
+        }
+    }
+    if compact:
+        json.dump(tokens, fileobj, separators=(",", ":"))
+    else:
+        json.dump(tokens, fileobj, indent=2)
+
+
+FORMATS = tuple(EXPORTERS)
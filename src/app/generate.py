@@ -6,12 +6,13 @@ with dynamic grouping by category, optimal positioning, and a clean layer struct
 """
 
 import os
-import re
 import math
 from datetime import datetime
 from collections import OrderedDict
-import svgwrite
-from app.utils import sanitize_id
+from app.utils import sanitize_id, compressed_path, open_output
+from app.palette_parser import parse_file, format_hex
+from app.palette import Palette, is_canonical_hex
+from app.profiling import stage, timed
 
 SWATCH_WIDTH = 120
 SWATCH_HEIGHT = 120
@@ -26,14 +27,48 @@ LABEL_OFFSET_X = 10
 HEX_OFFSET_X = 10
 LABEL_OFFSET_Y = 5
 HEX_OFFSET_Y = 15
+BACKENDS = ("svgwrite", "string", "shared", "compact")
 
 
+def __getattr__(name):
+    # svgwrite takes a large share of start-up time, so it is only imported
+    # when the svgwrite backend is used (or app.generate.svgwrite is accessed).
+    if name == "svgwrite":
+        import svgwrite
+
+        return svgwrite
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def layout_signature() -> tuple:
+    """
+    Returns the layout constants that affect the rendered output, e.g. for cache keys.
+    """
+    return (
+        SWATCH_WIDTH,
+        SWATCH_HEIGHT,
+        MAX_SWATCHES_PER_ROW,
+        HORIZONTAL_PADDING,
+        VERTICAL_PADDING,
+        MARGIN,
+        GROUP_SPACING,
+        LABEL_FONT_SIZE,
+        HEX_FONT_SIZE,
+        LABEL_OFFSET_X,
+        HEX_OFFSET_X,
+        LABEL_OFFSET_Y,
+        HEX_OFFSET_Y,
+    )
+
+
+@timed("parse")
 def parse_colors_from_file(file_path: str) -> OrderedDict:
     """
     Parses a text file containing color palette definitions into an ordered dictionary of groups.
 
     The file should have lines in the format "GroupName Number [optional descriptor]: #HEXCODE".
-    Blank lines separate groups, and lines starting with '#' are ignored.
+    Lines starting with '#' and lines without a valid six-digit hex code are ignored
+    (see app.palette_parser). Colors are grouped by name in order of first appearance.
 
     Args:
         file_path (str): Path to the input text file.
@@ -41,29 +76,11 @@ def parse_colors_from_file(file_path: str) -> OrderedDict:
     Returns:
         OrderedDict: Mapping of group names to lists of hex color codes.
     """
-    groups = OrderedDict()
-    current_group = None
-    with open(file_path, "r") as f:
-        for line in f:
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                if not stripped:
-                    current_group = None
-                continue
-            parts = stripped.split(":")
-            if len(parts) < 2:
-                continue
-            left = parts[0].strip()
-            hex_color = parts[1].strip().split()[0]
-            m = re.match(r"^(.+?)\s+\d+", left)
-            group_name = m.group(1).strip() if m else left
-            if current_group is None:
-                current_group = group_name
-            if current_group != group_name:
-                current_group = group_name
-            if current_group not in groups:
-                groups[current_group] = []
-            groups[current_group].append(hex_color)
+    parsed = parse_file(file_path)
+    groups = OrderedDict((name, []) for name in parsed.groups)
+    names = parsed.groups
+    for index, rgb in zip(parsed.group_index, parsed.rgb):
+        groups[names[index]].append(format_hex(rgb))
     return groups
 
 
@@ -72,37 +89,73 @@ def calculate_content_dimensions(grouped_colors: OrderedDict) -> tuple:
     Calculates the overall content width and height based on grouped colors.
 
     Args:
-        grouped_colors (OrderedDict): Mapping of group names to lists of hex color codes.
+        grouped_colors (Palette or OrderedDict): A Palette, or a mapping of group names to lists of hex color codes.
 
     Returns:
         tuple: (content_width, content_height)
     """
-    max_row_swatches = 0
-    total_rows = 0
+    if isinstance(grouped_colors, Palette):
+        return calculate_dimensions_from_counts(grouped_colors.group_sizes())
+    return calculate_dimensions_from_counts(
+        [len(entries) for entries in grouped_colors.values()]
+    )
+
+
+def calculate_dimensions_from_counts(group_sizes) -> tuple:
+    """
+    Calculates the overall content width and height from the number of colors per group.
+
+    Args:
+        group_sizes (list): Number of colors in each group, in display order.
+
+    Returns:
+        tuple: (content_width, content_height)
+    """
+    from app.layout import content_dimensions
+
+    return content_dimensions(group_sizes)
+
+
+def calculate_group_origins(group_sizes) -> list:
+    """
+    Calculates the y-coordinate of the first swatch row of every group.
+
+    Args:
+        group_sizes (list): Number of colors in each group, in display order.
+
+    Returns:
+        list: Light-mode y-coordinate of each group's first row.
+    """
     LABEL_HEIGHT = 20
     HEX_HEIGHT = 20
     ROW_HEIGHT = LABEL_HEIGHT + SWATCH_HEIGHT + HEX_HEIGHT
-    for cols in grouped_colors.values():
-        group_rows = math.ceil(len(cols) / MAX_SWATCHES_PER_ROW)
-        total_rows += group_rows
-        for row in range(group_rows):
-            start = row * MAX_SWATCHES_PER_ROW
-            row_count = len(cols[start : start + MAX_SWATCHES_PER_ROW])
-            if row_count > max_row_swatches:
-                max_row_swatches = row_count
-    content_width = (
-        max_row_swatches * SWATCH_WIDTH + (max_row_swatches - 1) * HORIZONTAL_PADDING
-    )
-    num_groups = len(grouped_colors)
-    total_inner_padding = (total_rows - num_groups) * VERTICAL_PADDING
-    content_height = (
-        total_rows * ROW_HEIGHT + total_inner_padding + (num_groups - 1) * GROUP_SPACING
+    origins = []
+    current_y = MARGIN
+    for count in group_sizes:
+        origins.append(current_y)
+        current_y += math.ceil(count / MAX_SWATCHES_PER_ROW) * (
+            ROW_HEIGHT + VERTICAL_PADDING
+        )
+        current_y += GROUP_SPACING - VERTICAL_PADDING
+    return origins
+
+
+def swatch_position(group_origin: int, index: int) -> tuple:
+    """
+    Returns the light-mode (x, y) of the index-th swatch of a group starting at group_origin.
+    """
+    LABEL_HEIGHT = 20
+    HEX_HEIGHT = 20
+    ROW_HEIGHT = LABEL_HEIGHT + SWATCH_HEIGHT + HEX_HEIGHT
+    row, column = divmod(index, MAX_SWATCHES_PER_ROW)
+    return (
+        MARGIN + column * (SWATCH_WIDTH + HORIZONTAL_PADDING),
+        group_origin + row * (ROW_HEIGHT + VERTICAL_PADDING),
     )
-    return content_width, content_height
 
 
 def create_backgrounds(
-    dwg: svgwrite.Drawing, svg_width: int, bg_height: int, gap_between: int
+    dwg: "svgwrite.Drawing", svg_width: int, bg_height: int, gap_between: int
 ) -> None:
     """
     Creates two background rectangles for light and dark modes with symmetric margins.
@@ -139,40 +192,37 @@ def create_backgrounds(
 
 
 def create_swatch_groups(
-    dwg: svgwrite.Drawing, grouped_colors: OrderedDict, bg_height: int
+    dwg: "svgwrite.Drawing", grouped_colors: OrderedDict, bg_height: int, layout=None
 ) -> None:
     """
     Places color swatches for both light and dark modes grouped by category.
     Each group is displayed in its own row(s).
+
+    Args:
+        dwg (svgwrite.Drawing): The SVG drawing object.
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        bg_height (int): Height of each background section.
+        layout (Layout, optional): Precomputed layout table (see app.layout); computed if omitted.
     """
+    from app.layout import layout_for
+
+    if layout is None:
+        layout = layout_for(grouped_colors)
     light_group = dwg.g(id="LightModeSwatches")
     dark_group = dwg.g(id="DarkModeSwatches")
-    LABEL_HEIGHT = 20
-    HEX_HEIGHT = 20
-    ROW_HEIGHT = LABEL_HEIGHT + SWATCH_HEIGHT + HEX_HEIGHT
-    current_y = MARGIN
-    for group_label, entries in grouped_colors.items():
-        group_rows = math.ceil(len(entries) / MAX_SWATCHES_PER_ROW)
-        for row in range(group_rows):
-            start = row * MAX_SWATCHES_PER_ROW
-            row_entries = entries[start : start + MAX_SWATCHES_PER_ROW]
-            current_x = MARGIN
-            for label, color in row_entries:
-                add_swatch(
-                    light_group, dwg, label, color, current_x, current_y, "black"
-                )
-                dark_y = current_y + bg_height + MARGIN
-                add_swatch(dark_group, dwg, label, color, current_x, dark_y, "white")
-                current_x += SWATCH_WIDTH + HORIZONTAL_PADDING
-            current_y += ROW_HEIGHT + VERTICAL_PADDING
-        current_y += GROUP_SPACING - VERTICAL_PADDING
+    dark_offset = bg_height + MARGIN
+    positions = layout.positions()
+    for entries in grouped_colors.values():
+        for (label, color), (x, y) in zip(entries, positions):
+            add_swatch(light_group, dwg, label, color, x, y, "black")
+            add_swatch(dark_group, dwg, label, color, x, y + dark_offset, "white")
     dwg.add(light_group)
     dwg.add(dark_group)
 
 
 def add_swatch(
-    group: svgwrite.container.Group,
-    dwg: svgwrite.Drawing,
+    group: "svgwrite.container.Group",
+    dwg: "svgwrite.Drawing",
     label: str,
     color: str,
     x: int,
@@ -219,40 +269,171 @@ def add_swatch(
     group.add(swatch_group)
 
 
+def group_colors(colors: list):
+    """
+    Groups a list of (main_group, full_label, color) or (main_group, color) tuples.
+
+    Returns:
+        Palette or OrderedDict: A Palette if every color is an uppercase '#RRGGBB' code;
+          otherwise a mapping of group names to lists of (label, color) pairs, so that
+          other CSS colors ('#abc', '#abcdef', 'rgb(...)', names) are written as given.
+    """
+    if all(is_canonical_hex(item[-1]) for item in colors):
+        return Palette.from_colors(colors)
+    grouped = OrderedDict()
+    for item in colors:
+        if len(item) == 3:
+            group, label, color = item
+        else:
+            group, color = item
+            label = group
+        grouped.setdefault(group, []).append((label, color))
+    return grouped
+
+
 def generate_svg_from_groups(
-    grouped_colors, input_filename: str, output_file: str = None
+    grouped_colors,
+    input_filename: str,
+    output_file: str = None,
+    backend="svgwrite",
+    compression: str = None,
+    compression_level: int = None,
+    group_templates=None,
 ) -> None:
     """
     Generates an SVG file from grouped colors.
     Args:
-        grouped_colors (OrderedDict or list): Either a mapping of main groups to lists of (label, hex) pairs
-          or a list of (main_group, full_label, hex) tuples.
+        grouped_colors (Palette, OrderedDict or list): A Palette, a mapping of main groups to lists of
+          (label, hex) pairs, or a list of (main_group, full_label, hex) tuples (see group_colors).
         input_filename (str): Source filename used for naming the output.
         output_file (str, optional): Optional output file path. If not provided, a timestamped filename is generated.
+        backend (str, optional): "svgwrite" builds an svgwrite document; "string" writes the same
+          markup directly from templates (see app.svg_writer), which is much faster on large palettes;
+          "shared" is the string backend with the dark layer drawn as a <use> of the light layer;
+          "compact" also moves the styling into CSS classes and a <symbol> (SVG 1.1, smallest output).
+        compression (str, optional): Compress the SVG while it is written ("gzip" gives .svgz,
+          see app.utils.open_output). A generated filename gets the matching suffix.
+        compression_level (int, optional): Level for the compressor.
+        group_templates (GroupTemplates, optional): Cache of serialized groups shared across
+          calls, used by the "string" and "shared" backends (see app.svg_writer).
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SVG backend: {backend}")
     if isinstance(grouped_colors, list):
-        temp = OrderedDict()
-        for item in grouped_colors:
-            if len(item) == 3:
-                group, label, color = item
-            else:
-                group, color = item
-                label = group
-            temp.setdefault(group, []).append((label, color))
-        grouped_colors = temp
-    content_width, content_height = calculate_content_dimensions(grouped_colors)
-    svg_width = content_width + 2 * MARGIN
-    gap_between = MARGIN
-    bg_height = content_height + 2 * MARGIN
-    svg_height = bg_height * 2 + gap_between
+        grouped_colors = group_colors(grouped_colors)
+    from app.layout import layout_for
+
+    with stage("layout"):
+        layout = layout_for(grouped_colors)
+    svg_width = layout.svg_width
+    gap_between = layout.gap_between
+    bg_height = layout.bg_height
+    svg_height = layout.svg_height
     if output_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_name = os.path.splitext(os.path.basename(input_filename))[0]
-        output_file = f"{timestamp}_{base_name}.svg"
-    dwg = svgwrite.Drawing(output_file, size=(svg_width, svg_height), profile="tiny")
-    create_backgrounds(dwg, svg_width, bg_height, gap_between)
-    create_swatch_groups(dwg, grouped_colors, bg_height)
-    dwg.save()
+        output_file = compressed_path(f"{timestamp}_{base_name}.svg", compression)
+    if backend in ("string", "shared", "compact"):
+        from app.svg_writer import save_svg
+
+        with stage("save"):
+            save_svg(
+                grouped_colors,
+                output_file,
+                svg_width,
+                bg_height,
+                gap_between,
+                layout,
+                shared_dark=backend == "shared",
+                compact=backend == "compact",
+                compression=compression,
+                compression_level=compression_level,
+                group_templates=group_templates,
+            )
+        print(f"SVG saved as {output_file}")
+        return
+    import svgwrite
+
+    with stage("render"):
+        dwg = svgwrite.Drawing(
+            output_file, size=(svg_width, svg_height), profile="tiny"
+        )
+        create_backgrounds(dwg, svg_width, bg_height, gap_between)
+        create_swatch_groups(dwg, grouped_colors, bg_height, layout)
+    with stage("save"):
+        if compression:
+            with open_output(output_file, compression, compression_level) as f:
+                dwg.write(f)
+        else:
+            dwg.save()
+    print(f"SVG saved as {output_file}")
+
+
+def render_svg_document(fileobj, grouped_colors, backend="string", layout=None) -> None:
+    """
+    Writes the SVG document for grouped colors into a text file object, e.g. to
+    render in memory and leave the file write to someone else (see app.pipeline).
+
+    Args:
+        fileobj: Writable text file object.
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        backend (str, optional): One of BACKENDS (see generate_svg_from_groups).
+        layout (Layout, optional): Precomputed layout table; computed if omitted.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SVG backend: {backend}")
+    if layout is None:
+        from app.layout import layout_for
+
+        layout = layout_for(grouped_colors)
+    dimensions = (layout.svg_width, layout.bg_height, layout.gap_between, layout)
+    if backend == "compact":
+        from app.svg_writer import write_compact_svg
+
+        write_compact_svg(fileobj, grouped_colors, *dimensions)
+    elif backend in ("string", "shared"):
+        from app.svg_writer import write_svg
+
+        write_svg(fileobj, grouped_colors, *dimensions, shared_dark=backend == "shared")
+    else:
+        import svgwrite
+
+        dwg = svgwrite.Drawing(
+            size=(layout.svg_width, layout.svg_height), profile="tiny"
+        )
+        create_backgrounds(dwg, layout.svg_width, layout.bg_height, layout.gap_between)
+        create_swatch_groups(dwg, grouped_colors, layout.bg_height, layout)
+        dwg.write(fileobj)
+
+
+def generate_svg_streaming(
+    input_file: str,
+    output_file: str = None,
+    compression: str = None,
+    compression_level: int = None,
+) -> None:
+    """
+    Generates an SVG file directly from a color file with constant memory use.
+
+    Makes two passes over the input: the first only counts colors per group to size the
+    document, the second writes swatches to disk as they are parsed (see app.svg_writer).
+    Args:
+        input_file (str): Path to the color file.
+        output_file (str, optional): Optional output file path. If not provided, a timestamped filename is generated.
+        compression (str, optional): Compress the SVG while it is written (see app.utils.open_output).
+        compression_level (int, optional): Level for the compressor.
+
+    Raises:
+        ValueError: If the file has no valid colors ("No valid colors found.").
+    """
+    from app.svg_writer import stream_svg
+
+    if output_file is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        output_file = compressed_path(f"{timestamp}_{base_name}.svg", compression)
+    with stage("stream"):
+        stream_svg(input_file, output_file, compression, compression_level)
     print(f"SVG saved as {output_file}")
 
 
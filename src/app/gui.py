@@ -1,19 +1,37 @@
 """
 GUI for InkGrid. Lets the user pick multiple color files and an output folder,
 generates SVGs and JSON for the InkGrid-Tokens Figma plugin, and (if logging is enabled) logs events via the shared logger.
+Rendering runs on a background process pool; progress is reported back to the Tk main loop
+through a queue, so the window stays responsive and the job can be cancelled.
 """
 
 import os
 import sys
+import queue
+import hashlib
 import platform
+import threading
 from datetime import datetime
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-from PIL import Image, ImageTk
-from app.generate import generate_svg_from_groups
-from app.utils import read_color_file
+from app.batch import BatchResult, render_task
+from app.cache import RenderCache
+from app.assets import (
+    BACKGROUND_SOURCE,
+    BAKED_BACKGROUND,
+    BACKGROUND_SIZE,
+    BACKGROUND_OPACITY,
+    adjust_opacity as _adjust_opacity,
+    load_baked_background,
+    process_background,
+)
 from app.logger_config import setup_logger
-from app.export import export_json_for_figma
+from app.profiling import PROFILER
+
+PROGRESS_POLL_MS = 100
+BACKGROUND_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".inkgrid", "assets")
 
 
 def run_app(logging_enabled=False):
@@ -53,7 +71,8 @@ def run_app(logging_enabled=False):
     _create_folder_selection(frame, output_folder_var)
     _create_json_checkbox(frame, json_export_var)
 
-    ttk.Button(
+    ui = SimpleNamespace()
+    ui.generate_button = ttk.Button(
         frame,
         text="Generate SVGs",
         command=lambda: _generate(
@@ -63,9 +82,12 @@ def run_app(logging_enabled=False):
             logging_enabled,
             logger,
             json_export_var.get(),
+            ui,
         ),
         style="Primary.TButton",
-    ).pack(pady=15)
+    )
+    ui.generate_button.pack(pady=(15, 5))
+    _create_progress_section(frame, ui)
 
     root.mainloop()
 
@@ -121,7 +143,25 @@ def _create_json_checkbox(frame, var):
     ).pack(pady=5)
 
 
-def _generate(root, file_var, folder_var, logging_enabled, logger, export_json):
+def _create_progress_section(frame, ui):
+    ui.status_var = tk.StringVar(value="")
+    ui.progress = ttk.Progressbar(
+        frame, orient="horizontal", mode="determinate", length=400
+    )
+    ui.progress.pack(padx=10, pady=5)
+    ttk.Label(frame, textvariable=ui.status_var, style="Label.TLabel").pack(pady=5)
+    ui.cancel_button = ttk.Button(
+        frame,
+        text="Cancel",
+        command=lambda: ui.job and ui.job.cancel(),
+        style="Secondary.TButton",
+        state="disabled",
+    )
+    ui.cancel_button.pack(pady=5)
+    ui.job = None
+
+
+def _generate(root, file_var, folder_var, logging_enabled, logger, export_json, ui):
     paths = file_var.get().split(";")
     out_dir = folder_var.get()
     if "No files selected" in paths:
@@ -133,36 +173,164 @@ def _generate(root, file_var, folder_var, logging_enabled, logger, export_json):
     os.makedirs(out_dir, exist_ok=True)
     logger.info(f"Output directory set: {out_dir}")
 
+    errors = []
+    existing = []
     for path in paths:
         path = path.strip()
-        if not os.path.exists(path):
+        if os.path.exists(path):
+            existing.append(path)
+        else:
             logger.error(f"File not found: {path}")
-            continue
+            errors.append(f"{path}: file not found")
 
-        logger.info(f"Processing file: {path}")
-        colors = read_color_file(path)
+    job = GenerationJob(existing, out_dir, export_json, logger)
+    ui.job = job
+    ui.done = 0
+    ui.total = len(existing)
+    ui.progress.configure(maximum=max(ui.total, 1), value=0)
+    ui.status_var.set(f"Rendering {len(existing)} files...")
+    ui.generate_button.configure(state="disabled")
+    ui.cancel_button.configure(state="normal")
+    job.start()
+    root.after(PROGRESS_POLL_MS, _poll_job, root, job, ui, logger, out_dir, errors)
 
-        if not colors:
-            logger.error(f"No valid colors found in {path}.")
-            messagebox.showerror("Error", f"No valid colors found in {path}.")
-            continue
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = os.path.splitext(os.path.basename(path))[0]
-        svg_name = f"{timestamp}_{base_name}.svg"
-        svg_path = os.path.join(out_dir, svg_name)
+def _poll_job(root, job, ui, logger, out_dir, errors):
+    """
+    Applies queued progress events on the Tk main thread and reschedules itself
+    until the job reports that it is finished.
+    """
+    while True:
+        try:
+            kind, payload = job.events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "file":
+            _report_file(payload, ui, logger, errors)
+        elif kind == "done":
+            _finish_job(root, job, ui, logger, out_dir, errors, cancelled=payload)
+            return
+    root.after(PROGRESS_POLL_MS, _poll_job, root, job, ui, logger, out_dir, errors)
+
+
+def _report_file(result, ui, logger, errors):
+    ui.done += 1
+    ui.progress.configure(value=ui.done)
+    name = os.path.basename(result.path)
+    if result.error:
+        logger.error(f"Failed {result.path}: {result.error}")
+        errors.append(f"{result.path}: {result.error}")
+        ui.status_var.set(f"{ui.done}/{ui.total} - failed: {name}")
+        return
+    logger.info(f"SVG gespeichert: {result.svg_path}")
+    if result.json_path:
+        logger.info(f"JSON for Figma exported: {result.json_path}")
+    ui.status_var.set(f"{ui.done}/{ui.total} - done: {name}")
+
+
+def _finish_job(root, job, ui, logger, out_dir, errors, cancelled):
+    ui.job = None
+    ui.generate_button.configure(state="normal")
+    ui.cancel_button.configure(state="disabled")
+    PROFILER.log_summary(logger)
+    if cancelled:
+        logger.warning("Generation cancelled.")
+        ui.status_var.set("Cancelled.")
+        messagebox.showinfo("Cancelled", "Generation was cancelled.")
+        return
+    if errors:
+        logger.warning(f"{len(errors)} files failed.")
+        messagebox.showerror(
+            "Some files failed",
+            f"{job.succeeded} SVGs generated at:\n{out_dir}\n\n"
+            f"{len(errors)} files failed:\n" + "\n".join(errors),
+        )
+    else:
+        logger.info("All files generated successfully.")
+        messagebox.showinfo("Success", f"SVGs generated at:\n{out_dir}")
+    root.destroy()
 
-        logger.info(f"Generating SVG: {svg_path}")
-        generate_svg_from_groups(colors, path, output_file=svg_path)
-        logger.info(f"SVG gespeichert: {svg_path}")
 
-        if export_json:
-            json_path = export_json_for_figma(colors, path, out_dir)
-            logger.info(f"JSON for Figma exported: {json_path}")
+class GenerationJob:
+    """
+    Renders palette files on a process pool from a background thread.
+    Progress is published on the thread-safe events queue as ("file", BatchResult)
+    per finished file and a final ("done", cancelled) event.
+    """
 
-    logger.info("All files generated successfully.")
-    messagebox.showinfo("Success", f"SVGs generated at:\n{out_dir}")
-    root.destroy()
+    def __init__(self, paths, output_dir, export_json=True, logger=None, workers=None):
+        self.paths = paths
+        self.output_dir = output_dir
+        self.export_json = export_json
+        self.logger = logger
+        self.workers = workers or min(len(paths), os.cpu_count() or 1) or 1
+        self.events = queue.Queue()
+        self.succeeded = 0
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="InkGridGenerator", daemon=True
+        )
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stops scheduling new files; files already rendering are allowed to finish.
+        """
+        self._cancelled.set()
+
+    def join(self, timeout: float = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        cache = RenderCache(logger=self.logger)
+        PROFILER.reset()
+        try:
+            if self.paths:
+                self._render_all(cache)
+        finally:
+            cache.evict()
+            cache.log_stats()
+            self.events.put(("done", self._cancelled.is_set()))
+
+    def _render_all(self, cache) -> None:
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {}
+            for path in self.paths:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                base_name = os.path.splitext(os.path.basename(path))[0]
+                svg_path = os.path.join(self.output_dir, f"{timestamp}_{base_name}.svg")
+                future = pool.submit(
+                    render_task,
+                    path,
+                    self.output_dir,
+                    self.export_json,
+                    cache,
+                    svg_path,
+                )
+                futures[future] = path
+            for future in as_completed(futures):
+                if self._cancelled.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except Exception as error:
+                    result = BatchResult(futures[future], None, None, 0.0, str(error))
+                if result.timings:
+                    PROFILER.merge(result.timings)
+                if result.cached:
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+                if not result.error:
+                    self.succeeded += 1
+                self.events.put(("file", result))
 
 
 def _select_files(selected_files_var):
@@ -202,15 +370,55 @@ def _apply_theme(root):
 
 
 def _get_background_image():
-    image_path = _resolve_image_path("background.jpeg")
-    if not image_path:
+    """
+    Loads the background baked at build time (see app.assets). Falls back to a
+    per-user cache of the processed image, and to the live pipeline when neither
+    is available or current.
+    """
+    image_path = _resolve_image_path(BACKGROUND_SOURCE)
+    baked_path = _resolve_image_path(BAKED_BACKGROUND)
+    if not image_path and not baked_path:
+        return None
+    from PIL import Image, ImageTk
+
+    img = load_baked_background(baked_path, image_path) if baked_path else None
+    if img is None and image_path:
+        cached_path = _background_cache_path(image_path)
+        if os.path.exists(cached_path):
+            img = Image.open(cached_path)
+        else:
+            img = process_background(image_path)
+            _save_background_cache(img, cached_path)
+    if img is None:
         return None
-    img = Image.open(image_path).convert("RGBA")
-    img = img.resize((720, 520), Image.Resampling.LANCZOS)
-    img = _adjust_opacity(img, 0.2)
     return ImageTk.PhotoImage(img)
 
 
+def _background_cache_path(image_path):
+    """
+    Returns where the resized, faded background for image_path is cached as PNG.
+    The name changes whenever the source image or the processing settings change.
+    """
+    stat = os.stat(image_path)
+    source = (
+        f"{os.path.abspath(image_path)}:{stat.st_size}:{stat.st_mtime_ns}:"
+        f"{BACKGROUND_SIZE}:{BACKGROUND_OPACITY}"
+    )
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(BACKGROUND_CACHE_DIR, f"background_{digest}.png")
+
+
+def _save_background_cache(img, cached_path):
+    temp_path = f"{cached_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        img.save(temp_path, format="PNG")
+        os.replace(temp_path, cached_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
 def _resolve_image_path(filename):
     base_dir = (
         os.path.join(getattr(sys, "_MEIPASS", ""), "images")
@@ -223,11 +431,6 @@ def _resolve_image_path(filename):
     return potential_path if os.path.exists(potential_path) else None
 
 
-def _adjust_opacity(img, alpha):
-    overlay = Image.new("RGBA", img.size, (255, 255, 255, int(255 * alpha)))
-    return Image.alpha_composite(img, overlay)
-
-
 def _get_bg_color():
     return "#1e1e1e"
 
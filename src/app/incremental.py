@@ -0,0 +1,186 @@
+"""
+Incremental SVG updates for InkGrid.
+Remembers the last rendered Palette per SVG file and, when a palette changes without
+changing its layout, rewrites only the swatch groups that differ instead of re-rendering
+the whole document. With a RenderCache, palettes seen before are copied from the cache
+and patched output is stored in it.
+"""
+
+import os
+import time
+from app.palette import Palette
+from app.utils import sanitize_id
+from app.generate import generate_svg_from_groups
+from app.layout import layout_for
+from app.svg_writer import swatch_markup
+from app.exporters import export_formats
+from app.batch import BatchResult, cache_options, output_targets
+
+FULL = "full"
+PATCHED = "patched"
+UNCHANGED = "unchanged"
+
+
+class IncrementalRenderer:
+    """
+    Renders palettes to SVG, patching the previous output in place when possible.
+    The layout only depends on the number of colors per group, so any edit that keeps
+    every group size (color or label changes, renamed groups) can be patched.
+    """
+
+    def __init__(self):
+        self._previous = {}
+        self.full_renders = 0
+        self.patches = 0
+
+    def update_svg(self, palette: Palette, input_filename: str, svg_path: str) -> str:
+        """
+        Brings svg_path up to date with palette.
+
+        Args:
+            palette (Palette): The freshly parsed palette.
+            input_filename (str): Source filename, used by the full renderer.
+            svg_path (str): SVG file to create or patch.
+
+        Returns:
+            str: "full", "patched" or "unchanged".
+        """
+        previous = self._previous.get(svg_path)
+        mode = FULL
+        if (
+            previous is not None
+            and os.path.exists(svg_path)
+            and previous.group_sizes() == palette.group_sizes()
+        ):
+            mode = _patch_svg(previous, palette, svg_path)
+        if mode == FULL:
+            generate_svg_from_groups(
+                palette, input_filename, output_file=svg_path, backend="string"
+            )
+            self.full_renders += 1
+        elif mode == PATCHED:
+            self.patches += 1
+        self._previous[svg_path] = palette
+        return mode
+
+    def prime(self, path: str, output_dir: str, export_json: bool = True, formats=()):
+        """
+        Remembers the palette of an SVG that is already up to date on disk, so the
+        next edit to path can be patched instead of rendered in full.
+
+        Args:
+            path (str): Palette file.
+            output_dir (str): Directory the SVG was rendered to.
+
+        Returns:
+            bool: True if the SVG exists and is not older than path.
+        """
+        svg_path = output_targets(path, output_dir, export_json, formats)["svg"]
+        try:
+            if os.path.getmtime(svg_path) < os.path.getmtime(path):
+                return False
+            palette = Palette.from_file(path)
+        except (OSError, ValueError):
+            return False
+        if not palette:
+            return False
+        self._previous[svg_path] = palette
+        return True
+
+    def render_file(
+        self,
+        path: str,
+        output_dir: str,
+        export_json: bool = True,
+        compact_json: bool = False,
+        formats=(),
+        cache=None,
+        backend: str = "string",
+    ) -> BatchResult:
+        """
+        Counterpart of batch.render_file that patches the SVG when possible.
+
+        Args:
+            cache (RenderCache, optional): Serves palettes rendered before (e.g. an
+              edit that was reverted) and receives the full or patched output.
+            backend (str): Backend the output stands in for in cache keys; the
+              output is byte-identical to the "svgwrite" and "string" backends.
+        """
+        start = time.perf_counter()
+        palette = Palette.from_file(path)
+        if not palette:
+            return BatchResult(
+                path, None, None, time.perf_counter() - start, "No valid colors found."
+            )
+        targets = output_targets(path, output_dir, export_json, formats)
+        svg_path = targets["svg"]
+        if cache is not None:
+            key = cache.key_for(path, cache_options(compact_json, backend))
+            if cache.fetch(key, targets):
+                self._previous[svg_path] = palette
+                return BatchResult(
+                    path,
+                    svg_path,
+                    targets.get("json"),
+                    time.perf_counter() - start,
+                    None,
+                    True,
+                )
+        self.update_svg(palette, path, svg_path)
+        exports = ["figma"] if export_json else []
+        exports.extend(name for name in formats if name != "figma")
+        artifacts = export_formats(palette, path, output_dir, exports, compact_json)
+        json_path = artifacts.get("figma")
+        if cache is not None:
+            cache.store(key, targets)
+        return BatchResult(path, svg_path, json_path, time.perf_counter() - start, None)
+
+
+def _patch_svg(previous: Palette, palette: Palette, svg_path: str) -> str:
+    """
+    Replaces the changed swatch groups of both layers in svg_path.
+    Returns FULL if a swatch to replace cannot be found in the file.
+    """
+    changed = [
+        i
+        for i in range(len(palette))
+        if palette.rgb[i] != previous.rgb[i] or palette.label(i) != previous.label(i)
+    ]
+    if not changed:
+        return UNCHANGED
+
+    with open(svg_path, "rb") as f:
+        document = f.read()
+
+    layout = layout_for(palette)
+    replacements = []
+    for i in changed:
+        x, y = int(layout.x[i]), int(layout.y[i])
+        old_id = sanitize_id(previous.label(i))
+        for swatch_y, text_color in ((y, "black"), (y + layout.dark_offset, "white")):
+            start = document.find(f'<g id="{old_id}_{x}_{swatch_y}">'.encode("utf-8"))
+            if start < 0:
+                return FULL
+            end = document.index(b"</g>", start) + len(b"</g>")
+            markup = swatch_markup(
+                palette.label(i), palette.hex(i), x, swatch_y, text_color
+            )
+            replacements.append((start, end, markup.encode("utf-8")))
+
+    replacements.sort()
+    if all(end - start == len(new) for start, end, new in replacements):
+        with open(svg_path, "r+b") as f:
+            for start, _, new in replacements:
+                f.seek(start)
+                f.write(new)
+    else:
+        parts = []
+        position = 0
+        for start, end, new in replacements:
+            parts.append(document[position:start])
+            parts.append(new)
+            position = end
+        parts.append(document[position:])
+        with open(svg_path, "wb") as f:
+            f.write(b"".join(parts))
+    return PATCHED
@@ -0,0 +1,174 @@
+"""
+Layout engine for InkGrid.
+Computes the position of every swatch, and the document dimensions, in one batched
+pass over the group sizes. Uses NumPy when it is installed and falls back to plain
+Python arrays otherwise; both produce identical tables.
+"""
+
+from array import array
+from app.palette import Palette
+from app.generate import (
+    SWATCH_WIDTH,
+    SWATCH_HEIGHT,
+    MAX_SWATCHES_PER_ROW,
+    HORIZONTAL_PADDING,
+    VERTICAL_PADDING,
+    MARGIN,
+    GROUP_SPACING,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LABEL_HEIGHT = 20
+HEX_HEIGHT = 20
+ROW_HEIGHT = LABEL_HEIGHT + SWATCH_HEIGHT + HEX_HEIGHT
+COLUMN_STEP = SWATCH_WIDTH + HORIZONTAL_PADDING
+ROW_STEP = ROW_HEIGHT + VERTICAL_PADDING
+
+
+class Layout:
+    """
+    Light-mode swatch coordinates in display order plus the document dimensions.
+    The dark-mode copy of swatch i sits at (x[i], y[i] + dark_offset).
+    """
+
+    __slots__ = ("x", "y", "group_origins", "content_width", "content_height")
+
+    def __init__(self, x, y, group_origins, content_width, content_height):
+        self.x = x
+        self.y = y
+        self.group_origins = group_origins
+        self.content_width = content_width
+        self.content_height = content_height
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def svg_width(self) -> int:
+        return self.content_width + 2 * MARGIN
+
+    @property
+    def bg_height(self) -> int:
+        return self.content_height + 2 * MARGIN
+
+    @property
+    def gap_between(self) -> int:
+        return MARGIN
+
+    @property
+    def svg_height(self) -> int:
+        return self.bg_height * 2 + self.gap_between
+
+    @property
+    def dark_offset(self) -> int:
+        return self.bg_height + self.gap_between
+
+    def positions(self):
+        """
+        Returns an iterator of light-mode (x, y) pairs as Python ints.
+        """
+        return zip(self.x.tolist(), self.y.tolist())
+
+
+def compute_layout(group_sizes, use_numpy: bool = None) -> Layout:
+    """
+    Computes the layout table for groups of the given sizes.
+
+    Args:
+        group_sizes (list): Number of colors in each group, in display order.
+        use_numpy (bool, optional): Force (True) or disable (False) the NumPy path.
+          Defaults to NumPy whenever it is installed.
+
+    Returns:
+        Layout: Coordinates of every swatch and the content dimensions.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        return _compute_numpy(list(group_sizes))
+    return _compute_python(list(group_sizes))
+
+
+def layout_for(grouped_colors) -> Layout:
+    """
+    Computes the layout of a Palette or a mapping of group names to color lists.
+    """
+    if isinstance(grouped_colors, Palette):
+        return compute_layout(grouped_colors.group_sizes())
+    return compute_layout([len(entries) for entries in grouped_colors.values()])
+
+
+def content_dimensions(group_sizes) -> tuple:
+    """
+    Computes the content width and height for groups of the given sizes from the row
+    counts alone, without building the coordinate table.
+
+    Returns:
+        tuple: (content_width, content_height), as in the Layout of the same groups.
+    """
+    sizes = list(group_sizes)
+    total_rows = sum(-(-count // MAX_SWATCHES_PER_ROW) for count in sizes)
+    max_row_swatches = min(max(sizes, default=0), MAX_SWATCHES_PER_ROW)
+    return _content_dimensions(len(sizes), total_rows, max_row_swatches)
+
+
+def _content_dimensions(num_groups, total_rows, max_row_swatches) -> tuple:
+    content_width = (
+        max_row_swatches * SWATCH_WIDTH + (max_row_swatches - 1) * HORIZONTAL_PADDING
+    )
+    content_height = (
+        total_rows * ROW_HEIGHT
+        + (total_rows - num_groups) * VERTICAL_PADDING
+        + (num_groups - 1) * GROUP_SPACING
+    )
+    return content_width, content_height
+
+
+def _compute_python(group_sizes) -> Layout:
+    row_x = [MARGIN + column * COLUMN_STEP for column in range(MAX_SWATCHES_PER_ROW)]
+    x = array("i")
+    y = array("i")
+    origins = []
+    total_rows = 0
+    current_y = MARGIN
+    for count in group_sizes:
+        origins.append(current_y)
+        for start in range(0, count, MAX_SWATCHES_PER_ROW):
+            width = min(count - start, MAX_SWATCHES_PER_ROW)
+            x.extend(row_x[:width])
+            y.extend([current_y] * width)
+            current_y += ROW_STEP
+            total_rows += 1
+        current_y += GROUP_SPACING - VERTICAL_PADDING
+    max_row_swatches = min(max(group_sizes, default=0), MAX_SWATCHES_PER_ROW)
+    return Layout(
+        x,
+        y,
+        origins,
+        *_content_dimensions(len(group_sizes), total_rows, max_row_swatches),
+    )
+
+
+def _compute_numpy(group_sizes) -> Layout:
+    sizes = numpy.asarray(group_sizes, dtype=numpy.int64).reshape(-1)
+    rows = -(-sizes // MAX_SWATCHES_PER_ROW)
+    group_heights = rows * ROW_STEP + (GROUP_SPACING - VERTICAL_PADDING)
+    origins = MARGIN + numpy.cumsum(group_heights) - group_heights
+    starts = numpy.cumsum(sizes) - sizes
+    index = numpy.arange(int(sizes.sum()), dtype=numpy.int64) - numpy.repeat(
+        starts, sizes
+    )
+    row, column = numpy.divmod(index, MAX_SWATCHES_PER_ROW)
+    x = MARGIN + column * COLUMN_STEP
+    y = numpy.repeat(origins, sizes) + row * ROW_STEP
+    max_row_swatches = min(int(sizes.max()) if sizes.size else 0, MAX_SWATCHES_PER_ROW)
+    return Layout(
+        x,
+        y,
+        origins.tolist(),
+        *_content_dimensions(len(group_sizes), int(rows.sum()), max_row_swatches),
+    )
@@ -77,6 +77,9 @@ def finalize_file_logging(logger_instance, output_dir, log_filename=None):
         logger_instance (Logger): Instance of Logger (the custom class).
         output_dir (str): Output directory where the log file will be created.
         log_filename (str): Optional log file name. If not provided, a timestamped name is generated.
+
+    Returns:
+        str: Path of the log file.
     """
     logger = logger_instance.logger
     if not log_filename:
@@ -99,6 +102,7 @@ def finalize_file_logging(logger_instance, output_dir, log_filename=None):
         logger.removeHandler(mem_handler)
     logger.addHandler(file_handler)
     logger.info(f"Log file successfully created: {file_path}")
+    return file_path
 
 
 setup_logger = Logger.setup
@@ -1,12 +1,21 @@
 """
 Main entry point for InkGrid.
-Parses arguments, initializes logging, then starts the InkGrid application.
+Parses arguments, initializes logging, then starts the InkGrid application
+or, when palette inputs are given, renders them headlessly in batch mode.
 """
 
 import argparse
+import multiprocessing
+import os
 import sys
+import time
 from app.logger_config import setup_logger, finalize_file_logging
-from app.gui import run_app
+from app.batch import run_batch
+from app.cache import RenderCache
+from app.exporters import FORMATS
+from app.generate import BACKENDS
+from app.utils import COMPRESSIONS
+from app.profiling import RunProfiler
 
 
 def main():
@@ -17,17 +26,125 @@ def main():
     logger = setup_logger(log_to_file=args.logging)
     logger.debug(f"Parsed command-line arguments: {args}")
     logger.info("InkGrid started.")
+    run_profiler = RunProfiler(args.profile)
+    run_profiler.start()
+    if args.inputs:
+        _run_headless(args, logger, run_profiler)
+        return
     try:
         output_dir = run_app(logging_enabled=args.logging)
         logger.info(f"Output directory: {output_dir}")
+        log_path = None
         if args.logging:
-            finalize_file_logging(logger, output_dir)
+            log_path = finalize_file_logging(logger, output_dir)
+        _dump_profile(run_profiler, log_path, output_dir, logger)
     except Exception as error:
         logger.error(f"An unexpected error occurred: {error}", exc_info=True)
         sys.exit(1)
     logger.info("InkGrid terminated.")
 
 
+def run_app(logging_enabled=False):
+    """
+    Starts the GUI. app.gui (and with it tkinter and PIL) is only imported here,
+    so headless runs never load them.
+    """
+    from app.gui import run_app as run_gui
+
+    return run_gui(logging_enabled=logging_enabled)
+
+
+def _run_headless(args, logger, run_profiler):
+    """
+    Renders the given inputs without the GUI and exits with 1 if any file failed.
+    """
+    output_dir = args.output or os.getcwd()
+    try:
+        cache = None
+        if args.cache_dir:
+            cache = RenderCache(
+                args.cache_dir, args.cache_size * 1024 * 1024, logger=logger
+            )
+        if args.pipeline:
+            from app.pipeline import run_pipeline
+
+            if cache is not None or args.png:
+                logger.warning("--cache-dir and --png are not used with --pipeline.")
+            results = run_pipeline(
+                args.inputs,
+                output_dir,
+                export_json=not args.no_json,
+                backend=args.svg_backend,
+                workers=args.workers or 1,
+                logger=logger,
+                compact_json=args.compact_json,
+                formats=args.formats,
+                compression=args.compress,
+                compression_level=args.compress_level,
+            )
+        else:
+            results = run_batch(
+                args.inputs,
+                output_dir,
+                workers=args.workers,
+                export_json=not args.no_json,
+                logger=logger,
+                cache=cache,
+                compact_json=args.compact_json,
+                formats=args.formats,
+                backend=args.svg_backend,
+                compression=args.compress,
+                compression_level=args.compress_level,
+                png_scale=args.png,
+            )
+        if args.watch:
+            from app.watch import PaletteWatcher
+
+            PaletteWatcher(
+                args.inputs,
+                output_dir,
+                export_json=not args.no_json,
+                logger=logger,
+                cache=cache,
+                compact_json=args.compact_json,
+                formats=args.formats,
+                backend=args.svg_backend,
+                compression=args.compress,
+                compression_level=args.compress_level,
+                png_scale=args.png,
+                incremental=args.svg_backend in ("svgwrite", "string")
+                and not args.compress
+                and not args.png,
+            ).run_forever()
+        log_path = None
+        if args.logging:
+            log_path = finalize_file_logging(logger, output_dir)
+        _dump_profile(run_profiler, log_path, output_dir, logger)
+    except Exception as error:
+        logger.error(f"An unexpected error occurred: {error}", exc_info=True)
+        sys.exit(1)
+    if any(result.error for result in results) and not args.watch:
+        sys.exit(1)
+    logger.info("InkGrid terminated.")
+
+
+def _dump_profile(run_profiler, log_path, output_dir, logger):
+    """
+    Writes the cProfile and tracemalloc captures next to the log file, or into the
+    output directory when file logging is disabled.
+    """
+    if not run_profiler.enabled:
+        return
+    if log_path:
+        base_path = os.path.splitext(log_path)[0]
+    else:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        os.makedirs(output_dir, exist_ok=True)
+        base_path = os.path.join(output_dir, f"inkgrid_profile_{timestamp}")
+    for path in run_profiler.stop(base_path):
+        logger.info(f"Profile written: {path}")
+
+
 def parse_command_line_arguments():
     """
     Parses command-line arguments for the InkGrid application.
@@ -38,8 +155,107 @@ def parse_command_line_arguments():
         action="store_true",
         help="Enable detailed logging to file and console output.",
     )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Palette files, directories or glob patterns to render without the GUI.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output directory for headless rendering (default: current directory).",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for headless rendering (default: CPU count).",
+    )
+    parser.add_argument(
+        "--no-json",
+        action="store_true",
+        help="Skip the JSON export for the Figma plugin in headless mode.",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write the Figma JSON without indentation (smaller, for machine consumers).",
+    )
+    parser.add_argument(
+        "--formats",
+        type=_parse_formats,
+        default=(),
+        help="Comma-separated token formats to write next to the Figma JSON "
+        f"({', '.join(FORMATS)}).",
+    )
+    parser.add_argument(
+        "--svg-backend",
+        choices=BACKENDS,
+        default="svgwrite",
+        help="SVG writer for headless rendering; 'shared' draws the dark layer as a "
+        "reference to the light layer, halving file size; 'compact' also moves styling "
+        "into CSS classes and a symbol for the smallest files.",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        help="Compress the SVG (gzip: .svgz) and JSON output while it is written.",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=None,
+        help="Compression level (gzip/bz2: 1-9, xz: 0-9; default: the compressor's).",
+    )
+    parser.add_argument(
+        "--png",
+        type=float,
+        nargs="?",
+        const=1.0,
+        default=None,
+        metavar="SCALE",
+        help="Also render a PNG preview of every palette, optionally scaled (e.g. 0.25).",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap reading, rendering and writing across files with an asyncio "
+        "pipeline (best for slow or network-mounted output folders).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After rendering, keep watching the inputs and re-render changed palettes.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse output of unchanged palettes from this cache directory in headless mode.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        help="Maximum cache size in MB before least recently used entries are evicted.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture cProfile and tracemalloc data for the run and save it next to the log.",
+    )
     return parser.parse_args()
 
 
+def _parse_formats(value: str) -> tuple:
+    formats = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in formats if name not in FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})"
+        )
+    return formats
+
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
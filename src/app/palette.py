@@ -0,0 +1,244 @@
+"""
+Compact palette container for InkGrid.
+Stores colors grouped by category in flat arrays instead of per-color tuples,
+so large palettes (and many palettes held at once in batch jobs) cost a few
+bytes per color plus the label text.
+"""
+
+import os
+import sys
+from array import array
+from itertools import accumulate
+from string import hexdigits
+from app.palette_parser import (
+    MAP_THRESHOLD,
+    MappedPalette,
+    format_hex,
+    map_file,
+    parse_file,
+)
+from app.profiling import timed
+
+
+class Palette:
+    """
+    Colors grouped by category, in order of first appearance.
+
+    Group g holds rows offsets[g] to offsets[g + 1]. Colors are packed 0xRRGGBB
+    ints; all labels share one string, sliced by label_offsets. Iterating yields
+    (main_group, full_label, hex) tuples, so a Palette can be passed anywhere a
+    list of color tuples is accepted.
+    """
+
+    __slots__ = ("groups", "offsets", "rgb", "labels", "label_offsets")
+
+    def __init__(self, groups, offsets, rgb, labels, label_offsets):
+        self.groups = groups
+        self.offsets = offsets
+        self.rgb = rgb
+        self.labels = labels
+        self.label_offsets = label_offsets
+
+    @classmethod
+    def from_rows(cls, group_names, group_index, labels, rgb):
+        """
+        Builds a Palette from columnar rows, stably regrouping rows by group.
+
+        Args:
+            group_names (list): Group names, indexed by group_index.
+            group_index (sequence): Group number of each row.
+            labels (sequence): Label of each row.
+            rgb (sequence): Packed color of each row.
+        """
+        counts = [0] * len(group_names)
+        for index in group_index:
+            counts[index] += 1
+        order = range(len(labels))
+        if any(a > b for a, b in zip(group_index, group_index[1:])):
+            order = sorted(order, key=group_index.__getitem__)
+            labels = [labels[i] for i in order]
+            rgb = [rgb[i] for i in order]
+        return cls(
+            [sys.intern(name) for name in group_names],
+            _prefix_sums(counts),
+            array("I", rgb),
+            "".join(labels),
+            _prefix_sums(map(len, labels)),
+        )
+
+    @classmethod
+    def from_parsed(cls, parsed):
+        """
+        Builds a Palette from a ParsedPalette or MappedPalette.
+        """
+        if isinstance(parsed, MappedPalette):
+            return cls.from_mapped(parsed)
+        return cls.from_rows(
+            parsed.groups, parsed.group_index, parsed.labels, parsed.rgb
+        )
+
+    @classmethod
+    def from_mapped(cls, mapped):
+        """
+        Builds a Palette from a MappedPalette, copying the label bytes straight into
+        the shared label string instead of decoding one str per label first.
+
+        Args:
+            mapped (MappedPalette): Open parse result; it can be closed afterwards.
+        """
+        group_index = mapped.group_index
+        counts = [0] * len(mapped.groups)
+        for index in group_index:
+            counts[index] += 1
+        order = range(len(mapped))
+        rgb = mapped.rgb
+        if any(a > b for a, b in zip(group_index, group_index[1:])):
+            order = sorted(order, key=group_index.__getitem__)
+            rgb = array("I", [rgb[i] for i in order])
+        starts, ends = mapped.label_start, mapped.label_end
+        joined = bytearray()
+        with memoryview(mapped.buffer) as view:
+            for i in order:
+                joined += view[starts[i] : ends[i]]
+        labels = joined.decode("utf-8")
+        if len(labels) == len(joined):
+            lengths = (ends[i] - starts[i] for i in order)
+        else:
+            # Non-ASCII labels: byte lengths differ from str lengths.
+            lengths = (len(mapped.label(i)) for i in order)
+        return cls(
+            [sys.intern(name) for name in mapped.groups],
+            _prefix_sums(counts),
+            array("I", rgb),
+            labels,
+            _prefix_sums(lengths),
+        )
+
+    @classmethod
+    @timed("parse")
+    def from_file(cls, file_path: str):
+        """
+        Parses a color file into a Palette. Files of MAP_THRESHOLD bytes and more
+        are read through map_file, so their labels are never decoded one by one.
+        """
+        if os.path.getsize(file_path) >= MAP_THRESHOLD:
+            with map_file(file_path) as mapped:
+                return cls.from_mapped(mapped)
+        return cls.from_parsed(parse_file(file_path))
+
+    @classmethod
+    def from_colors(cls, colors):
+        """
+        Builds a Palette from the legacy representations: a list of
+        (main_group, full_label, hex) or (main_group, hex) tuples, or a mapping
+        of group names to lists of (label, hex) pairs.
+
+        Raises:
+            ValueError: If a color is not a '#RRGGBB' hex code.
+        """
+        if isinstance(colors, cls):
+            return colors
+        if hasattr(colors, "items"):
+            colors = [
+                (group, label, color)
+                for group, entries in colors.items()
+                for label, color in entries
+            ]
+        group_ids = {}
+        group_index = []
+        labels = []
+        rgb = []
+        for item in colors:
+            if len(item) == 3:
+                group, label, color = item
+            else:
+                group, color = item
+                label = group
+            group_index.append(group_ids.setdefault(group, len(group_ids)))
+            labels.append(label)
+            rgb.append(_parse_hex(color))
+        return cls.from_rows(list(group_ids), group_index, labels, rgb)
+
+    def __len__(self):
+        return len(self.rgb)
+
+    def __iter__(self):
+        for group, entries in self.items():
+            for label, color in entries:
+                yield group, label, color
+
+    def __eq__(self, other):
+        if not isinstance(other, Palette):
+            return NotImplemented
+        return (
+            self.groups == other.groups
+            and self.offsets == other.offsets
+            and self.rgb == other.rgb
+            and self.labels == other.labels
+            and self.label_offsets == other.label_offsets
+        )
+
+    def label(self, i: int) -> str:
+        return self.labels[self.label_offsets[i] : self.label_offsets[i + 1]]
+
+    def hex(self, i: int) -> str:
+        return format_hex(self.rgb[i])
+
+    def group_sizes(self) -> list:
+        """
+        Returns the number of colors in each group, in group order.
+        """
+        offsets = self.offsets
+        return [offsets[g + 1] - offsets[g] for g in range(len(self.groups))]
+
+    def items(self):
+        """
+        Yields (group, [(label, hex), ...]) per group, like the OrderedDict
+        previously passed between parsing and rendering.
+        """
+        labels = self.labels
+        label_offsets = self.label_offsets
+        rgb = self.rgb
+        for g, group in enumerate(self.groups):
+            entries = []
+            for i in range(self.offsets[g], self.offsets[g + 1]):
+                entries.append(
+                    (
+                        labels[label_offsets[i] : label_offsets[i + 1]],
+                        format_hex(rgb[i]),
+                    )
+                )
+            yield group, entries
+
+    def values(self):
+        for _, entries in self.items():
+            yield entries
+
+
+def is_canonical_hex(color) -> bool:
+    """
+    True for '#RRGGBB' codes in the uppercase form a Palette gives back, i.e. colors
+    that survive being packed into a Palette unchanged.
+    """
+    return (
+        isinstance(color, str)
+        and len(color) == 7
+        and color[0] == "#"
+        and set(color[1:]) <= _UPPER_HEX_DIGITS
+    )
+
+
+def _prefix_sums(values) -> array:
+    sums = array("I", [0])
+    sums.extend(accumulate(values))
+    return sums
+
+
+def _parse_hex(color: str) -> int:
+    if len(color) != 7 or color[0] != "#" or not set(color[1:]) <= _HEX_DIGITS:
+        raise ValueError(f"Invalid hex color: {color!r}")
+    return int(color[1:], 16)
+
+
+_HEX_DIGITS = set(hexdigits)
+_UPPER_HEX_DIGITS = set("0123456789ABCDEF")
@@ -0,0 +1,238 @@
+"""
+Palette parser for InkGrid.
+Parses color files in a single pass with one precompiled expression and returns a compact columnar result (group index, label, packed RGB int).
+Used by app.utils.read_color_file and app.generate.parse_colors_from_file.
+map_file parses large files straight from a memory-mapped buffer; parse_file uses it
+for files of MAP_THRESHOLD bytes and more.
+"""
+
+import mmap
+import os
+import re
+from array import array
+from itertools import repeat
+
+# "<Group> <Number> [descriptor]: #RRGGBB". The group is everything before the first
+# whitespace that is followed by a digit, or the whole label if there is no number.
+# Comment lines (starting with '#'), blank lines and invalid hex codes do not match.
+# No part of the expression crosses a newline, so it can scan a whole file at once.
+LINE_PATTERN = re.compile(
+    r"^[ \t]*(?P<label>(?P<group>[^:#\s](?:[^:\s]+|[ \t]+(?![\d \t:]))*)"
+    r"(?:[ \t]+\d(?:[^:\n]*[^:\s])?)?)"
+    r"[ \t]*:[ \t]*#(?P<hex>[0-9A-Fa-f]{6})[ \t\r\f\v]*$",
+    re.MULTILINE,
+)
+BYTES_LINE_PATTERN = re.compile(LINE_PATTERN.pattern.encode("ascii"), re.MULTILINE)
+# On bytes, \s and \d only match ASCII whitespace and digits; on str they also match
+# \x1c-\x1f and non-ASCII whitespace and digits. Only where the buffer contains one of
+# those can the two patterns disagree, so map_file falls back to the str pattern there.
+_MAYBE_UNICODE_ONLY = re.compile(rb"[\x1c-\x1f\x80-\xff]")
+_UNICODE_ONLY = re.compile(r"[\x1c-\x1f]|(?![\x00-\x7f])[\s\d]")
+
+MAP_THRESHOLD = 4 * 1024 * 1024
+
+
+class ParsedPalette:
+    """
+    Columnar parse result. Row i has group name groups[group_index[i]],
+    label labels[i] and color rgb[i] packed as 0xRRGGBB.
+    """
+
+    __slots__ = ("groups", "group_index", "labels", "rgb")
+
+    def __init__(self):
+        self.groups = []
+        self.group_index = array("I")
+        self.labels = []
+        self.rgb = array("I")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        """
+        Yields (main_group, full_label, hex) tuples in file order.
+        """
+        groups = self.groups
+        for index, label, rgb in zip(self.group_index, self.labels, self.rgb):
+            yield groups[index], label, format_hex(rgb)
+
+
+def format_hex(rgb: int) -> str:
+    """
+    Formats a packed 0xRRGGBB int as an uppercase '#RRGGBB' string.
+    """
+    return f"#{rgb:06X}"
+
+
+def iter_entries(lines):
+    """
+    Yields (main_group, full_label, rgb) for every valid color line.
+
+    Args:
+        lines (iterable): Lines of a color file.
+    """
+    match = LINE_PATTERN.match
+    for line in lines:
+        m = match(line)
+        if m:
+            group, label, hex_code = m.group("group", "label", "hex")
+            yield group, label, int(hex_code, 16)
+
+
+def parse_text(text: str) -> ParsedPalette:
+    """
+    Parses the contents of a color file into a ParsedPalette in one pass.
+
+    Args:
+        text (str): Contents of a color file.
+
+    Returns:
+        ParsedPalette: Columnar parse result; group names are numbered in order of appearance.
+    """
+    result = ParsedPalette()
+    matches = LINE_PATTERN.findall(text)
+    if not matches:
+        return result
+    labels, groups, hex_codes = zip(*matches)
+    result.groups = list(dict.fromkeys(groups))
+    group_ids = {group: index for index, group in enumerate(result.groups)}
+    result.group_index = array("I", map(group_ids.__getitem__, groups))
+    result.labels = list(labels)
+    result.rgb = array("I", map(int, hex_codes, repeat(16)))
+    return result
+
+
+def parse_file(file_path: str) -> ParsedPalette:
+    """
+    Parses a color file into a ParsedPalette. Files of MAP_THRESHOLD bytes and more
+    are parsed from a memory mapping (see map_file), which avoids holding the decoded
+    text and one match tuple per line at the same time.
+
+    Args:
+        file_path (str): Path to the color file.
+
+    Returns:
+        ParsedPalette: Columnar parse result.
+    """
+    if os.path.getsize(file_path) >= MAP_THRESHOLD:
+        with map_file(file_path) as mapped:
+            result = ParsedPalette()
+            result.groups = mapped.groups
+            result.group_index = mapped.group_index
+            result.labels = [mapped.label(i) for i in range(len(mapped))]
+            result.rgb = mapped.rgb
+            return result
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_text(f.read())
+
+
+class MappedPalette:
+    """
+    Columnar parse result backed by a memory-mapped color file.
+    Labels are kept as byte offsets into the mapping and are only decoded
+    when requested; colors are packed 0xRRGGBB ints. Close it (or use it as a
+    context manager) once no more labels are needed.
+    """
+
+    __slots__ = ("buffer", "groups", "group_index", "label_start", "label_end", "rgb")
+
+    def __init__(self, buffer, offset_type="I"):
+        self.buffer = buffer
+        self.groups = []
+        self.group_index = array("I")
+        self.label_start = array(offset_type)
+        self.label_end = array(offset_type)
+        self.rgb = array("I")
+
+    def __len__(self):
+        return len(self.rgb)
+
+    def __iter__(self):
+        """
+        Yields (main_group, full_label, hex) tuples, decoding each label on demand.
+        """
+        groups = self.groups
+        label = self.label
+        for i, (index, rgb) in enumerate(zip(self.group_index, self.rgb)):
+            yield groups[index], label(i), format_hex(rgb)
+
+    def label(self, i: int) -> str:
+        """
+        Decodes the label of row i from the mapped buffer.
+        """
+        return self.buffer[self.label_start[i] : self.label_end[i]].decode("utf-8")
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def map_file(file_path: str) -> MappedPalette:
+    """
+    Parses a color file from a read-only memory mapping without decoding lines.
+    Gives the same result as parse_file: if the file contains characters that the
+    bytes pattern would treat differently (non-ASCII whitespace or digits), it is
+    decoded and matched with the str pattern, with labels still stored as byte offsets.
+
+    Args:
+        file_path (str): Path to the color file (UTF-8).
+
+    Returns:
+        MappedPalette: Columnar parse result holding the mapping open.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    result = MappedPalette(buffer, "I" if size < 2**32 else "Q")
+    group_ids = {}
+    groups = result.groups
+    add_index = result.group_index.append
+    add_start = result.label_start.append
+    add_end = result.label_end.append
+    add_rgb = result.rgb.append
+    for group, start, end, hex_code in _scan(buffer):
+        index = group_ids.get(group)
+        if index is None:
+            index = group_ids[group] = len(groups)
+            groups.append(group.decode("utf-8") if isinstance(group, bytes) else group)
+        add_index(index)
+        add_start(start)
+        add_end(end)
+        add_rgb(int(hex_code, 16))
+    return result
+
+
+def _scan(buffer):
+    """
+    Yields (group, label start byte, label end byte, hex) for every valid line.
+    """
+    if _MAYBE_UNICODE_ONLY.search(buffer):
+        text = bytes(buffer).decode("utf-8")
+        if _UNICODE_ONLY.search(text):
+            yield from _scan_text(text)
+            return
+        del text
+    for m in BYTES_LINE_PATTERN.finditer(buffer):
+        start, end = m.span("label")
+        yield m.group("group"), start, end, m.group("hex")
+
+
+def _scan_text(text: str):
+    """
+    Matches decoded text with the str pattern and converts the label spans from
+    character to byte offsets, encoding only the text between consecutive matches.
+    """
+    char_pos = byte_pos = 0
+    for m in LINE_PATTERN.finditer(text):
+        start, end = m.span("label")
+        byte_start = byte_pos + len(text[char_pos:start].encode("utf-8"))
+        byte_end = byte_start + len(text[start:end].encode("utf-8"))
+        char_pos, byte_pos = end, byte_end
+        yield m.group("group"), byte_start, byte_end, m.group("hex")
@@ -0,0 +1,297 @@
+"""
+Asynchronous batch pipeline for InkGrid.
+Overlaps the work on consecutive palette files: read/parse, layout/render, SVG write
+and JSON write run as asyncio stages connected by bounded queues. File I/O runs on a
+thread pool and parsing and rendering on a CPU executor, so the CPU renders one file
+while earlier files are still being written (which matters most on network-mounted
+output folders). Full queues block the earlier stages, so only a few palettes and
+rendered documents are held in memory at any time.
+"""
+
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.batch import BatchResult, collision_result, plan_outputs
+from app.exporters import export_formats
+from app.generate import render_svg_document
+from app.palette import Palette
+from app.palette_parser import parse_text
+from app.profiling import PROFILER, stage
+from app.utils import compressed_path, open_output
+
+QUEUE_SIZE = 4
+IO_WORKERS = 4
+
+_DONE = object()
+
+
+class _Job:
+    """
+    One palette file on its way through the stages.
+    """
+
+    __slots__ = (
+        "path",
+        "output_dir",
+        "start",
+        "palette",
+        "svg",
+        "svg_path",
+        "json_path",
+        "error",
+    )
+
+    def __init__(self, path: str, output_dir: str):
+        self.path = path
+        self.output_dir = output_dir
+        self.start = time.perf_counter()
+        self.palette = None
+        self.svg = None
+        self.svg_path = None
+        self.json_path = None
+        self.error = None
+
+
+def run_pipeline(
+    inputs,
+    output_dir: str,
+    export_json: bool = True,
+    backend: str = "svgwrite",
+    workers: int = 1,
+    io_workers: int = IO_WORKERS,
+    queue_size: int = QUEUE_SIZE,
+    logger=None,
+    compact_json: bool = False,
+    formats=(),
+    compression: str = None,
+    compression_level: int = None,
+) -> list:
+    """
+    Renders all palette files matched by inputs through the asynchronous pipeline.
+
+    Args:
+        inputs (list): File paths, directory paths or glob patterns.
+        output_dir (str): Directory for the SVG and JSON output.
+        export_json (bool): Whether to export JSON for the Figma plugin.
+        backend (str): SVG backend, one of app.generate.BACKENDS.
+        workers (int): Processes for parsing and rendering; 1 uses a single thread.
+        io_workers (int): Concurrent reads and writes per I/O stage.
+        queue_size (int): Capacity of each queue between stages.
+        logger (Logger, optional): Logger for per-file timings and the summary.
+        compact_json (bool): Write the Figma JSON without indentation.
+        formats (iterable): Additional export formats from app.exporters.
+        compression (str, optional): Compress every output while writing it.
+        compression_level (int, optional): Level for the compressor.
+
+    Returns:
+        list: One BatchResult per palette file, in completion order.
+    """
+    dirs, collisions = plan_outputs(
+        inputs, output_dir, export_json, formats, compression
+    )
+    if logger:
+        count = len(dirs) + len(collisions)
+        logger.info(f"Pipeline: {count} palette files -> {output_dir}")
+    exports = (["figma"] if export_json else []) + [
+        name for name in formats if name != "figma"
+    ]
+    pipeline = _Pipeline(
+        exports,
+        backend,
+        io_workers,
+        queue_size,
+        logger,
+        compact_json,
+        compression,
+        compression_level,
+    )
+    for path, owner in collisions.items():
+        pipeline.results.append(collision_result(path, owner))
+        if logger:
+            logger.error(f"Failed {path}: {pipeline.results[-1].error}")
+    PROFILER.reset()
+    start = time.perf_counter()
+    if workers and workers > 1:
+        cpu = ProcessPoolExecutor(max_workers=workers)
+    else:
+        cpu = ThreadPoolExecutor(max_workers=1)
+    io_pool = ThreadPoolExecutor(max_workers=io_workers * 3)
+    try:
+        results = asyncio.run(pipeline.run(dirs, cpu, max(workers or 1, 1), io_pool))
+    finally:
+        cpu.shutdown()
+        io_pool.shutdown()
+    elapsed = time.perf_counter() - start
+    if logger:
+        failed = sum(1 for r in results if r.error)
+        rate = len(results) / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"Pipeline finished: {len(results) - failed} rendered, {failed} failed "
+            f"in {elapsed:.2f}s ({rate:.1f} files/s)"
+        )
+    PROFILER.log_summary(logger)
+    return results
+
+
+class _Pipeline:
+    def __init__(
+        self,
+        exports,
+        backend,
+        io_workers,
+        queue_size,
+        logger,
+        compact_json,
+        compression,
+        compression_level,
+    ):
+        self.exports = exports
+        self.backend = backend
+        self.io_workers = io_workers
+        self.queue_size = queue_size
+        self.logger = logger
+        self.compact_json = compact_json
+        self.compression = compression
+        self.compression_level = compression_level
+        self.results = []
+
+    async def run(self, dirs, cpu, cpu_workers, io_pool) -> list:
+        loop = asyncio.get_running_loop()
+
+        def on(executor, stage_name):
+            async def call(func, *args):
+                with stage(stage_name):
+                    return await loop.run_in_executor(executor, func, *args)
+
+            return call
+
+        self.read = on(io_pool, "read")
+        self.parse = on(cpu, "parse")
+        self.render = on(cpu, "render")
+        self.write = on(io_pool, "save")
+        self.export = on(io_pool, "export")
+
+        stages = [
+            (self._read_parse, self.io_workers),
+            (self._render, cpu_workers),
+            (self._write_svg, self.io_workers),
+            (self._write_json, self.io_workers),
+        ]
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(stages) + 1)]
+        queues[-1] = None
+        tasks = [
+            asyncio.ensure_future(
+                _run_stage(
+                    func,
+                    queues[i],
+                    queues[i + 1],
+                    count,
+                    stages[i + 1][1] if i + 1 < len(stages) else 0,
+                    self._finish,
+                )
+            )
+            for i, (func, count) in enumerate(stages)
+        ]
+        for path, output_dir in dirs.items():
+            await queues[0].put(_Job(path, output_dir))
+        for _ in range(stages[0][1]):
+            await queues[0].put(_DONE)
+        await asyncio.gather(*tasks)
+        return self.results
+
+    async def _read_parse(self, job):
+        text = await self.read(_read_text, job.path)
+        job.palette = await self.parse(_parse, text)
+        if not job.palette:
+            job.error = "No valid colors found."
+
+    async def _render(self, job):
+        job.svg = await self.render(_render, job.palette, self.backend)
+
+    async def _write_svg(self, job):
+        base_name = os.path.splitext(os.path.basename(job.path))[0]
+        job.svg_path = compressed_path(
+            os.path.join(job.output_dir, f"{base_name}.svg"), self.compression
+        )
+        await self.write(
+            _write_text, job.svg_path, job.svg, self.compression, self.compression_level
+        )
+        job.svg = None
+
+    async def _write_json(self, job):
+        if self.exports:
+            artifacts = await self.export(
+                export_formats,
+                job.palette,
+                job.path,
+                job.output_dir,
+                self.exports,
+                self.compact_json,
+                self.compression,
+                self.compression_level,
+            )
+            job.json_path = artifacts.get("figma")
+
+    def _finish(self, job):
+        job.palette = None
+        seconds = time.perf_counter() - job.start
+        if job.error:
+            result = BatchResult(job.path, None, None, seconds, job.error)
+            if self.logger:
+                self.logger.error(f"Failed {job.path}: {job.error}")
+        else:
+            result = BatchResult(job.path, job.svg_path, job.json_path, seconds, None)
+            if self.logger:
+                self.logger.info(f"Done {job.path} in {seconds * 1000:.1f} ms")
+        self.results.append(result)
+
+
+async def _run_stage(func, inbox, outbox, workers, next_workers, finish):
+    """
+    Runs `workers` consumers of inbox that apply func to each job and pass it on to
+    outbox, or to finish after the last stage. Failed jobs skip the remaining stages
+    but still reach finish, so every file gets a result. Once all consumers have
+    stopped, the next stage is told to stop.
+    """
+
+    async def worker():
+        while True:
+            job = await inbox.get()
+            if job is _DONE:
+                return
+            if job.error is None:
+                try:
+                    await func(job)
+                except Exception as error:
+                    job.error = str(error)
+            if outbox is None:
+                finish(job)
+            else:
+                await outbox.put(job)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if outbox is not None:
+        for _ in range(next_workers):
+            await outbox.put(_DONE)
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _parse(text: str) -> Palette:
+    return Palette.from_parsed(parse_text(text))
+
+
+def _render(palette: Palette, backend: str) -> str:
+    buffer = io.StringIO()
+    render_svg_document(buffer, palette, backend)
+    return buffer.getvalue()
+
+
+def _write_text(path: str, text: str, compression=None, level=None) -> None:
+    with open_output(path, compression, level) as f:
+        f.write(text)
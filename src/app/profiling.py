@@ -0,0 +1,174 @@
+"""
+Stage timing and profiling for InkGrid.
+Collects wall times of the parse, layout, render, save and JSON export stages,
+summarizes them as counts and percentiles, and writes the summary as JSON lines
+through the shared logger. Optionally captures cProfile and tracemalloc data for
+a whole run.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+PERCENTILES = (50, 90, 99)
+TRACEMALLOC_TOP = 25
+
+
+class StageProfiler:
+    """
+    Thread-safe collection of stage durations in seconds.
+    """
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the enclosed block as one sample of the given stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        """
+        Decorator that times every call of the wrapped function as the given stage.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[name].append(seconds)
+
+    def merge(self, samples: dict) -> None:
+        """
+        Adds samples collected elsewhere, e.g. returned from a worker process.
+        """
+        with self._lock:
+            for name, values in samples.items():
+                self._samples[name].extend(values)
+
+    def drain(self) -> dict:
+        """
+        Returns all samples collected so far and clears them.
+        """
+        with self._lock:
+            samples = dict(self._samples)
+            self._samples.clear()
+        return samples
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> dict:
+        """
+        Aggregates the samples per stage.
+
+        Returns:
+            dict: Stage name to count, total, mean, max and percentiles (in milliseconds).
+        """
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        summary = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            stats = {
+                "count": len(values),
+                "total_ms": sum(values) * 1000,
+                "mean_ms": sum(values) / len(values) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+            for p in PERCENTILES:
+                stats[f"p{p}_ms"] = _percentile(values, p) * 1000
+            summary[name] = {key: round(value, 3) for key, value in stats.items()}
+        return summary
+
+    def log_summary(self, logger) -> None:
+        """
+        Writes one JSON line per stage through the logger.
+        """
+        if not logger:
+            return
+        for name, stats in self.summary().items():
+            record = {"event": "stage_timing", "stage": name}
+            record.update(stats)
+            logger.info(json.dumps(record, sort_keys=True))
+
+
+def _percentile(sorted_values: list, percentile: int) -> float:
+    """
+    Nearest-rank percentile of an already sorted, non-empty list.
+    """
+    rank = max(1, -(-percentile * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+class RunProfiler:
+    """
+    Opt-in cProfile and tracemalloc capture around a complete run.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._profile = None
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self, base_path: str) -> list:
+        """
+        Stops capturing and writes <base_path>.prof (cProfile, readable with pstats)
+        and <base_path>.tracemalloc.txt (peak memory and top allocation sites).
+
+        Returns:
+            list: Paths of the written files.
+        """
+        if not self.enabled or self._profile is None:
+            return []
+        import tracemalloc
+
+        self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profile_path = f"{base_path}.prof"
+        self._profile.dump_stats(profile_path)
+        self._profile = None
+
+        memory_path = f"{base_path}.tracemalloc.txt"
+        with open(memory_path, "w", encoding="utf-8") as f:
+            f.write(f"current: {current} bytes\npeak: {peak} bytes\n\n")
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+        return [profile_path, memory_path]
+
+
+PROFILER = StageProfiler()
+stage = PROFILER.stage
+timed = PROFILER.timed
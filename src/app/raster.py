@@ -0,0 +1,113 @@
+"""
+PNG preview rendering for InkGrid.
+Draws the light and dark backgrounds, swatches, labels and hex codes with Pillow
+straight from the layout table (see app.layout), at any scale, without producing
+or rasterizing an SVG first.
+"""
+
+import functools
+from app.layout import layout_for
+from app.profiling import timed
+from app.generate import (
+    SWATCH_WIDTH,
+    SWATCH_HEIGHT,
+    MARGIN,
+    LABEL_FONT_SIZE,
+    HEX_FONT_SIZE,
+    LABEL_OFFSET_X,
+    HEX_OFFSET_X,
+    LABEL_OFFSET_Y,
+    HEX_OFFSET_Y,
+)
+
+SWATCH_RADIUS = 10
+FONT_NAMES = ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf")
+
+
+@timed("raster")
+def render_png(grouped_colors, output_file: str, scale: float = 1.0, layout=None):
+    """
+    Renders the palette as a PNG with the same geometry as the SVG backends.
+
+    Args:
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        output_file (str): Destination path.
+        scale (float): Pixels per SVG unit, e.g. 0.25 for thumbnails or 2 for high-DPI docs.
+        layout (Layout, optional): Precomputed layout table; computed if omitted.
+
+    Returns:
+        str: output_file
+    """
+    from PIL import Image, ImageDraw
+
+    if scale <= 0:
+        raise ValueError(f"Scale must be positive: {scale}")
+    if layout is None:
+        layout = layout_for(grouped_colors)
+
+    def px(value):
+        return int(round(value * scale))
+
+    image = Image.new("RGBA", (px(layout.svg_width), px(layout.svg_height)))
+    draw = ImageDraw.Draw(image)
+    dark_y = layout.bg_height + layout.gap_between
+    for top, fill in ((0, "white"), (dark_y, "black")):
+        draw.rounded_rectangle(
+            (0, px(top), px(layout.svg_width), px(top + layout.bg_height)),
+            radius=px(MARGIN // 2),
+            fill=fill,
+        )
+
+    label_font = _font(px(_font_size(LABEL_FONT_SIZE)))
+    hex_font = _font(px(_font_size(HEX_FONT_SIZE)))
+    positions = layout.positions()
+    swatches = [
+        (label, color, x, y)
+        for entries in grouped_colors.values()
+        for (label, color), (x, y) in zip(entries, positions)
+    ]
+    for y_offset, text_color in ((0, "black"), (layout.dark_offset, "white")):
+        for label, color, x, y in swatches:
+            y += y_offset
+            draw.rounded_rectangle(
+                (px(x), px(y), px(x + SWATCH_WIDTH), px(y + SWATCH_HEIGHT)),
+                radius=px(SWATCH_RADIUS),
+                fill=color,
+            )
+            # SVG text y is the baseline, hence the left-baseline anchor.
+            draw.text(
+                (px(x + LABEL_OFFSET_X), px(y - LABEL_OFFSET_Y)),
+                label,
+                fill=text_color,
+                font=label_font,
+                anchor="ls",
+            )
+            draw.text(
+                (px(x + HEX_OFFSET_X), px(y + SWATCH_HEIGHT + HEX_OFFSET_Y)),
+                color,
+                fill=text_color,
+                font=hex_font,
+                anchor="ls",
+            )
+    image.save(output_file, format="PNG")
+    return output_file
+
+
+def _font_size(css_size: str) -> int:
+    return int(css_size.rstrip("px"))
+
+
+@functools.lru_cache(maxsize=None)
+def _font(size: int):
+    """
+    Returns Arial at the given pixel size where installed, else Pillow's bundled font.
+    """
+    from PIL import ImageFont
+
+    size = max(size, 1)
+    for name in FONT_NAMES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
@@ -0,0 +1,511 @@
+"""
+Local render service for InkGrid.
+A long-running HTTP daemon on localhost that keeps a process pool warm, with svgwrite
+and the generate/export modules already imported, so build systems that render many
+palettes pay Python start-up and imports once instead of per invocation. It renders
+palette files to output paths or palette text to SVG/JSON in the response, and comes
+with a thin client that only imports the standard library modules it needs.
+
+The service only listens on loopback addresses. On start it writes a random token to a
+file only the current user can read, and every request must carry that token, a Host
+header naming a loopback address and no Origin header; POST requests must be sent as
+application/json. Together these keep web pages (cross-origin form posts and DNS
+rebinding) and other users on the machine from rendering to arbitrary paths or
+stopping the service.
+
+Usage:
+    PYTHONPATH=src python -m app.service serve [--port 8765] [--workers 4]
+    PYTHONPATH=src python -m app.service render palettes/brand.txt -o out
+    PYTHONPATH=src python -m app.service render palettes/brand.txt --stdout
+    PYTHONPATH=src python -m app.service status | stop
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".inkgrid", "service.token")
+# Imported by every worker when the pool starts, before the first request arrives.
+# app.raster imports Pillow lazily, so Pillow is listed on its own.
+WARM_MODULES = (
+    "svgwrite",
+    "app.generate",
+    "app.svg_writer",
+    "app.layout",
+    "app.export",
+    "app.exporters",
+    "app.raster",
+    "PIL.Image",
+    "PIL.ImageDraw",
+)
+# Keyword options a /render request may pass on to batch.render_file.
+RENDER_OPTIONS = (
+    "export_json",
+    "compact_json",
+    "formats",
+    "backend",
+    "compression",
+    "compression_level",
+    "png_scale",
+)
+
+
+class ServiceError(RuntimeError):
+    """
+    Raised by the client when the service is unreachable or rejects a request.
+    """
+
+
+# --- Server -------------------------------------------------------------------------
+
+
+class RenderService:
+    """
+    HTTP front end for a warm process pool, bound to a loopback address and guarded
+    by the token written to token_file (see the module docstring).
+
+    Endpoints (JSON in and out):
+        GET  /health    Worker count and number of handled renders.
+        POST /render    {"path", "output_dir", ...options} renders a file and returns
+                        the BatchResult fields; {"text", ...options} returns the
+                        rendered "svg" and "json" strings instead.
+        POST /shutdown  Stops the service.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: int = None,
+        cache=None,
+        logger=None,
+        token_file: str = DEFAULT_TOKEN_FILE,
+    ):
+        import secrets
+        import threading
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not _resolves_to_loopback(host):
+            raise ValueError(f"The render service only listens on loopback: {host}")
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.logger = logger
+        self.renders = 0
+        self._lock = threading.Lock()
+        self.token = secrets.token_hex(32)
+        self.token_file = token_file
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        # Start every worker now rather than on the first requests.
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        self.server = _make_server(self, host, port)
+        _write_token(token_file, self.token)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def serve_forever(self) -> None:
+        from app.profiling import PROFILER
+
+        if self.logger:
+            host, port = self.address
+            self.logger.info(
+                f"Render service on http://{host}:{port} with {self.workers} workers"
+            )
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self.pool.shutdown()
+            _remove_token(self.token_file, self.token)
+            PROFILER.log_summary(self.logger)
+
+    def shutdown(self) -> None:
+        """
+        Stops serve_forever; safe to call from a request handler thread.
+        """
+        import threading
+
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def authorize(self, method: str, headers) -> tuple:
+        """
+        Checks the headers of a request before its body is read.
+
+        Args:
+            method (str): "GET" or "POST".
+            headers: Mapping of request headers (case-insensitive lookups).
+
+        Returns:
+            tuple: (HTTP status, error body) for a rejected request, or None.
+        """
+        import hmac
+
+        if not _is_loopback_host(headers.get("Host") or ""):
+            return 403, {"error": "Host must be a loopback address."}
+        if headers.get("Origin") is not None:
+            return 403, {"error": "Cross-origin requests are not allowed."}
+        scheme, _, token = (headers.get("Authorization") or "").partition(" ")
+        if scheme != "Bearer" or not hmac.compare_digest(
+            token.encode("utf-8"), self.token.encode("utf-8")
+        ):
+            return 401, {"error": "Missing or wrong service token."}
+        content_type = (headers.get("Content-Type") or "").split(";")[0].strip()
+        if method == "POST" and content_type != "application/json":
+            return 415, {"error": "Requests must be sent as application/json."}
+        return None
+
+    def handle(self, method: str, endpoint: str, payload: dict):
+        """
+        Dispatches one request.
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable response body)
+        """
+        if method == "GET" and endpoint == "/health":
+            return 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "renders": self.renders,
+            }
+        if method == "POST" and endpoint == "/shutdown":
+            self.shutdown()
+            return 200, {"status": "stopping"}
+        if method == "POST" and endpoint == "/render":
+            return self._render(payload)
+        return 404, {"error": f"Unknown endpoint: {method} {endpoint}"}
+
+    def _render(self, payload: dict):
+        from app.batch import render_task
+        from app.profiling import PROFILER
+
+        options = {k: v for k, v in payload.items() if k in RENDER_OPTIONS}
+        unknown = set(payload) - set(RENDER_OPTIONS) - {"path", "output_dir", "text"}
+        if unknown:
+            return 400, {"error": f"Unknown fields: {', '.join(sorted(unknown))}"}
+        if "formats" in options:
+            options["formats"] = tuple(options["formats"])
+        if "text" in payload:
+            allowed = {"export_json", "compact_json", "backend"}
+            result = self.pool.submit(
+                render_text,
+                payload["text"],
+                **{k: v for k, v in options.items() if k in allowed},
+            ).result()
+        elif "path" in payload:
+            path = os.path.abspath(payload["path"])
+            output_dir = os.path.abspath(
+                payload.get("output_dir") or os.path.dirname(path)
+            )
+            os.makedirs(output_dir, exist_ok=True)
+            export_json = options.pop("export_json", True)
+            batch_result = self.pool.submit(
+                render_task, path, output_dir, export_json, self.cache, **options
+            ).result()
+            if batch_result.timings:
+                PROFILER.merge(batch_result.timings)
+            result = batch_result._replace(timings=None)._asdict()
+            del result["timings"]
+        else:
+            return 400, {"error": "Either 'path' or 'text' is required."}
+        with self._lock:
+            self.renders += 1
+        if self.logger:
+            status = f"failed: {result['error']}" if result["error"] else "done"
+            self.logger.info(f"Render {payload.get('path', '<text>')} {status}")
+        return (422 if result["error"] else 200), result
+
+
+def _make_server(service: RenderService, host: str, port: int):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _dispatch(self, method):
+            rejected = service.authorize(method, self.headers)
+            if rejected:
+                self.close_connection = True
+                self._respond(*rejected)
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("Request body must be a JSON object.")
+                status, body = service.handle(method, self.path, payload)
+            except ValueError as error:
+                status, body = 400, {"error": str(error)}
+            except Exception as error:
+                status, body = 500, {"error": str(error)}
+            self._respond(status, body)
+
+        def _respond(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            if service.logger:
+                service.logger.debug(format % args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _resolves_to_loopback(host: str) -> bool:
+    """
+    Returns whether host (a name or address) resolves to a loopback address only.
+    """
+    import ipaddress
+
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except socket.gaierror:
+        return False
+    return all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def _is_loopback_host(value: str) -> bool:
+    """
+    Returns whether a Host header names "localhost" or a loopback address literal.
+    Other names are not resolved, so a rebound DNS name is rejected.
+    """
+    import ipaddress
+
+    if value.startswith("["):
+        name = value[1:].partition("]")[0]
+    elif value.count(":") == 1:
+        name = value.partition(":")[0]
+    else:
+        name = value
+    if name == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(name).is_loopback
+    except ValueError:
+        return False
+
+
+def _write_token(path: str, token: str) -> None:
+    """
+    Writes token to path, readable and writable by the current user only.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+    os.replace(temp_path, path)
+
+
+def _remove_token(path: str, token: str) -> None:
+    """
+    Removes the token file unless another service has replaced it since.
+    """
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            if f.read().strip() == token:
+                os.remove(path)
+    except OSError:
+        pass
+
+
+def _warm_up() -> None:
+    import importlib
+
+    for name in WARM_MODULES:
+        importlib.import_module(name)
+
+
+def render_text(
+    text: str, export_json: bool = True, compact_json: bool = False, backend="string"
+) -> dict:
+    """
+    Renders palette text in memory. Runs inside the worker processes.
+
+    Returns:
+        dict: "svg" and "json" documents as strings ("json" is None without
+          export_json), and "error", which is set if the text has no colors.
+    """
+    import io
+    from app.exporters import EXPORTERS
+    from app.generate import render_svg_document
+    from app.palette import Palette
+    from app.palette_parser import parse_text
+
+    palette = Palette.from_parsed(parse_text(text))
+    if not palette:
+        return {"svg": None, "json": None, "error": "No valid colors found."}
+    svg = io.StringIO()
+    render_svg_document(svg, palette, backend)
+    tokens = None
+    if export_json:
+        buffer = io.StringIO()
+        EXPORTERS["figma"].write(palette, buffer, compact_json)
+        tokens = buffer.getvalue()
+    return {"svg": svg.getvalue(), "json": tokens, "error": None}
+
+
+# --- Client -------------------------------------------------------------------------
+
+
+def request(
+    endpoint: str,
+    payload: dict = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    timeout: float = 300.0,
+    token_file: str = DEFAULT_TOKEN_FILE,
+) -> dict:
+    """
+    Sends one request to the service: GET without a payload, POST with one,
+    authenticated with the token the service wrote to token_file.
+
+    The request is written over a plain socket because http.client (through the
+    email package) would add more start-up time than a render takes on the service.
+
+    Returns:
+        dict: The decoded JSON response.
+
+    Raises:
+        ServiceError: If the service is unreachable, its token file cannot be read or
+          it answers with an error status.
+    """
+    try:
+        with open(token_file, "r", encoding="ascii") as f:
+            token = f.read().strip()
+    except OSError as error:
+        raise ServiceError(
+            f"InkGrid service token not readable (is the service running?): {error}"
+        ) from None
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    method = "GET" if payload is None else "POST"
+    head = (
+        f"{method} {endpoint} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Authorization: Bearer {token}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as conn:
+            conn.sendall(head.encode("ascii") + body)
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError as error:
+        raise ServiceError(
+            f"InkGrid service not reachable on {host}:{port}: {error}"
+        ) from None
+    header, _, content = b"".join(chunks).partition(b"\r\n\r\n")
+    status = int(header.split(b" ", 2)[1])
+    response = json.loads(content or b"{}")
+    if status >= 400 and status != 422:
+        raise ServiceError(response.get("error", f"HTTP {status}"))
+    return response
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="InkGrid local render service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--token-file",
+        default=DEFAULT_TOKEN_FILE,
+        help="File the service writes its access token to (mode 0600).",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    serve = commands.add_parser("serve", help="Run the service in the foreground.")
+    serve.add_argument("-w", "--workers", type=int, default=None)
+    serve.add_argument("--cache-dir", help="Reuse output of unchanged palettes.")
+
+    render = commands.add_parser("render", help="Render palette files via the service.")
+    render.add_argument("inputs", nargs="+", help="Palette files.")
+    render.add_argument("-o", "--output", help="Output directory.")
+    render.add_argument("--svg-backend", default="svgwrite")
+    render.add_argument("--no-json", action="store_true")
+    render.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Send the palette text and print the SVG instead of writing files.",
+    )
+
+    commands.add_parser("status", help="Show whether the service is running.")
+    commands.add_parser("stop", help="Stop the running service.")
+    args = parser.parse_args(argv)
+    address = {"host": args.host, "port": args.port, "token_file": args.token_file}
+
+    if args.command == "serve":
+        return _serve(args)
+    try:
+        if args.command == "status":
+            print(json.dumps(request("/health", **address)))
+        elif args.command == "stop":
+            request("/shutdown", {}, **address)
+        else:
+            return _render_files(args, address)
+    except ServiceError as error:
+        print(error, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _serve(args) -> int:
+    from app.logger_config import setup_logger
+
+    cache = None
+    if args.cache_dir:
+        from app.cache import RenderCache
+
+        cache = RenderCache(args.cache_dir)
+    logger = setup_logger(log_to_file=False)
+    RenderService(
+        args.host, args.port, args.workers, cache, logger, args.token_file
+    ).serve_forever()
+    return 0
+
+
+def _render_files(args, address) -> int:
+    status = 0
+    for path in args.inputs:
+        options = {"backend": args.svg_backend, "export_json": not args.no_json}
+        if args.stdout:
+            with open(path, "r", encoding="utf-8") as f:
+                result = request("/render", dict(options, text=f.read()), **address)
+            if not result["error"]:
+                sys.stdout.write(result["svg"])
+        else:
+            payload = dict(options, path=os.path.abspath(path))
+            if args.output:
+                payload["output_dir"] = os.path.abspath(args.output)
+            result = request("/render", payload, **address)
+            if not result["error"]:
+                print(result["svg_path"])
+                if result["json_path"]:
+                    print(result["json_path"])
+        if result["error"]:
+            print(f"Failed {path}: {result['error']}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
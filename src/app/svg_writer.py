@@ -0,0 +1,564 @@
+"""
+Direct string-emitting SVG writer for InkGrid.
+Writes the same layer structure as the svgwrite backend in app.generate
+(Backgrounds, LightModeSwatches, DarkModeSwatches) straight into a file object
+from precomputed element templates, without building an svgwrite object tree.
+In shared mode the dark layer is a single <use> of the light layer instead of a second
+copy of every swatch, which roughly halves serialization time and file size. Compact
+mode builds on that and moves the shared styling into a <style> block and a <symbol>.
+The escaped text fragments of each swatch are memoized (see swatch_fragment), and
+GroupTemplates keeps the serialized markup of whole groups that recur across a batch.
+"""
+
+import functools
+import shutil
+import tempfile
+from collections import OrderedDict
+from app.utils import sanitize_id, iter_color_file, open_output
+from app.layout import layout_for
+from app.generate import (
+    calculate_dimensions_from_counts,
+    calculate_group_origins,
+    swatch_position,
+    SWATCH_WIDTH,
+    SWATCH_HEIGHT,
+    MARGIN,
+    LABEL_FONT_SIZE,
+    HEX_FONT_SIZE,
+    LABEL_OFFSET_X,
+    HEX_OFFSET_X,
+    LABEL_OFFSET_Y,
+    HEX_OFFSET_Y,
+)
+
+XML_HEADER = '<?xml version="1.0" encoding="utf-8" ?>\n'
+
+SVG_OPEN = (
+    '<svg baseProfile="tiny" height="{height}" version="1.2" width="{width}" '
+    'xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:ev="http://www.w3.org/2001/xml-events" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink"><defs />'
+)
+
+BACKGROUNDS = (
+    '<g id="Backgrounds">'
+    '<rect fill="white" height="{height}" id="LightBackground" '
+    f'rx="{MARGIN // 2}" ry="{MARGIN // 2}" width="{{width}}" x="0" y="0" />'
+    '<rect fill="black" height="{height}" id="DarkBackground" '
+    f'rx="{MARGIN // 2}" ry="{MARGIN // 2}" width="{{width}}" x="0" y="{{dark_y}}" />'
+    "</g>"
+)
+
+# Positional fields: id, color, x, y, text color, label x, label y, label, hex x, hex y
+SWATCH = (
+    '<g id="{0}_{2}_{3}">'
+    f'<rect fill="{{1}}" height="{SWATCH_HEIGHT}" rx="10" ry="10" '
+    f'width="{SWATCH_WIDTH}" x="{{2}}" y="{{3}}" />'
+    f'<text fill="{{4}}" font-family="Arial" font-size="{LABEL_FONT_SIZE}" '
+    'x="{5}" y="{6}">{7}</text>'
+    f'<text fill="{{4}}" font-family="Arial" font-size="{HEX_FONT_SIZE}" '
+    'x="{8}" y="{9}">{1}</text>'
+    "</g>"
+)
+
+# Shared mode: swatch text takes its fill from the inherited color property, black on the
+# root and white on the <use> element that instantiates the light layer as the dark one.
+SHARED_SVG_OPEN = SVG_OPEN.replace(
+    'height="{height}"', 'color="black" height="{height}"'
+)
+
+SHARED_TEXT_COLOR = "currentColor"
+
+SHARED_DARK_LAYER = (
+    '<g id="DarkModeSwatches">'
+    '<use color="white" xlink:href="#LightModeSwatches" x="0" y="{dark_offset}" />'
+    "</g>"
+)
+
+# Compact mode (SVG 1.1; the tiny profile has no <style> or <symbol>): text styling lives
+# in CSS, the rounded rect is a symbol, and each swatch is translated to its position so
+# that all coordinates inside it are the same short constants.
+COMPACT_SVG_OPEN = (
+    '<svg color="black" height="{height}" version="1.1" width="{width}" '
+    'xmlns="http://www.w3.org/2000/svg" '
+    'xmlns:xlink="http://www.w3.org/1999/xlink"><defs><style>'
+    f"text{{{{font:{HEX_FONT_SIZE} Arial;fill:currentColor}}}}"
+    f".l{{{{font-size:{LABEL_FONT_SIZE}}}}}</style>"
+    '<symbol id="s" overflow="visible">'
+    f'<rect height="{SWATCH_HEIGHT}" rx="10" width="{SWATCH_WIDTH}"/></symbol></defs>'
+)
+
+# Element ids of the compact document that swatch ids must not take.
+COMPACT_RESERVED_IDS = (
+    "s",
+    "Backgrounds",
+    "LightBackground",
+    "DarkBackground",
+    "LightModeSwatches",
+    "DarkModeSwatches",
+)
+
+# Positional fields: id, color, x, y, label
+COMPACT_SWATCH = (
+    '<g id="{0}" transform="translate({2},{3})"><use fill="{1}" xlink:href="#s"/>'
+    f'<text class="l" x="{LABEL_OFFSET_X}" y="{-LABEL_OFFSET_Y}">{{4}}</text>'
+    f'<text x="{HEX_OFFSET_X}" y="{SWATCH_HEIGHT + HEX_OFFSET_Y}">{{1}}</text></g>'
+)
+
+_ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+SPOOL_MAX_SIZE = 1024 * 1024
+# Per process: characters of cached group markup, and group hashes remembered to
+# recognise a group's second occurrence.
+GROUP_TEMPLATE_BYTES = 8 * 1024 * 1024
+GROUP_SEEN_LIMIT = 65536
+SWATCH_FRAGMENT_LIMIT = 16384
+
+
+class GroupTemplates:
+    """
+    Serialized swatch groups keyed by their content (labels, colors and text color)
+    with the vertical position left open. A group that recurs in many palettes, such as
+    a shared "Neutral" ramp, is escaped and formatted once and then placed at its
+    origin with a single str.format call.
+
+    Only groups that recur get a template: the first time a group is seen, recurs()
+    just remembers the hash of its entries (up to max_seen of them) and the writer
+    formats it like any other, so batches without shared groups pay no extra work or
+    memory. Least recently used templates are dropped once they add up to more than
+    max_bytes.
+    """
+
+    def __init__(
+        self, max_bytes: int = GROUP_TEMPLATE_BYTES, max_seen: int = GROUP_SEEN_LIMIT
+    ):
+        self.max_bytes = max_bytes
+        self.max_seen = max_seen
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._templates = OrderedDict()
+        self._seen = {}
+
+    def recurs(self, entries: tuple) -> bool:
+        """
+        Returns whether a group with these (label, hex) entries was seen before, and
+        remembers it otherwise.
+        """
+        digest = hash(entries)
+        if digest in self._seen:
+            return True
+        self._seen[digest] = None
+        if len(self._seen) > self.max_seen:
+            del self._seen[next(iter(self._seen))]
+        return False
+
+    def render(self, entries, offsets, origin_y: int, text_color: str) -> str:
+        """
+        Returns the markup of one group, identical to formatting each swatch directly,
+        from its template (built on the first call).
+
+        Args:
+            entries (tuple): (label, hex) pairs of the group.
+            offsets (list): (x, y - origin_y) of each swatch, which only depend on
+              the number of entries.
+            origin_y (int): y of the group's first row.
+            text_color (str): Fill of the label and hex texts.
+        """
+        key = (entries, text_color)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            self._templates.move_to_end(key)
+        else:
+            self.misses += 1
+            template = _group_template(entries, offsets, text_color)
+            self._templates[key] = template
+            self.size += len(template[0])
+            while self.size > self.max_bytes and len(self._templates) > 1:
+                _, (markup, _) = self._templates.popitem(last=False)
+                self.size -= len(markup)
+        markup, fields = template
+        return markup.format(*[origin_y + dy for dy in fields])
+
+
+def _group_template(entries, offsets, text_color) -> tuple:
+    """
+    Joins the swatch markup of a group with x filled in and a numbered replacement
+    field wherever a y coordinate goes; braces in the escaped text are doubled.
+
+    Returns:
+        tuple: (format string, y offset of each field)
+    """
+    fields = {}
+    rows = {}
+    parts = []
+    for (label, color), (x, dy) in zip(entries, offsets):
+        s_id, escaped_color, escaped_label = swatch_fragment(label, color)
+        row = rows.get(dy)
+        if row is None:
+            row = rows[dy] = tuple(
+                f"{{{fields.setdefault(offset, len(fields))}}}"
+                for offset in (
+                    dy,
+                    dy - LABEL_OFFSET_Y,
+                    dy + SWATCH_HEIGHT + HEX_OFFSET_Y,
+                )
+            )
+        y, label_y, hex_y = row
+        parts.append(
+            SWATCH.format(
+                _literal(s_id),
+                _literal(escaped_color),
+                x,
+                y,
+                text_color,
+                x + LABEL_OFFSET_X,
+                label_y,
+                _literal(escaped_label),
+                x + HEX_OFFSET_X,
+                hex_y,
+            )
+        )
+    return "".join(parts), list(fields)
+
+
+def _literal(text: str) -> str:
+    """
+    Doubles braces so that text survives a later str.format call.
+    """
+    if "{" in text or "}" in text:
+        return text.replace("{", "{{").replace("}", "}}")
+    return text
+
+
+def escape(data: str, entities: dict = None) -> str:
+    """
+    Escapes &, < and > (plus any extra entities) like xml.sax.saxutils.escape,
+    which is avoided because importing it pulls in urllib and the email package.
+    """
+    data = data.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+    if entities:
+        for key, value in entities.items():
+            data = data.replace(key, value)
+    return data
+
+
+def write_svg(
+    fileobj,
+    grouped_colors,
+    svg_width: int,
+    bg_height: int,
+    gap_between: int,
+    layout=None,
+    shared_dark: bool = False,
+    group_templates: GroupTemplates = None,
+) -> None:
+    """
+    Writes the full SVG document for grouped colors into a text file object.
+
+    Args:
+        fileobj: Writable text file object.
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        svg_width (int): Total width of the SVG.
+        bg_height (int): Height of each background section.
+        gap_between (int): Vertical gap between the two background sections.
+        layout (Layout, optional): Precomputed layout table (see app.layout); computed if omitted.
+        shared_dark (bool): Write the dark layer as a <use> of the light layer.
+        group_templates (GroupTemplates, optional): Reuse the markup of groups seen before.
+    """
+    write = fileobj.write
+    write(XML_HEADER)
+    svg_open = SHARED_SVG_OPEN if shared_dark else SVG_OPEN
+    write(svg_open.format(width=svg_width, height=bg_height * 2 + gap_between))
+    write(
+        BACKGROUNDS.format(
+            width=svg_width, height=bg_height, dark_y=bg_height + gap_between
+        )
+    )
+    if group_templates is not None:
+        blocks = _group_blocks(grouped_colors, layout, group_templates)
+
+        def write_layer(y_offset, text_color):
+            for entries, offsets, origin, swatches in blocks:
+                if swatches is not None:
+                    _write_swatches(write, swatches, y_offset, text_color)
+                    continue
+                write(
+                    group_templates.render(
+                        entries, offsets, origin + y_offset, text_color
+                    )
+                )
+
+    else:
+        swatches = _prepare_swatches(grouped_colors, layout)
+
+        def write_layer(y_offset, text_color):
+            _write_swatches(write, swatches, y_offset, text_color)
+
+    write('<g id="LightModeSwatches">')
+    if shared_dark:
+        write_layer(0, SHARED_TEXT_COLOR)
+        write("</g>")
+        write(SHARED_DARK_LAYER.format(dark_offset=bg_height + MARGIN))
+        write("</svg>")
+        return
+    write_layer(0, "black")
+    write('</g><g id="DarkModeSwatches">')
+    write_layer(bg_height + MARGIN, "white")
+    write("</g></svg>")
+
+
+def save_svg(
+    grouped_colors,
+    output_file: str,
+    svg_width: int,
+    bg_height: int,
+    gap_between: int,
+    layout=None,
+    shared_dark: bool = False,
+    compact: bool = False,
+    compression: str = None,
+    compression_level: int = None,
+    group_templates: GroupTemplates = None,
+) -> None:
+    """
+    Writes the SVG document for grouped colors to output_file.
+
+    Args:
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        output_file (str): Destination path.
+        svg_width (int): Total width of the SVG.
+        bg_height (int): Height of each background section.
+        gap_between (int): Vertical gap between the two background sections.
+        layout (Layout, optional): Precomputed layout table (see app.layout); computed if omitted.
+        shared_dark (bool): Write the dark layer as a <use> of the light layer.
+        compact (bool): Write the compact document (see write_compact_svg).
+        compression (str, optional): Compress while writing (see app.utils.open_output).
+        compression_level (int, optional): Level for the compressor.
+        group_templates (GroupTemplates, optional): Reuse the markup of groups seen
+          before (not used by the compact document).
+    """
+    with open_output(output_file, compression, compression_level) as f:
+        if compact:
+            write_compact_svg(
+                f, grouped_colors, svg_width, bg_height, gap_between, layout
+            )
+            return
+        write_svg(
+            f,
+            grouped_colors,
+            svg_width,
+            bg_height,
+            gap_between,
+            layout,
+            shared_dark,
+            group_templates,
+        )
+
+
+def write_compact_svg(
+    fileobj,
+    grouped_colors,
+    svg_width: int,
+    bg_height: int,
+    gap_between: int,
+    layout=None,
+) -> None:
+    """
+    Writes the compact SVG document: same layers and picture as write_svg, with the
+    dark layer shared as in shared mode, styling in CSS classes, the swatch rect
+    defined once as a symbol, and ids reduced to the sanitized label. Labels that
+    sanitize to nothing, repeat, or clash with COMPACT_RESERVED_IDS get the swatch
+    position appended.
+
+    Args:
+        fileobj: Writable text file object.
+        grouped_colors (Palette or OrderedDict): Palette or mapping of group names to lists of (label, hex) pairs.
+        svg_width (int): Total width of the SVG.
+        bg_height (int): Height of each background section.
+        gap_between (int): Vertical gap between the two background sections.
+        layout (Layout, optional): Precomputed layout table (see app.layout); computed if omitted.
+    """
+    write = fileobj.write
+    write(XML_HEADER)
+    write(COMPACT_SVG_OPEN.format(width=svg_width, height=bg_height * 2 + gap_between))
+    write(
+        BACKGROUNDS.format(
+            width=svg_width, height=bg_height, dark_y=bg_height + gap_between
+        )
+    )
+    write('<g id="LightModeSwatches">')
+    used = set(COMPACT_RESERVED_IDS)
+    for s_id, color, label, x, y in _prepare_swatches(grouped_colors, layout):
+        if not s_id or s_id in used:
+            s_id = f"{s_id}_{x}_{y}"
+            while s_id in used:
+                s_id += "_"
+        used.add(s_id)
+        write(COMPACT_SWATCH.format(s_id, color, x, y, label))
+    write("</g>")
+    write(SHARED_DARK_LAYER.format(dark_offset=bg_height + MARGIN))
+    write("</svg>")
+
+
+def _group_blocks(grouped_colors, layout, group_templates) -> list:
+    """
+    Splits the layout into (entries, swatch offsets from the group origin, origin y,
+    prepared swatches) per group. Groups that group_templates saw before get offsets
+    for their template; the others get their prepared swatches (see
+    _prepare_swatches) instead.
+    """
+    if layout is None:
+        layout = layout_for(grouped_colors)
+    positions = layout.positions()
+    blocks = []
+    for entries, origin in zip(grouped_colors.values(), layout.group_origins):
+        entries = tuple(entries)
+        if group_templates.recurs(entries):
+            offsets = [(x, y - origin) for _, (x, y) in zip(entries, positions)]
+            blocks.append((entries, offsets, origin, None))
+        else:
+            swatches = [
+                swatch_fragment(label, color) + (x, y)
+                for (label, color), (x, y) in zip(entries, positions)
+            ]
+            blocks.append((entries, None, origin, swatches))
+    return blocks
+
+
+def _prepare_swatches(grouped_colors, layout=None) -> list:
+    """
+    Resolves ids, escaped strings (see swatch_fragment) and light-mode positions once
+    for both layers.
+    """
+    if layout is None:
+        layout = layout_for(grouped_colors)
+    positions = layout.positions()
+    return [
+        swatch_fragment(label, color) + (x, y)
+        for entries in grouped_colors.values()
+        for (label, color), (x, y) in zip(entries, positions)
+    ]
+
+
+def _write_swatches(write, swatches, y_offset: int, text_color: str) -> None:
+    for s_id, color, label, x, y in swatches:
+        write(_format_swatch(s_id, color, label, x, y + y_offset, text_color))
+
+
+def swatch_markup(label: str, color: str, x: int, y: int, text_color: str) -> str:
+    """
+    Returns the markup of a single swatch group, as written into the swatch layers,
+    formatted from its cached fragments.
+    """
+    return _format_swatch(*swatch_fragment(label, color), x, y, text_color)
+
+
+@functools.lru_cache(maxsize=SWATCH_FRAGMENT_LIMIT)
+def swatch_fragment(label: str, color: str) -> tuple:
+    """
+    Returns the text fragments of a swatch that need sanitizing or escaping: the id
+    prefix, the escaped color and the escaped label. The key leaves out positions and
+    the text color, so one entry serves the light and the dark copy of a swatch and
+    every later file of the process that contains it.
+    """
+    return sanitize_id(label), escape(color, _ATTRIBUTE_ENTITIES), escape(label)
+
+
+def _format_swatch(s_id, color, label, x, y, text_color) -> str:
+    return SWATCH.format(
+        s_id,
+        color,
+        x,
+        y,
+        text_color,
+        x + LABEL_OFFSET_X,
+        y - LABEL_OFFSET_Y,
+        label,
+        x + HEX_OFFSET_X,
+        y + SWATCH_HEIGHT + HEX_OFFSET_Y,
+    )
+
+
+def fragment_stats() -> dict:
+    """
+    Returns hits, misses, current size and hit rate of the swatch fragment cache.
+    """
+    info = swatch_fragment.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+def stream_svg(
+    input_file: str,
+    output_file: str,
+    compression: str = None,
+    compression_level: int = None,
+) -> None:
+    """
+    Renders a color file to SVG in two passes without holding the palette in memory.
+
+    The first pass only counts colors per group to size the document and place each
+    group. The second pass writes light swatches to output_file as they are parsed and
+    spools the dark swatches to a temporary file that is appended afterwards.
+    Swatches are emitted in file order, so groups split across the file produce the
+    same picture as generate_svg_from_groups with a different element order.
+
+    Args:
+        input_file (str): Path to the color file.
+        output_file (str): Destination path.
+        compression (str, optional): Compress while writing (see app.utils.open_output).
+        compression_level (int, optional): Level for the compressor.
+
+    Raises:
+        ValueError: If the file has no valid colors; no output is written then.
+    """
+    group_sizes = OrderedDict()
+    for group, _, _ in iter_color_file(input_file):
+        group_sizes[group] = group_sizes.get(group, 0) + 1
+    if not group_sizes:
+        raise ValueError("No valid colors found.")
+
+    content_width, content_height = calculate_dimensions_from_counts(
+        list(group_sizes.values())
+    )
+    svg_width = content_width + 2 * MARGIN
+    gap_between = MARGIN
+    bg_height = content_height + 2 * MARGIN
+    dark_offset = bg_height + MARGIN
+
+    group_origin = dict(
+        zip(group_sizes, calculate_group_origins(list(group_sizes.values())))
+    )
+    placed = dict.fromkeys(group_sizes, 0)
+
+    with open_output(
+        output_file, compression, compression_level
+    ) as out, tempfile.SpooledTemporaryFile(
+        max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8"
+    ) as dark:
+        out.write(XML_HEADER)
+        out.write(SVG_OPEN.format(width=svg_width, height=bg_height * 2 + gap_between))
+        out.write(
+            BACKGROUNDS.format(
+                width=svg_width, height=bg_height, dark_y=bg_height + gap_between
+            )
+        )
+        out.write('<g id="LightModeSwatches">')
+        for group, label, color in iter_color_file(input_file):
+            index = placed[group]
+            placed[group] = index + 1
+            x, y = swatch_position(group_origin[group], index)
+            fragments = swatch_fragment(label, color)
+            out.write(_format_swatch(*fragments, x, y, "black"))
+            dark.write(_format_swatch(*fragments, x, y + dark_offset, "white"))
+        out.write('</g><g id="DarkModeSwatches">')
+        dark.seek(0)
+        shutil.copyfileobj(dark, out)
+        out.write("</g></svg>")
@@ -1,14 +1,24 @@
 """
-Utility functions for InkGrid. Handles reading color files and sanitizing IDs.
+Utility functions for InkGrid. Handles reading color files, sanitizing IDs and
+opening (optionally compressed) output files.
 """
 
+import io
 import re
 import os
 import logging
+from app.palette_parser import parse_file, iter_entries, format_hex
+from app.profiling import timed
 
 logger = logging.getLogger("app_logger")
 
+_NON_WORD = re.compile(r"\W+")
 
+COMPRESSIONS = ("gzip", "bz2", "xz")
+_COMPRESSED_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+
+
+@timed("parse")
 def read_color_file(file_path):
     """
     Reads colors from a file. Each line should have the format:
@@ -19,29 +29,75 @@ def read_color_file(file_path):
         logger.error(f"File not found: {file_path}")
         return []
 
-    colors = []
-    import re
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if ":" in line:
-                full_label, color = map(str.strip, line.split(":", 1))
-                m = re.match(r"^(.+?)\s+\d+", full_label)
-                main_group = m.group(1).strip() if m else full_label
-                if re.fullmatch(r"#[0-9A-Fa-f]{6}", color):
-                    colors.append((main_group, full_label, color))
+    colors = list(parse_file(file_path))
     if not colors:
         logger.warning(f"No valid colors found in {file_path}")
     return colors
 
 
+def iter_color_file(file_path):
+    """
+    Lazily yields (main_group, full_label, color) tuples from a color file,
+    using the same rules as read_color_file. Memory use does not grow with file size.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        for group, label, rgb in iter_entries(f):
+            yield group, label, format_hex(rgb)
+
+
 def sanitize_id(text):
     """
     Replaces non-alphanumeric characters with underscores for safe SVG usage.
     """
-    import re
+    return _NON_WORD.sub("_", text).strip("_")
+
+
+def compressed_path(path: str, compression: str = None) -> str:
+    """
+    Returns the file name for path written with the given compression:
+    .svg becomes .svgz for gzip, other files get .gz, .bz2 or .xz appended.
+    """
+    if compression is None:
+        return path
+    if compression == "gzip" and path.endswith(".svg"):
+        return f"{path}z"
+    return f"{path}{_COMPRESSED_SUFFIXES[compression]}"
+
+
+def open_output(path: str, compression: str = None, level: int = None):
+    """
+    Opens path for writing UTF-8 text, compressing the stream as it is written
+    so large outputs are never stored uncompressed first.
+
+    Args:
+        path (str): Destination path (see compressed_path for the matching suffix).
+        compression (str, optional): One of COMPRESSIONS; None writes plain text.
+        level (int, optional): Compression level (gzip and bz2: 1-9, xz: 0-9).
+          Defaults to the compressor's own default.
+
+    Returns:
+        A writable text file object, to be used as a context manager.
+
+    Raises:
+        ValueError: If the compression is unknown.
+    """
+    if compression is None:
+        return open(path, "w", encoding="utf-8")
+    if compression == "gzip":
+        import gzip
+
+        # mtime=0 keeps the output reproducible, e.g. for CI artifacts and the cache.
+        raw = gzip.GzipFile(
+            path, "wb", compresslevel=9 if level is None else level, mtime=0
+        )
+    elif compression == "bz2":
+        import bz2
+
+        raw = bz2.BZ2File(path, "wb", compresslevel=9 if level is None else level)
+    elif compression == "xz":
+        import lzma
 
-    return re.sub(r"\W+", "_", text).strip("_")
+        raw = lzma.LZMAFile(path, "wb", preset=level)
+    else:
+        raise ValueError(f"Unknown compression: {compression}")
+    return io.TextIOWrapper(raw, encoding="utf-8")
@@ -0,0 +1,238 @@
+"""
+Watch mode for InkGrid.
+Polls the input files, directories and glob patterns and re-renders only the palettes
+that changed. Saves are debounced, and rendering runs on a background worker so a burst
+of edits to the same file results in a single render. Re-renders patch the previous SVG
+in place when the palette layout is unchanged, and keep the render cache up to date.
+"""
+
+import os
+import threading
+import time
+from app.batch import plan_outputs, render_file
+from app.incremental import IncrementalRenderer
+from app.profiling import PROFILER
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+
+
+class PaletteWatcher:
+    """
+    Polls palette files for changes and renders them on a background thread.
+    """
+
+    def __init__(
+        self,
+        inputs,
+        output_dir: str,
+        export_json: bool = True,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        logger=None,
+        cache=None,
+        incremental: bool = True,
+        compact_json: bool = False,
+        formats=(),
+        backend: str = "svgwrite",
+        compression: str = None,
+        compression_level: int = None,
+        png_scale: float = None,
+    ):
+        self.inputs = inputs
+        self.output_dir = output_dir
+        self.export_json = export_json
+        self.compact_json = compact_json
+        self.formats = formats
+        self.backend = backend
+        self.compression = compression
+        self.compression_level = compression_level
+        self.png_scale = png_scale
+        self.interval = interval
+        self.debounce = debounce
+        self.logger = logger
+        self.cache = cache
+        self.renders = 0
+        self.incremental = IncrementalRenderer() if incremental else None
+        self._signatures = {}
+        self._output_dirs = {}
+        self._pending = {}
+        self._busy = False
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._worker = None
+
+    def scan(self) -> list:
+        """
+        Compares modification time and size of every matched file with the last scan.
+        Files whose output names collide with an earlier file are not watched.
+
+        Returns:
+            list: Paths that are new or changed since the previous scan.
+        """
+        changed = []
+        signatures = {}
+        self._output_dirs, _ = plan_outputs(
+            self.inputs,
+            self.output_dir,
+            self.export_json,
+            self.formats,
+            self.compression,
+            self.png_scale,
+        )
+        for path in self._output_dirs:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+            if self._signatures.get(path) != signatures[path]:
+                changed.append(path)
+        self._signatures = signatures
+        return changed
+
+    def schedule(self, paths) -> None:
+        """
+        Queues paths for rendering once they have been quiet for the debounce delay.
+        A path that is already queued only has its deadline pushed back.
+        """
+        if not paths:
+            return
+        due = time.monotonic() + self.debounce
+        with self._condition:
+            for path in paths:
+                self._pending[path] = due
+            self._condition.notify_all()
+
+    def start(self) -> None:
+        """
+        Records the current state of all files and starts the render worker.
+        With incremental rendering, files whose SVG is already up to date are
+        parsed once here so that their first edit can be patched.
+        """
+        self.scan()
+        if self.incremental:
+            for path, output_dir in self._output_dirs.items():
+                self.incremental.prime(path, output_dir, self.export_json, self.formats)
+        self._stopped.clear()
+        self._worker = threading.Thread(
+            target=self._work, name="InkGridWatchWorker", daemon=True
+        )
+        self._worker.start()
+
+    def poll(self) -> None:
+        """
+        Runs one scan and schedules every changed file.
+        """
+        changed = self.scan()
+        if changed and self.logger:
+            self.logger.info(f"Changed: {', '.join(changed)}")
+        self.schedule(changed)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._worker:
+            self._worker.join()
+        PROFILER.log_summary(self.logger)
+
+    def run_forever(self) -> None:
+        """
+        Polls until interrupted with Ctrl+C.
+        """
+        self.start()
+        if self.logger:
+            self.logger.info(f"Watching {len(self._signatures)} palette files...")
+        try:
+            while not self._stopped.is_set():
+                time.sleep(self.interval)
+                self.poll()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """
+        Blocks until no render is pending. Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _next_due(self):
+        """
+        Returns a path whose debounce delay has expired, or the seconds to wait.
+        """
+        now = time.monotonic()
+        path, due = min(self._pending.items(), key=lambda item: item[1])
+        if due <= now:
+            del self._pending[path]
+            return path, 0
+        return None, due - now
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                path = None
+                while path is None:
+                    if self._stopped.is_set():
+                        return
+                    if not self._pending:
+                        self._condition.wait()
+                        continue
+                    path, wait = self._next_due()
+                    if path is None:
+                        self._condition.wait(wait)
+                self._busy = True
+            try:
+                self._render(path)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _render(self, path: str) -> None:
+        output_dir = self._output_dirs.get(path, self.output_dir)
+        try:
+            if self.incremental:
+                result = self.incremental.render_file(
+                    path,
+                    output_dir,
+                    self.export_json,
+                    self.compact_json,
+                    self.formats,
+                    self.cache,
+                    self.backend,
+                )
+            else:
+                result = render_file(
+                    path,
+                    output_dir,
+                    self.export_json,
+                    cache=self.cache,
+                    compact_json=self.compact_json,
+                    formats=self.formats,
+                    backend=self.backend,
+                    compression=self.compression,
+                    compression_level=self.compression_level,
+                    png_scale=self.png_scale,
+                )
+        except Exception as error:
+            if self.logger:
+                self.logger.error(f"Failed {path}: {error}")
+            return
+        self.renders += 1
+        if self.logger:
+            if result.error:
+                self.logger.error(f"Failed {path}: {result.error}")
+            else:
+                self.logger.info(
+                    f"Re-rendered {path} in {result.seconds * 1000:.1f} ms"
+                )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for InkGrid.
+Runs `python -X importtime` on app.main, lists the slowest imports, and fails if a
+heavy GUI or rendering dependency is loaded at start-up. With --executable it also
+times the cold start of a PyInstaller build (e.g. dist/Application --help).
+
+Usage: PYTHONPATH=src python src/benchmarks/bench_importtime.py [--executable PATH]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that must only be imported once the GUI or the svgwrite backend is used.
+DEFERRED_MODULES = ("tkinter", "PIL", "svgwrite")
+REPEATS = 5
+TOP = 15
+
+
+def importtime_report(module: str = "app.main", python: str = sys.executable) -> list:
+    """
+    Imports module in a fresh interpreter with -X importtime.
+
+    Returns:
+        list: (module name, self microseconds, cumulative microseconds) per import.
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def time_executable(command: list, repeats: int = REPEATS) -> float:
+    """
+    Returns the best wall time of running command to completion.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="InkGrid start-up benchmark")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--executable", help="Frozen build to time with --help")
+    args = parser.parse_args(argv)
+
+    rows = importtime_report(args.module)
+    total = next((c for name, _, c in rows if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+    for name, _, cumulative in sorted(rows, key=lambda r: r[2], reverse=True)[:TOP]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = sorted({name.split(".")[0] for name, _, _ in rows} & set(DEFERRED_MODULES))
+    status = 0
+    if loaded:
+        print(f"Deferred modules imported at start-up: {', '.join(loaded)}")
+        status = 1
+
+    if args.executable:
+        seconds = time_executable([args.executable, "--help"])
+        print(f"{args.executable} --help: {seconds * 1000:.1f} ms (best of {REPEATS})")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the palette parser.
+Compares lines/second and retained memory of app.palette_parser against the two
+parsers it replaced (the former generate.parse_colors_from_file and utils.read_color_file).
+
+Usage: PYTHONPATH=src python src/benchmarks/bench_parser.py [number_of_lines]
+"""
+
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.palette_parser import parse_file, map_file  # noqa: E402
+
+REPEATS = 3
+
+
+def legacy_parse_colors_from_file(file_path):
+    groups = OrderedDict()
+    current_group = None
+    with open(file_path, "r") as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                if not stripped:
+                    current_group = None
+                continue
+            parts = stripped.split(":")
+            if len(parts) < 2:
+                continue
+            left = parts[0].strip()
+            hex_color = parts[1].strip().split()[0]
+            m = re.match(r"^(.+?)\s+\d+", left)
+            group_name = m.group(1).strip() if m else left
+            if current_group is None:
+                current_group = group_name
+            if current_group != group_name:
+                current_group = group_name
+            if current_group not in groups:
+                groups[current_group] = []
+            groups[current_group].append(hex_color)
+    return groups
+
+
+def legacy_read_color_file(file_path):
+    colors = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if ":" in line:
+                full_label, color = map(str.strip, line.split(":", 1))
+                m = re.match(r"^(.+?)\s+\d+", full_label)
+                main_group = m.group(1).strip() if m else full_label
+                if re.fullmatch(r"#[0-9A-Fa-f]{6}", color):
+                    colors.append((main_group, full_label, color))
+    return colors
+
+
+def write_palette(path, lines):
+    """
+    Writes a synthetic palette with groups of 20 colors separated by blank lines.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Synthetic palette\n")
+        for i in range(lines):
+            if i and i % 20 == 0:
+                f.write("\n")
+            f.write(f"Group{i // 20} {i % 20 + 1} (Tone): #{i & 0xFFFFFF:06X}\n")
+
+
+def measure(func, path):
+    """
+    Returns the best wall time and the bytes still allocated by the parse result.
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = func(path)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    if hasattr(result, "close"):
+        result.close()
+    return best, retained
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "palette.txt")
+        write_palette(path, lines)
+        candidates = [
+            ("legacy parse_colors_from_file", legacy_parse_colors_from_file),
+            ("legacy read_color_file", legacy_read_color_file),
+            ("palette_parser.parse_file", parse_file),
+            ("palette_parser.map_file", map_file),
+        ]
+        print(f"{lines} lines, best of {REPEATS}")
+        for name, func in candidates:
+            seconds, retained = measure(func, path)
+            print(
+                f"{name:32s} {seconds * 1000:9.1f} ms {lines / seconds:12,.0f} lines/s"
+                f" {retained / lines:8.1f} bytes/color"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the InkGrid pipeline.
+Generates synthetic palettes, times the parse, layout, render and export stages
+separately, records their peak memory, and compares the results with a stored baseline.
+Every run also times a fixed reference workload; stage timings are compared relative to
+it, so a baseline recorded on one machine stays meaningful on a faster or slower one.
+Peak memory does not depend on the machine and is compared as recorded. Re-baseline with
+--update-baseline when the Python version changes or a slowdown is intended.
+
+Usage: PYTHONPATH=src python -m benchmarks.suite [--full] [--output FILE] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import svgwrite  # noqa: E402
+from app.generate import (  # noqa: E402
+    parse_colors_from_file,
+    calculate_content_dimensions,
+    create_swatch_groups,
+)
+from app.layout import layout_for  # noqa: E402
+from app.palette import Palette  # noqa: E402
+from app.svg_writer import save_svg  # noqa: E402
+from app.export import export_json_for_figma  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+# Absolute differences below these are treated as noise on tiny palettes.
+NOISE_FLOOR = {"seconds": 0.002, "peak_bytes": 64 * 1024}
+REPEATS = 3
+# Size of the reference workload that stage timings are scaled by.
+REFERENCE_ITERATIONS = 100_000
+
+# svgwrite's tiny profile rejects coordinates above this value, so the svgwrite
+# render stage is skipped for palettes whose document is taller.
+SVGWRITE_MAX_COORDINATE = 32767
+
+# name: (colors, groups, label suffix length)
+QUICK_SCENARIOS = {
+    "10-few-groups": (10, 2, 0),
+    "1k-few-groups": (1_000, 5, 0),
+    "1k-many-groups": (1_000, 500, 0),
+    "1k-long-labels": (1_000, 5, 200),
+    "10k-few-groups": (10_000, 10, 0),
+    "10k-many-groups": (10_000, 5_000, 0),
+}
+FULL_SCENARIOS = dict(
+    QUICK_SCENARIOS,
+    **{
+        "100k-few-groups": (100_000, 20, 0),
+        "100k-many-groups": (100_000, 50_000, 0),
+        "1m-few-groups": (1_000_000, 50, 0),
+        "1m-long-labels": (1_000_000, 50, 200),
+    },
+)
+
+
+def write_synthetic_palette(
+    path: str, colors: int, groups: int = 1, label_length: int = 0
+) -> None:
+    """
+    Writes a palette of colors spread evenly over groups, one blank line between groups.
+
+    Args:
+        path (str): Destination path.
+        colors (int): Number of colors.
+        groups (int): Number of groups.
+        label_length (int): Length of a descriptor appended to every label.
+    """
+    per_group = -(-colors // groups)
+    descriptor = f" ({'x' * label_length})" if label_length else ""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Synthetic palette\n")
+        for i in range(colors):
+            group, index = divmod(i, per_group)
+            if i and index == 0:
+                f.write("\n")
+            f.write(f"Group{group} {index + 1}{descriptor}: #{i & 0xFFFFFF:06X}\n")
+
+
+def measure(func) -> dict:
+    """
+    Times func (best of REPEATS) and records its peak traced memory in a separate run.
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def reference_workload() -> str:
+    """
+    Formats and joins markup-like strings: a fixed pure-Python load with the same
+    character as the parse and render stages, used to calibrate timings per machine.
+    """
+    return "".join(
+        f'<rect x="{i % 640}" y="{i}" fill="#{i & 0xFFFFFF:06X}"/>'
+        for i in range(REFERENCE_ITERATIONS)
+    )
+
+
+def run_scenario(colors: int, groups: int, label_length: int, workdir: str) -> dict:
+    """
+    Runs every stage on one synthetic palette.
+
+    Returns:
+        dict: Stage name to {"seconds", "peak_bytes"}.
+    """
+    palette_path = os.path.join(workdir, "palette.txt")
+    svg_path = os.path.join(workdir, "palette.svg")
+    write_synthetic_palette(palette_path, colors, groups, label_length)
+
+    palette = Palette.from_file(palette_path)
+    layout = layout_for(palette)
+    stages = {
+        "parse_colors_from_file": lambda: parse_colors_from_file(palette_path),
+        "parse_palette": lambda: Palette.from_file(palette_path),
+        "calculate_content_dimensions": lambda: calculate_content_dimensions(palette),
+        "render_string": lambda: save_svg(
+            palette,
+            svg_path,
+            layout.svg_width,
+            layout.bg_height,
+            layout.gap_between,
+            layout,
+        ),
+        "export_json_for_figma": lambda: export_json_for_figma(
+            palette, palette_path, workdir
+        ),
+    }
+    if layout.svg_height <= SVGWRITE_MAX_COORDINATE:
+        stages["create_swatch_groups"] = lambda: create_swatch_groups(
+            svgwrite.Drawing(svg_path, profile="tiny"),
+            palette,
+            layout.bg_height,
+            layout,
+        )
+    return {name: measure(func) for name, func in stages.items()}
+
+
+def run_suite(scenarios: dict, log=print) -> dict:
+    """
+    Runs all scenarios and returns the machine-readable results document.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, (colors, groups, label_length) in scenarios.items():
+            log(f"Running {name}...")
+            results[name] = run_scenario(colors, groups, label_length, workdir)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": REPEATS,
+        "reference_seconds": min(
+            measure(reference_workload)["seconds"] for _ in range(REPEATS)
+        ),
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares stage timings and peak memory against a baseline document.
+    When both documents carry reference_seconds, baseline timings are scaled by the
+    ratio of the two reference timings before comparing.
+
+    Args:
+        current (dict): Results from run_suite.
+        baseline (dict): Previously stored results.
+        tolerance (float): Allowed relative slowdown or memory growth.
+
+    Returns:
+        list: (scenario, stage, metric, expected value, current value) for every regression;
+          expected timings are the scaled baseline timings.
+    """
+    scale = 1.0
+    if current.get("reference_seconds") and baseline.get("reference_seconds"):
+        scale = current["reference_seconds"] / baseline["reference_seconds"]
+    regressions = []
+    for scenario, stages in current["results"].items():
+        for stage, metrics in stages.items():
+            reference = baseline.get("results", {}).get(scenario, {}).get(stage)
+            if reference is None:
+                continue
+            for metric, floor in NOISE_FLOOR.items():
+                expected = reference[metric]
+                if metric == "seconds":
+                    expected *= scale
+                if metrics[metric] > expected * (1 + tolerance) + floor:
+                    regressions.append(
+                        (scenario, stage, metric, expected, metrics[metric])
+                    )
+    return regressions
+
+
+def print_results(document: dict) -> None:
+    print(f"reference workload {document['reference_seconds'] * 1000:10.2f} ms")
+    for scenario, stages in document["results"].items():
+        print(scenario)
+        for stage, metrics in stages.items():
+            print(
+                f"  {stage:30s} {metrics['seconds'] * 1000:10.2f} ms"
+                f" {metrics['peak_bytes'] / 1024 / 1024:10.2f} MiB peak"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="InkGrid benchmark suite")
+    parser.add_argument(
+        "--full", action="store_true", help="Include 100k and 1M color palettes"
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed relative regression (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    document = run_suite(FULL_SCENARIOS if args.full else QUICK_SCENARIOS)
+    print_results(document)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_results(document, baseline, args.tolerance)
+    for scenario, stage, metric, before, after in regressions:
+        print(f"REGRESSION {scenario} {stage} {metric}: {before:.6g} -> {after:.6g}")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Tests for the baked background asset pipeline in app.assets.
+"""
+
+from PIL import Image
+from app.assets import (
+    BACKGROUND_SIZE,
+    bake_background,
+    load_baked_background,
+    process_background,
+)
+
+
+def _write_source(path, color):
+    Image.new("RGB", (100, 80), color).save(path)
+
+
+def test_baked_background_matches_live_pipeline(tmp_path):
+    """
+    The baked PNG loads as the same pixels the live pipeline produces.
+    """
+    source = tmp_path / "background.jpeg"
+    _write_source(source, (0, 128, 255))
+    baked = bake_background(str(source), str(tmp_path / "baked.png"))
+    img = load_baked_background(baked, str(source))
+    assert img is not None
+    assert img.size == BACKGROUND_SIZE
+    assert img.convert("RGBA").tobytes() == process_background(str(source)).tobytes()
+
+
+def test_stale_or_missing_asset_is_rejected(tmp_path):
+    """
+    A changed source or a missing asset makes the loader fall back (returns None).
+    """
+    source = tmp_path / "background.jpeg"
+    _write_source(source, (0, 128, 255))
+    baked = bake_background(str(source), str(tmp_path / "baked.png"))
+    _write_source(source, (255, 0, 0))
+    assert load_baked_background(baked, str(source)) is None
+    assert load_baked_background(baked) is not None
+    assert load_baked_background(str(tmp_path / "missing.png"), str(source)) is None
@@ -0,0 +1,196 @@
+"""
+Tests for the headless batch renderer in app.batch.
+"""
+
+import os
+import json
+from app.batch import collect_palette_files, render_file, run_batch
+
+
+def _write_palette(path, content="Primary 1: #FF5733\nPrimary 2: #33FF57\n"):
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_collect_palette_files_expands_dirs_and_globs(tmp_path):
+    """
+    Directories are searched recursively, globs are expanded and duplicates dropped.
+    """
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    a = _write_palette(tmp_path / "a.txt")
+    b = _write_palette(nested / "b.txt")
+    (tmp_path / "notes.md").write_text("ignored")
+    found = collect_palette_files([str(tmp_path), str(tmp_path / "*.txt"), str(a)])
+    assert found == [str(a), str(b)]
+
+
+def test_run_batch_keeps_subdirectories_and_reports_collisions(tmp_path):
+    """
+    Equally named palettes in different subdirectories are written to matching
+    subdirectories; files given directly that would share outputs fail instead.
+    """
+    inputs = tmp_path / "in"
+    (inputs / "a").mkdir(parents=True)
+    (inputs / "b").mkdir()
+    first = _write_palette(inputs / "a" / "brand.txt")
+    second = _write_palette(inputs / "b" / "brand.txt", "Accent 1: #3357FF\n")
+    out_dir = tmp_path / "out"
+    results = run_batch([str(inputs)], str(out_dir), workers=1)
+    assert all(r.error is None for r in results)
+    assert (out_dir / "a" / "brand.svg").exists()
+    assert "Accent 1" in (out_dir / "b" / "brand_figma_tokens.json").read_text()
+
+    results = run_batch([str(first), str(second)], str(tmp_path / "flat"), workers=1)
+    by_path = {r.path: r for r in results}
+    assert by_path[str(first)].error is None
+    assert str(first) in by_path[str(second)].error
+
+
+def test_render_file_writes_svg_and_json(tmp_path):
+    """
+    render_file writes the SVG and JSON outputs and reports its wall time.
+    """
+    palette = _write_palette(tmp_path / "brand.txt")
+    result = render_file(str(palette), str(tmp_path))
+    assert result.error is None
+    assert os.path.basename(result.svg_path) == "brand.svg"
+    assert os.path.exists(result.svg_path)
+    with open(result.json_path, encoding="utf-8") as f:
+        assert json.load(f)["Primary"]["Primary 2"] == "#33FF57"
+    assert result.seconds >= 0
+
+
+def test_render_file_without_colors_reports_error(tmp_path):
+    """
+    Files without valid colors are reported as failed instead of raising.
+    """
+    palette = _write_palette(tmp_path / "empty.txt", "# only a comment\n")
+    result = render_file(str(palette), str(tmp_path))
+    assert result.error
+    assert result.svg_path is None
+
+
+def test_run_batch_process_pool(tmp_path):
+    """
+    run_batch renders every matched file through the process pool.
+    """
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for name in ("one", "two", "three"):
+        _write_palette(inputs / f"{name}.txt")
+    out_dir = tmp_path / "out"
+    results = run_batch([str(inputs)], str(out_dir), workers=2, export_json=False)
+    assert len(results) == 3
+    assert all(r.error is None and r.json_path is None for r in results)
+    assert sorted(os.listdir(out_dir)) == ["one.svg", "three.svg", "two.svg"]
+
+
+def test_render_file_compressed_output(tmp_path):
+    """
+    With compression, the SVG is written as .svgz and the JSON as .json.gz.
+    """
+    import gzip
+
+    palette = _write_palette(tmp_path / "brand.txt")
+    (tmp_path / "plain").mkdir()
+    plain = render_file(str(palette), str(tmp_path / "plain"))
+    result = render_file(
+        str(palette), str(tmp_path), compression="gzip", backend="string"
+    )
+    assert result.svg_path.endswith("brand.svgz")
+    assert result.json_path.endswith("brand_figma_tokens.json.gz")
+    with gzip.open(result.svg_path, "rb") as f, open(plain.svg_path, "rb") as g:
+        assert f.read() == g.read()
+    with gzip.open(result.json_path, "rt", encoding="utf-8") as f:
+        assert json.load(f)["Primary"]["Primary 2"] == "#33FF57"
+
+
+def test_run_batch_png_previews(tmp_path):
+    """
+    PNG previews are rendered in the worker processes next to the SVGs.
+    """
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for name in ("one", "two"):
+        _write_palette(inputs / f"{name}.txt")
+    out_dir = tmp_path / "out"
+    results = run_batch(
+        [str(inputs)], str(out_dir), workers=2, export_json=False, png_scale=0.5
+    )
+    assert all(r.error is None for r in results)
+    assert sorted(os.listdir(out_dir)) == ["one.png", "one.svg", "two.png", "two.svg"]
+
+
+def test_run_batch_renders_identical_files_once(tmp_path):
+    """
+    Files with the same content are rendered once and copied to the other names.
+    """
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    for name in ("a", "b", "c"):
+        _write_palette(inputs / f"{name}.txt")
+    _write_palette(inputs / "other.txt", "Accent 1: #3357FF\n")
+    out_dir = tmp_path / "out"
+    results = run_batch([str(inputs)], str(out_dir), workers=1, formats=("css",))
+    by_name = {os.path.basename(r.path): r for r in results}
+    assert len(results) == 4
+    assert all(r.error is None for r in results)
+    assert by_name["a.txt"].duplicate_of is None
+    assert by_name["other.txt"].duplicate_of is None
+    for name in ("b", "c"):
+        assert by_name[f"{name}.txt"].duplicate_of == str(inputs / "a.txt")
+        for suffix in (".svg", "_figma_tokens.json", ".css"):
+            copy = (out_dir / f"{name}{suffix}").read_bytes()
+            assert copy == (out_dir / f"a{suffix}").read_bytes()
+
+
+def test_run_batch_reports_swatch_fragment_hits(tmp_path):
+    """
+    String backend renders report the swatch fragment cache lookups they made: one
+    per swatch for both layers, a hit if an earlier file had the same swatch.
+    """
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    _write_palette(inputs / "one.txt", "Fragment 1: #123456\n")
+    _write_palette(inputs / "two.txt", "Fragment 1: #123456\nFragment 2: #654321\n")
+    results = run_batch(
+        [str(inputs)], str(tmp_path / "out"), workers=1, backend="string"
+    )
+    hits = sum(r.fragments[0] for r in results)
+    misses = sum(r.fragments[1] for r in results)
+    assert (hits, misses) == (1, 2)
+
+
+def test_render_file_streams_large_palettes(tmp_path, monkeypatch):
+    """
+    Above STREAM_THRESHOLD the string backend streams the SVG and Figma JSON from
+    disk, writing the same bytes as the in-memory path.
+    """
+    from app import batch
+
+    palette = _write_palette(
+        tmp_path / "brand.txt",
+        "Primary 1: #FF5733\nPrimary 2: #33FF57\n\nAccent 1: #3357FF\n",
+    )
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "stream").mkdir()
+    expected = render_file(str(palette), str(tmp_path / "memory"), backend="string")
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("palette parsed into memory")
+
+    monkeypatch.setattr(batch, "STREAM_THRESHOLD", 0)
+    monkeypatch.setattr(batch.Palette, "from_file", no_parse)
+    streamed = render_file(
+        str(palette), str(tmp_path / "stream"), backend="string", compact_json=True
+    )
+    assert streamed.error is None
+    with open(streamed.svg_path, "rb") as a, open(expected.svg_path, "rb") as b:
+        assert a.read() == b.read()
+    with open(streamed.json_path) as a, open(expected.json_path) as b:
+        assert json.load(a) == json.load(b)
+
+    empty = _write_palette(tmp_path / "empty.txt", "# no colors\n")
+    result = render_file(str(empty), str(tmp_path / "stream"), backend="string")
+    assert result.error == "No valid colors found."
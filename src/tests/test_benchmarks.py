@@ -0,0 +1,54 @@
+"""
+Tests for the helpers of the benchmark suite in benchmarks.suite.
+"""
+
+from app.palette import Palette
+from benchmarks.suite import compare_results, write_synthetic_palette
+
+
+def test_synthetic_palette_has_requested_shape(tmp_path):
+    """
+    The generator spreads the requested number of colors over the requested groups.
+    """
+    path = tmp_path / "palette.txt"
+    write_synthetic_palette(str(path), 100, groups=7, label_length=50)
+    palette = Palette.from_file(str(path))
+    assert len(palette) == 100
+    assert len(palette.groups) == 7
+    assert len(palette.label(0)) > 50
+
+
+def test_compare_results_flags_only_real_regressions():
+    """
+    Slowdowns beyond tolerance and noise floor are reported; small jitter is not.
+    """
+    baseline = {"results": {"big": {"render": {"seconds": 1.0, "peak_bytes": 10**7}}}}
+    jitter = {"results": {"big": {"render": {"seconds": 1.1, "peak_bytes": 10**7}}}}
+    slower = {"results": {"big": {"render": {"seconds": 2.0, "peak_bytes": 10**7}}}}
+    assert compare_results(jitter, baseline, 0.25) == []
+    assert compare_results(slower, baseline, 0.25) == [
+        ("big", "render", "seconds", 1.0, 2.0)
+    ]
+
+
+def test_compare_results_scales_timings_by_reference_workload():
+    """
+    A baseline recorded on a faster machine does not report regressions on a slower
+    one when the reference workload slowed down by the same factor.
+    """
+    baseline = {
+        "reference_seconds": 0.1,
+        "results": {"big": {"render": {"seconds": 1.0, "peak_bytes": 10**7}}},
+    }
+    slower_machine = {
+        "reference_seconds": 0.2,
+        "results": {"big": {"render": {"seconds": 2.1, "peak_bytes": 10**7}}},
+    }
+    slower_code = {
+        "reference_seconds": 0.1,
+        "results": {"big": {"render": {"seconds": 2.1, "peak_bytes": 10**7}}},
+    }
+    assert compare_results(slower_machine, baseline, 0.25) == []
+    assert compare_results(slower_code, baseline, 0.25) == [
+        ("big", "render", "seconds", 1.0, 2.1)
+    ]
@@ -0,0 +1,73 @@
+"""
+Tests for the content-addressed render cache in app.cache.
+"""
+
+import os
+import time
+from app.cache import RenderCache
+from app.batch import render_file
+
+
+def _palette(path, content="Primary 1: #FF5733\n"):
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_key_depends_on_content_and_options(tmp_path):
+    """
+    Keys change with palette content and render options, not with the file name.
+    """
+    cache = RenderCache(str(tmp_path / "cache"))
+    a = _palette(tmp_path / "a.txt")
+    b = _palette(tmp_path / "b.txt")
+    c = _palette(tmp_path / "c.txt", "Primary 1: #000000\n")
+    assert cache.key_for(a) == cache.key_for(b)
+    assert cache.key_for(a) != cache.key_for(c)
+    assert cache.key_for(a) != cache.key_for(a, options=("compact",))
+
+
+def test_render_file_reuses_cached_output(tmp_path):
+    """
+    The second render of an unchanged palette is served from the cache.
+    """
+    cache = RenderCache(str(tmp_path / "cache"))
+    source = _palette(tmp_path / "colors.txt")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+
+    first = render_file(source, str(out_dir), cache=cache)
+    second = render_file(
+        source, str(out_dir), svg_path=str(out_dir / "copy.svg"), cache=cache
+    )
+    assert not first.cached and second.cached
+    assert (out_dir / "copy.svg").read_bytes() == (out_dir / "colors.svg").read_bytes()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fetch_requires_all_artifacts(tmp_path):
+    """
+    An entry without the requested JSON artifact counts as a miss.
+    """
+    cache = RenderCache(str(tmp_path / "cache"))
+    source = _palette(tmp_path / "colors.txt")
+    render_file(source, str(tmp_path), export_json=False, cache=cache)
+    result = render_file(source, str(tmp_path), export_json=True, cache=cache)
+    assert not result.cached
+    assert os.path.exists(result.json_path)
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    """
+    Eviction drops the oldest entries until the cache fits its size limit.
+    """
+    cache = RenderCache(str(tmp_path / "cache"), max_bytes=150)
+    artifact = tmp_path / "artifact.svg"
+    artifact.write_bytes(b"x" * 100)
+    cache.store("old", {"svg": str(artifact)})
+    old_entry = os.path.join(cache.directory, "old.svg")
+    past = time.time() - 60
+    os.utime(old_entry, (past, past))
+    cache.store("new", {"svg": str(artifact)})
+    assert cache.evict() == 1
+    assert not os.path.exists(old_entry)
+    assert cache.fetch("new", {"svg": str(tmp_path / "restored.svg")})
@@ -28,3 +28,92 @@ def test_export_json_for_figma_creates_valid_json():
         assert data["Primary"]["Primary 1"] == "#FF0000"
         assert data["Primary"]["Primary 2"] == "#00FF00"
         assert data["Secondary"]["Secondary 1"] == "#0000FF"
+
+
+def test_export_json_for_figma_accepts_palette(tmp_path):
+    from app.palette import Palette
+
+    colors = [
+        ("Primary", "Primary 1", "#FF0000"),
+        ("Secondary", "Secondary 1", "#0000FF"),
+    ]
+    json_path = export_json_for_figma(
+        Palette.from_colors(colors), str(tmp_path / "colors.txt"), str(tmp_path)
+    )
+    with open(json_path, "r", encoding="utf-8") as f:
+        assert json.load(f) == {
+            "Primary": {"Primary 1": "#FF0000"},
+            "Secondary": {"Secondary 1": "#0000FF"},
+        }
+
+
+def test_pretty_output_matches_json_dump(tmp_path):
+    """
+    The default mode writes exactly what json.dump(..., indent=2) produced before.
+    """
+    from app.palette import Palette
+
+    colors = [
+        ("Primary", "Primary 1", "#FF0000"),
+        ("Primary", "Primary 2 (Ünïcode)", "#00FF00"),
+        ("Secondary", "Secondary 1", "#0000FF"),
+    ]
+    json_path = export_json_for_figma(
+        Palette.from_colors(colors), str(tmp_path / "colors.txt"), str(tmp_path)
+    )
+    expected = {
+        "Primary": {"Primary 1": "#FF0000", "Primary 2 (Ünïcode)": "#00FF00"},
+        "Secondary": {"Secondary 1": "#0000FF"},
+    }
+    with open(json_path, "r", encoding="utf-8") as f:
+        assert f.read() == json.dumps(expected, indent=2)
+
+
+def test_stream_json_for_figma(tmp_path):
+    """
+    Streaming export matches the in-memory export, in both modes, and merges split groups.
+    """
+    from app.export import stream_json_for_figma
+    from app.utils import read_color_file
+
+    palette = tmp_path / "colors.txt"
+    palette.write_text(
+        "Primary 1: #FF0000\nPrimary 2: #00FF00\n\nAccent 1: #0000FF\n",
+        encoding="utf-8",
+    )
+    for compact in (False, True):
+        streamed = stream_json_for_figma(str(palette), str(tmp_path), compact)
+        with open(streamed, encoding="utf-8") as f:
+            streamed_text = f.read()
+        in_memory = export_json_for_figma(
+            read_color_file(str(palette)), str(palette), str(tmp_path), compact
+        )
+        with open(in_memory, encoding="utf-8") as f:
+            assert streamed_text == f.read()
+    assert streamed_text == json.dumps(json.loads(streamed_text), separators=(",", ":"))
+
+    palette.write_text(
+        "Primary 1: #FF0000\nAccent 1: #0000FF\nPrimary 2: #00FF00\n", encoding="utf-8"
+    )
+    with open(stream_json_for_figma(str(palette), str(tmp_path))) as f:
+        assert json.load(f) == {
+            "Primary": {"Primary 1": "#FF0000", "Primary 2": "#00FF00"},
+            "Accent": {"Accent 1": "#0000FF"},
+        }
+
+
+def test_stream_json_fallback_is_timed_once(tmp_path):
+    """
+    A split group falls back to the in-memory export without recording a second
+    export_json sample.
+    """
+    from app.export import stream_json_for_figma
+    from app.profiling import PROFILER
+
+    palette = tmp_path / "colors.txt"
+    palette.write_text(
+        "Primary 1: #FF0000\nAccent 1: #0000FF\nPrimary 2: #00FF00\n", encoding="utf-8"
+    )
+    PROFILER.drain()
+    stream_json_for_figma(str(palette), str(tmp_path))
+    assert len(PROFILER.drain()["export_json"]) == 1
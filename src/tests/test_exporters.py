@@ -0,0 +1,142 @@
+"""
+Tests for the multi-format token exporters.
+"""
+
+import json
+import pytest
+from app.batch import render_file
+from app.cache import RenderCache
+from app.export import export_json_for_figma
+from app.exporters import FORMATS, export_formats, exporter_path, slugify
+from app.palette import Palette
+
+COLORS = [
+    ("Primary", "Primary 1", "#FF0000"),
+    ("Primary", "Primary 2 (Light)", "#00FF00"),
+    ("Dark Gray", "Dark Gray", "#333333"),
+]
+
+
+def test_export_formats_writes_every_format(tmp_path):
+    """
+    All registered formats are written from one palette, in the requested order.
+    """
+    palette = Palette.from_colors(COLORS)
+    paths = export_formats(palette, "brand.txt", str(tmp_path), FORMATS)
+    assert list(paths) == list(FORMATS)
+    for name, path in paths.items():
+        assert path == exporter_path(name, "brand.txt", str(tmp_path))
+        assert (tmp_path / path).exists()
+
+    css = (tmp_path / "brand.css").read_text()
+    assert "--primary-2-light: #00FF00;" in css
+    assert css.startswith(":root {\n")
+    assert "$dark-gray: #333333;" in (tmp_path / "brand.scss").read_text()
+
+    tokens = json.loads((tmp_path / "brand.tokens.json").read_text())
+    assert tokens["color"]["primary"]["2-light"] == {
+        "value": "#00FF00",
+        "type": "color",
+    }
+    assert tokens["color"]["dark-gray"]["DEFAULT"]["value"] == "#333333"
+
+    tailwind = (tmp_path / "brand.tailwind.js").read_text()
+    assert tailwind.startswith("module.exports = {")
+    assert '"1": "#FF0000"' in tailwind
+
+
+def test_figma_format_matches_export_json_for_figma(tmp_path):
+    """
+    The registry's figma format writes the same bytes as export_json_for_figma.
+    """
+    palette = Palette.from_colors(COLORS)
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    expected = export_json_for_figma(palette, "brand.txt", str(tmp_path / "a"))
+    actual = export_formats(palette, "brand.txt", str(tmp_path / "b"), ["figma"])
+    with open(expected, "rb") as f1, open(actual["figma"], "rb") as f2:
+        assert f1.read() == f2.read()
+
+
+def test_export_formats_rejects_unknown_format(tmp_path):
+    palette = Palette.from_colors(COLORS)
+    with pytest.raises(ValueError):
+        export_formats(palette, "brand.txt", str(tmp_path), ["xml"])
+
+
+def test_slugify():
+    assert slugify("Primary 2 (Light)") == "primary-2-light"
+    assert slugify("  Brand/Accent  ") == "brand-accent"
+
+
+def test_css_and_scss_variable_names_are_unique_and_valid(tmp_path):
+    """
+    Labels that slugify alike get numbered suffixes, and names that would start with
+    a digit are prefixed, so no variable is declared twice or invalid in SCSS.
+    """
+    palette = Palette.from_colors(
+        [
+            ("Primary", "Primary 1", "#FF0000"),
+            ("Primary", "primary-1", "#00FF00"),
+            ("Primary", "Primary 1 2", "#0000FF"),
+            ("Shades", "100", "#EEEEEE"),
+        ]
+    )
+    export_formats(palette, "brand.txt", str(tmp_path), ["css", "scss"])
+    scss = (tmp_path / "brand.scss").read_text().splitlines()
+    assert scss == [
+        "$primary-1: #FF0000;",
+        "$primary-1-2: #00FF00;",
+        "$primary-1-2-2: #0000FF;",
+        "$color-100: #EEEEEE;",
+    ]
+    assert "  --color-100: #EEEEEE;" in (tmp_path / "brand.css").read_text()
+
+
+def test_nested_token_keys_are_unique(tmp_path):
+    """
+    Shade and group keys that slugify alike get numbered suffixes instead of
+    overwriting each other, and groups that slugify to nothing become "color".
+    """
+    palette = Palette.from_colors(
+        [
+            ("Primary", "Primary 1 (Light)", "#111111"),
+            ("Primary", "Primary 1 Light", "#222222"),
+            ("Ωμέγα", "Ωμέγα", "#333333"),
+            ("Ψ", "Ψ", "#444444"),
+        ]
+    )
+    export_formats(
+        palette, "brand.txt", str(tmp_path), ["tailwind", "style-dictionary"]
+    )
+    tailwind = (tmp_path / "brand.tailwind.js").read_text()
+    assert '"1-light": "#111111"' in tailwind and '"1-light-2": "#222222"' in tailwind
+    tokens = json.loads((tmp_path / "brand.tokens.json").read_text())["color"]
+    assert {
+        group: {shade: token["value"] for shade, token in shades.items()}
+        for group, shades in tokens.items()
+    } == {
+        "primary": {"1-light": "#111111", "1-light-2": "#222222"},
+        "color": {"DEFAULT": "#333333"},
+        "color-2": {"DEFAULT": "#444444"},
+    }
+
+
+def test_render_file_caches_extra_formats(tmp_path):
+    """
+    Extra formats are rendered with the SVG and restored from the cache.
+    """
+    palette_file = tmp_path / "brand.txt"
+    palette_file.write_text("Primary 1: #FF0000\nSecondary 1: #0000FF\n")
+    cache = RenderCache(str(tmp_path / "cache"))
+    out = tmp_path / "out"
+    out.mkdir()
+
+    first = render_file(str(palette_file), str(out), cache=cache, formats=("css",))
+    assert not first.cached
+    css = (out / "brand.css").read_text()
+    (out / "brand.css").unlink()
+
+    second = render_file(str(palette_file), str(out), cache=cache, formats=("css",))
+    assert second.cached
+    assert (out / "brand.css").read_text() == css
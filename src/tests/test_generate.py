@@ -70,3 +70,23 @@ def test_calculate_content_dimensions():
     expected_width = 4 * SWATCH_WIDTH + (4 - 1) * HORIZONTAL_PADDING
     assert content_width == expected_width
     assert content_height > 0
+
+
+@pytest.mark.parametrize("backend", ["svgwrite", "string"])
+def test_generate_svg_keeps_non_hex_colors(tmp_path, backend):
+    """
+    Colors that are not uppercase '#RRGGBB' codes are rendered as given, as before
+    palettes were packed.
+    """
+    colors = [
+        ("Brand", "Brand 1", "#abc"),
+        ("Brand", "Brand 2", "rgb(10, 20, 30)"),
+        ("Named", "Named 1", "teal"),
+        ("Brand", "Brand 3", "#abcdef"),
+    ]
+    output_file = tmp_path / "colors.svg"
+    generate_svg_from_groups(colors, "colors.txt", str(output_file), backend=backend)
+    svg = output_file.read_text(encoding="utf-8")
+    for _, _, color in colors:
+        assert f'fill="{color}"' in svg
+    assert svg.index("Brand_3") < svg.index("Named_1")
@@ -7,6 +7,7 @@ import sys
 import tkinter as tk
 from tkinter.ttk import LabelFrame, Style
 import pytest
+from app.cache import RenderCache
 from app.gui import (
     _resolve_image_path,
     _get_default_directory,
@@ -19,6 +20,7 @@ from app.gui import (
     _select_folder,
     _apply_theme,
     _get_bg_color,
+    GenerationJob,
 )
 
 
@@ -191,3 +193,52 @@ def test_get_background_image_no_file(monkeypatch):
     monkeypatch.setattr("app.gui._resolve_image_path", lambda filename: None)
     bg_image = _get_background_image()
     assert bg_image is None
+
+
+def _drain(job):
+    events = []
+    while True:
+        kind, payload = job.events.get(timeout=30)
+        events.append((kind, payload))
+        if kind == "done":
+            return events
+
+
+def test_generation_job_reports_progress(tmp_path, monkeypatch):
+    """
+    GenerationJob renders in the background and queues one event per file plus a final one.
+    """
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(
+        "app.gui.RenderCache", lambda logger=None: RenderCache(cache_dir, logger=logger)
+    )
+    good = tmp_path / "good.txt"
+    good.write_text("Primary 1: #FF5733\n", encoding="utf-8")
+    empty = tmp_path / "empty.txt"
+    empty.write_text("# nothing\n", encoding="utf-8")
+    job = GenerationJob([str(good), str(empty)], str(tmp_path), export_json=False)
+    job.start()
+    events = _drain(job)
+    files = [payload for kind, payload in events if kind == "file"]
+    assert sorted(os.path.basename(r.path) for r in files) == ["empty.txt", "good.txt"]
+    assert sum(1 for r in files if r.error) == 1
+    assert events[-1] == ("done", False)
+    assert job.succeeded == 1
+
+
+def test_background_cache_path_tracks_source(tmp_path, monkeypatch):
+    """
+    The cached background PNG is keyed on the source file, so edits produce a new cache entry.
+    """
+    from PIL import Image
+    from app.gui import _background_cache_path, _save_background_cache
+
+    monkeypatch.setattr("app.gui.BACKGROUND_CACHE_DIR", str(tmp_path / "assets"))
+    source = tmp_path / "background.jpeg"
+    Image.new("RGB", (10, 10), (0, 128, 255)).save(source)
+    first = _background_cache_path(str(source))
+    _save_background_cache(Image.new("RGBA", (720, 520)), first)
+    assert os.path.exists(first)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _background_cache_path(str(source)) != first
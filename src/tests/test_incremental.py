@@ -0,0 +1,112 @@
+"""
+Tests for incremental SVG patching in app.incremental.
+"""
+
+from app.generate import generate_svg_from_groups
+from app.incremental import IncrementalRenderer
+from app.palette import Palette
+
+COLORS = [
+    ("Primary", "Primary 1", "#FF0000"),
+    ("Primary", "Primary 2", "#00FF00"),
+    ("Accent", "Accent 1", "#0000FF"),
+]
+
+
+def _full_render(colors, path):
+    generate_svg_from_groups(
+        Palette.from_colors(colors),
+        "colors.txt",
+        output_file=str(path),
+        backend="string",
+    )
+    return path.read_bytes()
+
+
+def test_color_change_is_patched_in_place(tmp_path):
+    """
+    Changing a color patches the SVG to exactly what a full render produces.
+    """
+    svg_path = tmp_path / "colors.svg"
+    renderer = IncrementalRenderer()
+    assert (
+        renderer.update_svg(Palette.from_colors(COLORS), "colors.txt", str(svg_path))
+        == "full"
+    )
+    changed = list(COLORS)
+    changed[1] = ("Primary", "Primary 2", "#ABCDEF")
+    assert (
+        renderer.update_svg(Palette.from_colors(changed), "colors.txt", str(svg_path))
+        == "patched"
+    )
+    assert svg_path.read_bytes() == _full_render(changed, tmp_path / "expected.svg")
+    assert (
+        renderer.update_svg(Palette.from_colors(changed), "colors.txt", str(svg_path))
+        == "unchanged"
+    )
+
+
+def test_label_change_rewrites_swatch(tmp_path):
+    """
+    Renaming a color changes the swatch length but still matches a full render.
+    """
+    svg_path = tmp_path / "colors.svg"
+    renderer = IncrementalRenderer()
+    renderer.update_svg(Palette.from_colors(COLORS), "colors.txt", str(svg_path))
+    changed = list(COLORS)
+    changed[2] = ("Accent", "Accent 1 (Deep Blue)", "#0000FF")
+    assert (
+        renderer.update_svg(Palette.from_colors(changed), "colors.txt", str(svg_path))
+        == "patched"
+    )
+    assert svg_path.read_bytes() == _full_render(changed, tmp_path / "expected.svg")
+
+
+def test_layout_change_renders_fully(tmp_path):
+    """
+    Adding a color changes the layout, so the SVG is rendered again from scratch.
+    """
+    svg_path = tmp_path / "colors.svg"
+    renderer = IncrementalRenderer()
+    renderer.update_svg(Palette.from_colors(COLORS), "colors.txt", str(svg_path))
+    changed = COLORS + [("Accent", "Accent 2", "#FFFFFF")]
+    assert (
+        renderer.update_svg(Palette.from_colors(changed), "colors.txt", str(svg_path))
+        == "full"
+    )
+    assert svg_path.read_bytes() == _full_render(changed, tmp_path / "expected.svg")
+    assert renderer.full_renders == 2
+
+
+def test_render_file_keeps_render_cache_current(tmp_path):
+    """
+    Patched output is stored in the render cache, and reverting an edit is served
+    from the cache instead of being patched again.
+    """
+    from app.cache import RenderCache
+
+    source = tmp_path / "colors.txt"
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    cache = RenderCache(str(tmp_path / "cache"))
+    original = "Primary 1: #FF0000\nPrimary 2: #00FF00\n"
+    edited = "Primary 1: #FF0000\nPrimary 2: #ABCDEF\n"
+    renderer = IncrementalRenderer()
+
+    source.write_text(original, encoding="utf-8")
+    first = renderer.render_file(str(source), str(out_dir), cache=cache)
+    original_svg = (out_dir / "colors.svg").read_bytes()
+    source.write_text(edited, encoding="utf-8")
+    patched = renderer.render_file(str(source), str(out_dir), cache=cache)
+    assert renderer.patches == 1 and not patched.cached
+    edited_svg = (out_dir / "colors.svg").read_bytes()
+
+    source.write_text(original, encoding="utf-8")
+    reverted = renderer.render_file(str(source), str(out_dir), cache=cache)
+    assert reverted.cached and not first.cached
+    assert (out_dir / "colors.svg").read_bytes() == original_svg
+    assert renderer.patches == 1
+
+    source.write_text(edited, encoding="utf-8")
+    assert renderer.render_file(str(source), str(out_dir), cache=cache).cached
+    assert (out_dir / "colors.svg").read_bytes() == edited_svg
@@ -0,0 +1,69 @@
+"""
+Tests for the batched layout engine in app.layout.
+"""
+
+import pytest
+from app.generate import (
+    calculate_group_origins,
+    swatch_position,
+    MARGIN,
+    SWATCH_WIDTH,
+    HORIZONTAL_PADDING,
+)
+from app.layout import compute_layout
+
+GROUP_SIZES = [2, 13, 14, 1, 30]
+
+
+def _expected_positions(group_sizes):
+    positions = []
+    for origin, count in zip(calculate_group_origins(group_sizes), group_sizes):
+        positions.extend(swatch_position(origin, index) for index in range(count))
+    return positions
+
+
+def test_python_layout_matches_swatch_positions():
+    """
+    The pure-Python table places every swatch where the per-swatch helpers do.
+    """
+    layout = compute_layout(GROUP_SIZES, use_numpy=False)
+    assert list(layout.positions()) == _expected_positions(GROUP_SIZES)
+    assert layout.group_origins == calculate_group_origins(GROUP_SIZES)
+    assert layout.content_width == 13 * SWATCH_WIDTH + 12 * HORIZONTAL_PADDING
+    assert layout.dark_offset == layout.bg_height + MARGIN
+
+
+def test_numpy_layout_matches_python_layout():
+    """
+    The NumPy path yields the same table and dimensions as the fallback.
+    """
+    pytest.importorskip("numpy")
+    fast = compute_layout(GROUP_SIZES, use_numpy=True)
+    slow = compute_layout(GROUP_SIZES, use_numpy=False)
+    assert list(fast.positions()) == list(slow.positions())
+    assert fast.group_origins == slow.group_origins
+    assert (fast.content_width, fast.content_height) == (
+        slow.content_width,
+        slow.content_height,
+    )
+
+
+@pytest.mark.parametrize("group_sizes", [GROUP_SIZES, [1], [5, 0, 3], [13 * 40]])
+def test_content_dimensions_match_layout_without_table(group_sizes, monkeypatch):
+    """
+    The dimensions used by streaming come from the row counts alone and match the
+    layout table's, without the table being built.
+    """
+    from app import layout as layout_module
+    from app.generate import calculate_dimensions_from_counts
+
+    expected = compute_layout(group_sizes, use_numpy=False)
+
+    def no_table(*args, **kwargs):
+        raise AssertionError("coordinate table built")
+
+    monkeypatch.setattr(layout_module, "compute_layout", no_table)
+    assert calculate_dimensions_from_counts(group_sizes) == (
+        expected.content_width,
+        expected.content_height,
+    )
@@ -2,6 +2,7 @@
 Tests for the main entry point of InkGrid.
 """
 
+import os
 import sys
 import pytest
 from app.main import main, parse_command_line_arguments
@@ -98,3 +99,40 @@ def test_main_exception(monkeypatch):
     with pytest.raises(SystemExit) as exc_info:
         main()
     assert exc_info.value.code == 1
+
+
+def test_main_headless_batch(monkeypatch, tmp_path):
+    """
+    Tests that palette inputs run the headless batch instead of the GUI.
+    """
+    palette = tmp_path / "colors.txt"
+    palette.write_text("Primary 1: #FF5733\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    monkeypatch.setattr(
+        sys, "argv", ["main.py", str(palette), "-o", str(out_dir), "-w", "1"]
+    )
+    monkeypatch.setattr("app.main.run_app", dummy_run_app_exception)
+    main()
+    assert (out_dir / "colors.svg").exists()
+    assert (out_dir / "colors_figma_tokens.json").exists()
+
+
+def test_headless_import_skips_gui_and_svgwrite():
+    """
+    Importing app.main does not load tkinter, PIL or svgwrite.
+    """
+    import subprocess
+
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('tkinter', 'PIL', 'svgwrite') if m in sys.modules))"
+    )
+    src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=src_dir),
+        check=True,
+    )
+    assert completed.stdout.strip() == "[]"
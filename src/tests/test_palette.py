@@ -0,0 +1,88 @@
+"""
+Tests for the compact Palette container in app.palette.
+"""
+
+from collections import OrderedDict
+import pytest
+from app.palette import Palette
+
+
+@pytest.fixture
+def colors():
+    """
+    Returns color tuples with the Primary group split across the list.
+    """
+    return [
+        ("Primary", "Primary 1", "#FF0000"),
+        ("Secondary", "Secondary 1", "#00FF00"),
+        ("Primary", "Primary 2", "#0000FF"),
+    ]
+
+
+def test_from_colors_groups_rows(colors):
+    """
+    Rows are regrouped stably by first appearance of their group.
+    """
+    palette = Palette.from_colors(colors)
+    assert palette.groups == ["Primary", "Secondary"]
+    assert list(palette.offsets) == [0, 2, 3]
+    assert palette.group_sizes() == [2, 1]
+    assert list(palette) == [colors[0], colors[2], colors[1]]
+    assert palette.label(1) == "Primary 2"
+    assert palette.hex(2) == "#00FF00"
+
+
+def test_items_matches_ordered_dict(colors):
+    """
+    items() yields the same structure as the legacy OrderedDict of (label, hex) pairs.
+    """
+    grouped = OrderedDict()
+    for group, label, color in colors:
+        grouped.setdefault(group, []).append((label, color))
+    palette = Palette.from_colors(grouped)
+    assert list(palette.items()) == list(grouped.items())
+    assert palette == Palette.from_colors(colors)
+
+
+def test_from_file(tmp_path):
+    """
+    from_file parses a color file into a Palette.
+    """
+    source = tmp_path / "colors.txt"
+    source.write_text("Accent 1: #123456\n# comment\nAccent 2: #abcdef\n")
+    palette = Palette.from_file(str(source))
+    assert list(palette) == [
+        ("Accent", "Accent 1", "#123456"),
+        ("Accent", "Accent 2", "#ABCDEF"),
+    ]
+
+
+@pytest.mark.parametrize("color", ["red", "#12345", "#12_345", "#GGGGGG"])
+def test_from_colors_rejects_invalid_hex(color):
+    """
+    Colors that are not '#RRGGBB' hex codes are rejected.
+    """
+    with pytest.raises(ValueError):
+        Palette.from_colors([("Primary", "Primary 1", color)])
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "B 1: #000001\nA 1: #000002\nB 2: #000003\n",
+        "Grün 1: #010203\nRot 1: #040506\nGrün 2 Hell: #070809\n",
+    ],
+)
+def test_from_file_mapped_matches_text(tmp_path, monkeypatch, text):
+    """
+    Large files read through map_file give the same Palette as the text parser.
+    """
+    from app import palette as palette_module
+
+    source = tmp_path / "colors.txt"
+    source.write_text(text, encoding="utf-8")
+    expected = Palette.from_file(str(source))
+    monkeypatch.setattr(palette_module, "MAP_THRESHOLD", 0)
+    mapped = Palette.from_file(str(source))
+    assert mapped == expected
+    assert list(mapped) == list(expected)
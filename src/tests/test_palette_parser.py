@@ -0,0 +1,161 @@
+"""
+Tests for the unified palette parser in app.palette_parser.
+"""
+
+import pytest
+from app.palette_parser import parse_text, iter_entries, format_hex
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Primary 4 (Main): #2ECC71\n", ("Primary", "Primary 4 (Main)", 0x2ECC71)),
+        ("Blue Gray 100 : #abcdef", ("Blue Gray", "Blue Gray 100", 0xABCDEF)),
+        ("Background: #000000", ("Background", "Background", 0x000000)),
+        ("\tSet 2 Blue 5:#010203 \n", ("Set", "Set 2 Blue 5", 0x010203)),
+    ],
+)
+def test_iter_entries_valid_lines(line, expected):
+    """
+    Group, label and packed color follow the 'Group Number [descriptor]: #RRGGBB' format.
+    """
+    assert list(iter_entries([line])) == [expected]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "",
+        "# Primary 1: #FFFFFF",
+        "Primary 1: ",
+        "Primary 1: #FFF",
+        "Primary 1: #FFFFFF extra",
+        "Primary 1: #GGGGGG",
+        "no colon #FFFFFF",
+    ],
+)
+def test_iter_entries_skips_invalid_lines(line):
+    """
+    Comments, blank lines and invalid hex codes are skipped.
+    """
+    assert list(iter_entries([line])) == []
+
+
+def test_parse_text_columnar_result():
+    """
+    parse_text interns group names and stores colors as packed ints.
+    """
+    parsed = parse_text(
+        "# Comment: #FFFFFF\n"
+        "Primary 1: #FF0000\r\n"
+        "\n"
+        "Secondary 1: #00FF00\n"
+        "Primary 2: #0000ff"
+    )
+    assert parsed.groups == ["Primary", "Secondary"]
+    assert list(parsed.group_index) == [0, 1, 0]
+    assert list(parsed.rgb) == [0xFF0000, 0x00FF00, 0x0000FF]
+    assert list(parsed)[2] == ("Primary", "Primary 2", "#0000FF")
+    assert len(parsed) == 3
+
+
+def test_format_hex():
+    """
+    Packed colors are formatted as uppercase hex codes.
+    """
+    assert format_hex(0x0A0B0C) == "#0A0B0C"
+
+
+def test_parse_text_matches_line_parser():
+    """
+    Whole-text and line-by-line parsing agree, including on malformed lines.
+    """
+    lines = [
+        "Primary 1: #FF0000\n",
+        "Primary 2 (Main) : #ABCDEF  \n",
+        "Broken: #12345\n",
+        "   \n",
+        "Dark Gray: #101010\n",
+    ]
+    parsed = parse_text("".join(lines))
+    assert [
+        (group, label, int(color[1:], 16)) for group, label, color in parsed
+    ] == list(iter_entries(lines))
+
+
+def test_parse_text_empty():
+    """
+    Files without colors produce an empty result.
+    """
+    parsed = parse_text("# nothing here\n\n")
+    assert len(parsed) == 0
+    assert parsed.groups == []
+
+
+def test_map_file_matches_parse_file(tmp_path):
+    """
+    The memory-mapped parser yields the same colors as the text parser.
+    """
+    from app.palette_parser import map_file, parse_file
+
+    source = tmp_path / "palette.txt"
+    source.write_text(
+        "# Palette\nGrün 1 (Main): #00ff00\n\nDark Gray 2: #101010\r\nBad: #12\n",
+        encoding="utf-8",
+    )
+    with map_file(str(source)) as mapped:
+        assert list(mapped) == list(parse_file(str(source)))
+        assert mapped.groups == ["Grün", "Dark Gray"]
+        assert mapped.label(0) == "Grün 1 (Main)"
+        assert list(mapped.rgb) == [0x00FF00, 0x101010]
+
+
+def test_map_file_empty(tmp_path):
+    """
+    Empty files cannot be mapped and produce an empty result.
+    """
+    from app.palette_parser import map_file
+
+    source = tmp_path / "empty.txt"
+    source.write_bytes(b"")
+    with map_file(str(source)) as mapped:
+        assert len(mapped) == 0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Grün 1 (Main): #00ff00\nDark Gray 2: #101010\n",
+        "Primary\u00a01: #FF0000\nPrimary x\u20032: #00FF00\n",
+        "Accent \u0663: #0000FF\nAccent 1 (Main): #ABCDEF\n",
+        "Sep\x1c1: #111111\nCJK \u8272 1: #222222\n",
+    ],
+)
+def test_map_file_matches_text_parser_on_unicode(tmp_path, text):
+    """
+    Non-ASCII whitespace and digits are matched like the str pattern does.
+    """
+    from app.palette_parser import map_file
+
+    source = tmp_path / "palette.txt"
+    source.write_bytes(text.encode("utf-8"))
+    with map_file(str(source)) as mapped:
+        assert list(mapped) == list(parse_text(text))
+        assert mapped.groups == parse_text(text).groups
+
+
+def test_parse_file_maps_large_files(tmp_path, monkeypatch):
+    """
+    Above MAP_THRESHOLD parse_file reads through map_file with the same result.
+    """
+    from app import palette_parser
+
+    text = "".join(f"Group {i % 7} {i}: #{i:06X}\n" for i in range(500))
+    text += "Grün 1: #00FF00\n"
+    source = tmp_path / "palette.txt"
+    source.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(palette_parser, "MAP_THRESHOLD", 0)
+    parsed = palette_parser.parse_file(str(source))
+    expected = parse_text(text)
+    assert list(parsed) == list(expected)
+    assert parsed.labels == expected.labels
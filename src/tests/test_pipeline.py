@@ -0,0 +1,66 @@
+"""
+Tests for the asynchronous batch pipeline in app.pipeline.
+"""
+
+import os
+import gzip
+import pytest
+from app.batch import run_batch
+from app.pipeline import run_pipeline
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    directory = tmp_path / "in"
+    directory.mkdir()
+    for i in range(6):
+        (directory / f"p{i}.txt").write_text(
+            "".join(
+                f"Group{j % 3} {j}: #{j * 4099 % 0xFFFFFF:06X}\n" for j in range(40)
+            ),
+            encoding="utf-8",
+        )
+    (directory / "empty.txt").write_text("# only a comment\n", encoding="utf-8")
+    return directory
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_matches_run_batch(inputs, tmp_path, workers):
+    """
+    The pipeline writes the same files as run_batch, also with a one-slot queue,
+    and reports the empty palette as failed.
+    """
+    results = run_pipeline(
+        [str(inputs)],
+        str(tmp_path / "pipeline"),
+        backend="string",
+        workers=workers,
+        queue_size=1,
+        formats=("css",),
+    )
+    run_batch(
+        [str(inputs)],
+        str(tmp_path / "batch"),
+        workers=1,
+        backend="string",
+        formats=("css",),
+    )
+    assert len(results) == 7
+    failed = [r for r in results if r.error]
+    assert [os.path.basename(r.path) for r in failed] == ["empty.txt"]
+    names = sorted(os.listdir(tmp_path / "batch"))
+    assert sorted(os.listdir(tmp_path / "pipeline")) == names
+    for name in names:
+        expected = (tmp_path / "batch" / name).read_bytes()
+        assert (tmp_path / "pipeline" / name).read_bytes() == expected
+
+
+def test_pipeline_compressed_output(inputs, tmp_path):
+    results = run_pipeline(
+        [str(inputs / "p0.txt")], str(tmp_path / "out"), compression="gzip"
+    )
+    (result,) = results
+    assert result.svg_path.endswith(".svgz")
+    with gzip.open(result.svg_path, "rt", encoding="utf-8") as f:
+        assert f.read().endswith("</svg>")
+    assert result.json_path.endswith(".json.gz")
@@ -0,0 +1,69 @@
+"""
+Tests for stage timing and profiling in app.profiling.
+"""
+
+import json
+import sys
+from app.main import main
+from app.profiling import StageProfiler
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message):
+        self.messages.append(message)
+
+
+def test_stage_summary_percentiles():
+    """
+    Recorded samples are aggregated into counts and nearest-rank percentiles.
+    """
+    profiler = StageProfiler()
+    for ms in range(1, 101):
+        profiler.record("render", ms / 1000)
+    with profiler.stage("parse"):
+        pass
+    summary = profiler.summary()
+    assert summary["render"]["count"] == 100
+    assert summary["render"]["p50_ms"] == 50
+    assert summary["render"]["p99_ms"] == 99
+    assert summary["render"]["max_ms"] == 100
+    assert summary["parse"]["count"] == 1
+
+
+def test_log_summary_emits_json_lines():
+    """
+    Each stage is logged as one JSON object.
+    """
+    profiler = StageProfiler()
+
+    @profiler.timed("export_json")
+    def export():
+        return "done"
+
+    assert export() == "done"
+    logger = RecordingLogger()
+    profiler.log_summary(logger)
+    record = json.loads(logger.messages[0])
+    assert record["event"] == "stage_timing"
+    assert record["stage"] == "export_json"
+    assert record["count"] == 1
+
+
+def test_profile_flag_writes_captures(monkeypatch, tmp_path):
+    """
+    --profile stores cProfile and tracemalloc output in the output directory.
+    """
+    palette = tmp_path / "colors.txt"
+    palette.write_text("Primary 1: #FF5733\n", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main.py", str(palette), "-o", str(out_dir), "-w", "1", "--profile"],
+    )
+    main()
+    assert len(list(out_dir.glob("inkgrid_profile_*.prof"))) == 1
+    assert len(list(out_dir.glob("inkgrid_profile_*.tracemalloc.txt"))) == 1
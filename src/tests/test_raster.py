@@ -0,0 +1,50 @@
+"""
+Tests for the PNG preview renderer in app.raster.
+"""
+
+import pytest
+from app.layout import layout_for
+from app.palette import Palette
+from app.raster import render_png
+
+PIL = pytest.importorskip("PIL")
+
+
+@pytest.fixture
+def palette():
+    colors = [("Primary", f"Primary {i}", f"#{i * 16:02X}3366") for i in range(1, 15)]
+    colors.append(("Accent", "Accent", "#3357FF"))
+    return Palette.from_colors(colors)
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+def test_render_png_matches_svg_geometry(palette, tmp_path, scale):
+    """
+    The PNG has the SVG's size times scale and each swatch is drawn at its layout
+    position in both the light and the dark half.
+    """
+    from PIL import Image
+
+    output = render_png(palette, str(tmp_path / "p.png"), scale)
+    layout = layout_for(palette)
+    image = Image.open(output).convert("RGB")
+    assert image.size == (
+        round(layout.svg_width * scale),
+        round(layout.svg_height * scale),
+    )
+    colors = [color for _, _, color in palette]
+    for color, (x, y) in zip(colors, layout.positions()):
+        expected = tuple(int(color[i : i + 2], 16) for i in (1, 3, 5))
+        for top in (y, y + layout.dark_offset):
+            center = (round((x + 60) * scale), round((top + 60) * scale))
+            assert image.getpixel(center) == expected
+    assert image.getpixel((round(5 * scale), round(layout.bg_height / 2 * scale))) == (
+        255,
+        255,
+        255,
+    )
+
+
+def test_render_png_rejects_non_positive_scale(palette, tmp_path):
+    with pytest.raises(ValueError):
+        render_png(palette, str(tmp_path / "p.png"), 0)
@@ -0,0 +1,154 @@
+"""
+Tests for the local render service and its client in app.service.
+"""
+
+import os
+import socket
+import stat
+import threading
+import pytest
+from app.service import RenderService, ServiceError, request
+
+PALETTE = "Primary 1: #FF5733\nPrimary 2: #33FF57\n"
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    """
+    Runs a one-worker service on a free port for the tests in this module.
+    """
+    token_file = str(tmp_path_factory.mktemp("service") / "service.token")
+    service = RenderService(port=0, workers=1, token_file=token_file)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    host, port = service.address
+    address = {"host": host, "port": port, "token_file": token_file}
+    yield address
+    request("/shutdown", {}, **address)
+    thread.join(10)
+    assert not os.path.exists(token_file)
+
+
+def _status(service, head, body=b""):
+    """
+    Sends a hand-written request and returns the response status.
+    """
+    with socket.create_connection((service["host"], service["port"])) as conn:
+        conn.sendall(head.encode("ascii") + body)
+        return int(conn.recv(65536).split(b" ", 2)[1])
+
+
+def test_health(service):
+    health = request("/health", **service)
+    assert health["status"] == "ok"
+    assert health["workers"] == 1
+
+
+def test_render_path_writes_outputs(service, tmp_path):
+    palette = tmp_path / "brand.txt"
+    palette.write_text(PALETTE, encoding="utf-8")
+    result = request(
+        "/render",
+        {
+            "path": str(palette),
+            "output_dir": str(tmp_path / "out"),
+            "backend": "string",
+        },
+        **service,
+    )
+    assert result["error"] is None
+    assert result["svg_path"] == str(tmp_path / "out" / "brand.svg")
+    assert (tmp_path / "out" / "brand_figma_tokens.json").exists()
+
+
+def test_render_text_returns_documents(service):
+    result = request("/render", {"text": PALETTE, "compact_json": True}, **service)
+    assert result["svg"].endswith("</svg>")
+    assert result["json"] == '{"Primary":{"Primary 1":"#FF5733","Primary 2":"#33FF57"}}'
+
+    empty = request("/render", {"text": "# nothing\n"}, **service)
+    assert empty["error"] == "No valid colors found."
+
+
+def test_bad_requests_raise(service):
+    with pytest.raises(ServiceError):
+        request("/render", {"colors": PALETTE}, **service)
+    with pytest.raises(ServiceError):
+        request("/unknown", **service)
+
+
+def test_unreachable_service(tmp_path):
+    token_file = tmp_path / "service.token"
+    token_file.write_text("token")
+    with pytest.raises(ServiceError, match="not reachable"):
+        request("/health", port=1, token_file=str(token_file))
+
+
+def test_token_file_is_private(service):
+    mode = stat.S_IMODE(os.stat(service["token_file"]).st_mode)
+    assert os.name == "nt" or mode == 0o600
+
+
+def test_requests_without_token_or_from_browsers_are_rejected(service, tmp_path):
+    """
+    Missing tokens, foreign Host or Origin headers and non-JSON posts (what a web
+    page can send) are refused before anything is rendered or stopped.
+    """
+    with open(service["token_file"]) as f:
+        token = f.read()
+    host = f"{service['host']}:{service['port']}"
+    body = b'{"text": "Primary 1: #FF5733"}'
+
+    def post(**headers):
+        headers = dict(
+            {
+                "Host": host,
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "Content-Length": str(len(body)),
+            },
+            **headers,
+        )
+        lines = "".join(f"{k}: {v}\r\n" for k, v in headers.items() if v)
+        return _status(service, f"POST /render HTTP/1.1\r\n{lines}\r\n", body)
+
+    assert post() == 200
+    assert post(Authorization=None) == 401
+    assert post(Authorization="Bearer wrong") == 401
+    assert post(Host="localhost") == 200
+    assert post(Host=f"localhost:{service['port']}") == 200
+    assert post(Host=f"[::1]:{service['port']}") == 200
+    assert post(Host="evil.example:8765") == 403
+    assert post(Host="[::ffff:8.8.8.8]:8765") == 403
+    assert post(Origin="http://evil.example") == 403
+    assert post(**{"Content-Type": "text/plain"}) == 415
+
+    missing = str(tmp_path / "missing.token")
+    with pytest.raises(ServiceError):
+        request(
+            "/health", host=service["host"], port=service["port"], token_file=missing
+        )
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("localhost", True),
+        ("127.0.0.1:8765", True),
+        ("[::1]", True),
+        ("[::1]:8765", True),
+        ("::1", True),
+        ("[::2]:8765", False),
+        ("example.com", False),
+        ("", False),
+    ],
+)
+def test_is_loopback_host(host, expected):
+    from app.service import _is_loopback_host
+
+    assert _is_loopback_host(host) is expected
+
+
+def test_service_only_listens_on_loopback():
+    with pytest.raises(ValueError):
+        RenderService(host="0.0.0.0", port=0, workers=1)
@@ -0,0 +1,246 @@
+"""
+Tests for the string-emitting SVG backend in app.svg_writer.
+"""
+
+import io
+import pytest
+from app.generate import generate_svg_from_groups
+
+
+@pytest.fixture
+def sample_colors():
+    """
+    Returns colors spanning several rows, groups and characters that need escaping.
+    """
+    colors = [("Primary", f"Primary {i}", f"#{i:02X}5733") for i in range(1, 16)]
+    colors += [
+        ("Secondary", "Secondary 1 (Main) & <Dark>", "#33FF57"),
+        ("Primary", "Primary 16", "#F2F2F2"),
+        ("Accent", "Accent", "#3357FF"),
+    ]
+    return colors
+
+
+def test_string_backend_matches_svgwrite(sample_colors, tmp_path):
+    """
+    The string backend produces byte-identical output to the svgwrite backend.
+    """
+    svgwrite_file = tmp_path / "svgwrite.svg"
+    string_file = tmp_path / "string.svg"
+    generate_svg_from_groups(sample_colors, "in.txt", output_file=str(svgwrite_file))
+    generate_svg_from_groups(
+        sample_colors, "in.txt", output_file=str(string_file), backend="string"
+    )
+    assert string_file.read_bytes() == svgwrite_file.read_bytes()
+
+
+def test_write_svg_layers():
+    """
+    write_svg emits the three expected layers into any text file object.
+    """
+    from collections import OrderedDict
+    from app.svg_writer import write_svg
+
+    grouped = OrderedDict(Primary=[("Primary 1", "#FF5733")])
+    buffer = io.StringIO()
+    write_svg(buffer, grouped, 200, 280, 40)
+    svg = buffer.getvalue()
+    for layer in ("Backgrounds", "LightModeSwatches", "DarkModeSwatches"):
+        assert f'<g id="{layer}">' in svg
+    assert svg.endswith("</svg>")
+
+
+@pytest.mark.parametrize("shared_dark", [False, True])
+def test_group_templates_match_direct_output(sample_colors, shared_dark):
+    """
+    Groups are byte-identical whether formatted directly on first sight, turned into
+    a template on the second or served from it afterwards, including labels with
+    braces.
+    """
+    from app.layout import layout_for
+    from app.palette import Palette
+    from app.svg_writer import GroupTemplates, write_svg
+
+    palette = Palette.from_colors(sample_colors + [("Curly", "Curly {1}", "#ABCDEF")])
+    layout = layout_for(palette)
+    args = (palette, layout.svg_width, layout.bg_height, layout.gap_between, layout)
+    templates = GroupTemplates()
+    renders = len(list(palette.values())) * (1 if shared_dark else 2)
+    for _ in range(3):
+        direct, cached = io.StringIO(), io.StringIO()
+        write_svg(direct, *args, shared_dark)
+        write_svg(cached, *args, shared_dark, templates)
+        assert cached.getvalue() == direct.getvalue()
+        if not templates.hits:
+            assert len(templates._templates) in (0, renders)
+    assert templates.misses == renders
+    assert templates.hits == renders
+
+
+def test_group_templates_are_bounded_by_size():
+    """
+    A group only recurs from its second occurrence on, and templates beyond
+    max_bytes are evicted least recently used first.
+    """
+    from app.svg_writer import GroupTemplates
+
+    groups = [((f"Color {i}", "#FFFFFF"),) for i in range(3)]
+    templates = GroupTemplates(max_bytes=600)
+    assert [templates.recurs(entries) for entries in groups] == [False] * 3
+    assert [templates.recurs(entries) for entries in groups] == [True] * 3
+    for entries in groups:
+        templates.render(entries, [(0, 0)], 0, "black")
+    assert 0 < templates.size <= 600
+    assert len(templates._templates) < 3
+
+
+def test_unknown_backend_raises(sample_colors, tmp_path):
+    """
+    Unknown backend names are rejected.
+    """
+    with pytest.raises(ValueError):
+        generate_svg_from_groups(
+            sample_colors, "in.txt", str(tmp_path / "x.svg"), backend="cairo"
+        )
+
+
+def test_stream_svg_matches_string_backend(sample_colors, tmp_path):
+    """
+    Streaming from a file with contiguous groups matches the in-memory backend.
+    """
+    from app.generate import generate_svg_streaming
+    from app.utils import read_color_file
+
+    source = tmp_path / "palette.txt"
+    grouped = sorted(sample_colors, key=lambda c: c[0])
+    source.write_text(
+        "\n".join(f"{label}: {color}" for _, label, color in grouped),
+        encoding="utf-8",
+    )
+    expected = tmp_path / "expected.svg"
+    streamed = tmp_path / "streamed.svg"
+    generate_svg_from_groups(
+        read_color_file(str(source)), str(source), str(expected), backend="string"
+    )
+    generate_svg_streaming(str(source), str(streamed))
+    assert streamed.read_bytes() == expected.read_bytes()
+
+
+def test_stream_svg_without_colors_raises(tmp_path):
+    """
+    A file without valid colors is reported like in batch mode and writes nothing.
+    """
+    from app.svg_writer import stream_svg
+
+    source = tmp_path / "empty.txt"
+    source.write_text("# only a comment\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="No valid colors found."):
+        stream_svg(str(source), str(tmp_path / "empty.svg"))
+    assert not (tmp_path / "empty.svg").exists()
+
+
+def test_shared_backend_uses_light_layer_for_dark_mode(sample_colors, tmp_path):
+    """
+    The shared backend keeps both layer names, draws every swatch once and
+    instantiates the light layer as the dark one with white text.
+    """
+    import xml.etree.ElementTree as ET
+
+    string_file = tmp_path / "string.svg"
+    shared_file = tmp_path / "shared.svg"
+    generate_svg_from_groups(
+        sample_colors, "in.txt", output_file=str(string_file), backend="string"
+    )
+    generate_svg_from_groups(
+        sample_colors, "in.txt", output_file=str(shared_file), backend="shared"
+    )
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    root = ET.parse(shared_file).getroot()
+    light = root.find("svg:g[@id='LightModeSwatches']", ns)
+    dark = root.find("svg:g[@id='DarkModeSwatches']", ns)
+    assert len(light) == len(sample_colors)
+    assert root.get("color") == "black"
+    assert {t.get("fill") for t in light.iter("{%s}text" % ns["svg"])} == {
+        "currentColor"
+    }
+
+    (use,) = list(dark)
+    assert use.get("{http://www.w3.org/1999/xlink}href") == "#LightModeSwatches"
+    assert use.get("color") == "white"
+    string_dark = (
+        ET.parse(string_file).getroot().find("svg:g[@id='DarkModeSwatches']", ns)
+    )
+    first_light_y = int(light[0][0].get("y"))
+    first_dark_y = int(string_dark[0][0].get("y"))
+    assert int(use.get("y")) == first_dark_y - first_light_y
+    assert shared_file.stat().st_size < string_file.stat().st_size * 0.6
+
+
+def test_compact_backend_is_at_least_three_times_smaller(tmp_path):
+    """
+    The compact backend keeps the layers, deduplicates ids and is at least 3x smaller.
+    """
+    import xml.etree.ElementTree as ET
+
+    colors = [(f"Group {i % 7}", f"Group {i % 7} {i}", "#336699") for i in range(200)]
+    colors.append(("Group 0", "Group 0 0", "#FFFFFF"))
+    svgwrite_file = tmp_path / "svgwrite.svg"
+    compact_file = tmp_path / "compact.svg"
+    generate_svg_from_groups(colors, "in.txt", output_file=str(svgwrite_file))
+    generate_svg_from_groups(
+        colors, "in.txt", output_file=str(compact_file), backend="compact"
+    )
+    assert svgwrite_file.stat().st_size >= 3 * compact_file.stat().st_size
+
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    root = ET.parse(compact_file).getroot()
+    light = root.find("svg:g[@id='LightModeSwatches']", ns)
+    assert len(light) == len(colors)
+    ids = [swatch.get("id") for swatch in light]
+    assert len(set(ids)) == len(ids)
+    assert root.find("svg:defs/svg:symbol[@id='s']", ns) is not None
+    dark = root.find("svg:g[@id='DarkModeSwatches']", ns)
+    assert dark[0].get("{http://www.w3.org/1999/xlink}href") == "#LightModeSwatches"
+
+
+def test_compact_ids_avoid_reserved_and_empty_ids(tmp_path):
+    """
+    A swatch labelled like the shared symbol does not take its id, and labels that
+    sanitize to nothing get a position-based id instead of an empty one.
+    """
+    import xml.etree.ElementTree as ET
+
+    colors = [("s", "s", "#FF0000"), ("!!!", "!!!", "#00FF00")]
+    compact_file = tmp_path / "compact.svg"
+    generate_svg_from_groups(
+        colors, "in.txt", output_file=str(compact_file), backend="compact"
+    )
+    root = ET.parse(compact_file).getroot()
+    ids = [element.get("id") for element in root.iter() if element.get("id")]
+    assert ids.count("s") == 1
+    assert "" not in [element.get("id") for element in root.iter()]
+    assert len(set(ids)) == len(ids)
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    assert root.find("svg:defs/svg:symbol[@id='s']", ns) is not None
+
+
+def test_swatch_fragments_are_reused():
+    """
+    Swatch markup is built from cached fragments; labels with braces and markup
+    characters are escaped once, and the same swatch in the other layer (text color)
+    or at another position is a cache hit.
+    """
+    from app.svg_writer import fragment_stats, swatch_markup
+
+    label = "Brand {1} & <Dark>"
+    first = swatch_markup(label, "#ABCDEF", 20, 60, "black")
+    before = fragment_stats()
+    second = swatch_markup(label, "#ABCDEF", 160, 360, "white")
+    after = fragment_stats()
+    assert ">Brand {1} &amp; &lt;Dark&gt;</text>" in first
+    assert 'x="20" y="60"' in first
+    assert 'x="160" y="360"' in second
+    assert 'fill="white"' in second
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+    assert 0 < after["hit_rate"] <= 1
@@ -5,7 +5,7 @@ Tests for utility functions in app.utils.
 import os
 import tempfile
 import pytest
-from app.utils import read_color_file, sanitize_id
+from app.utils import read_color_file, sanitize_id, compressed_path, open_output
 
 
 def test_read_color_file_valid():
@@ -55,3 +55,42 @@ def test_sanitize_id():
     """
     assert sanitize_id("Some Group") == "Some_Group"
     assert sanitize_id("123 Group!") == "123_Group"
+
+
+def test_compressed_path():
+    assert compressed_path("out/a.svg") == "out/a.svg"
+    assert compressed_path("out/a.svg", "gzip") == "out/a.svgz"
+    assert compressed_path("out/a.json", "gzip") == "out/a.json.gz"
+    assert compressed_path("out/a.svg", "xz") == "out/a.svg.xz"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+def test_open_output_round_trip(tmp_path, compression):
+    """
+    open_output compresses text on the fly; the stdlib opener reads it back.
+    """
+    import bz2
+    import gzip
+    import lzma
+
+    openers = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+    path = str(tmp_path / compressed_path("a.svg", compression))
+    with open_output(path, compression, 1) as f:
+        f.write("<svg>\u00e9</svg>")
+    with openers[compression](path, "rt", encoding="utf-8") as f:
+        assert f.read() == "<svg>\u00e9</svg>"
+
+
+def test_open_output_gzip_is_reproducible(tmp_path):
+    paths = [str(tmp_path / name / "a.svgz") for name in ("one", "two")]
+    for path in paths:
+        os.makedirs(os.path.dirname(path))
+        with open_output(path, "gzip") as f:
+            f.write("same content")
+    with open(paths[0], "rb") as a, open(paths[1], "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_open_output_rejects_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        open_output(str(tmp_path / "a.svg"), "zip")
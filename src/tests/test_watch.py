@@ -0,0 +1,74 @@
+"""
+Tests for the palette watch mode in app.watch.
+"""
+
+import os
+from app.watch import PaletteWatcher
+
+
+def _touch(path, content):
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_scan_reports_new_and_changed_files(tmp_path):
+    """
+    scan() returns only files whose size or modification time changed.
+    """
+    a = tmp_path / "a.txt"
+    b = tmp_path / "b.txt"
+    a.write_text("Primary 1: #FF0000\n")
+    b.write_text("Primary 1: #00FF00\n")
+    watcher = PaletteWatcher([str(tmp_path)], str(tmp_path / "out"))
+    assert sorted(watcher.scan()) == [str(a), str(b)]
+    assert watcher.scan() == []
+    _touch(a, "Primary 1: #0000FF\n")
+    assert watcher.scan() == [str(a)]
+
+
+def test_burst_of_changes_renders_once(tmp_path):
+    """
+    Several saves within the debounce window result in a single render of the file.
+    """
+    palette = tmp_path / "colors.txt"
+    palette.write_text("Primary 1: #FF0000\n")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    watcher = PaletteWatcher(
+        [str(palette)], str(out_dir), export_json=False, debounce=0.2
+    )
+    watcher.start()
+    try:
+        for color in ("00FF00", "0000FF", "123456"):
+            _touch(palette, f"Primary 1: #{color}\n")
+            watcher.poll()
+        assert watcher.wait_idle(timeout=5)
+    finally:
+        watcher.stop()
+    assert watcher.renders == 1
+    assert "#123456" in (out_dir / "colors.svg").read_text(encoding="utf-8")
+
+
+def test_first_edit_after_start_is_patched(tmp_path):
+    """
+    Files rendered before the watcher starts are patched on their first edit.
+    """
+    from app.batch import render_file
+
+    palette = tmp_path / "colors.txt"
+    palette.write_text("Primary 1: #FF0000\nPrimary 2: #00FF00\n")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    render_file(str(palette), str(out_dir), export_json=False)
+    watcher = PaletteWatcher([str(palette)], str(out_dir), export_json=False)
+    watcher.start()
+    try:
+        _touch(palette, "Primary 1: #FF0000\nPrimary 2: #123456\n")
+        watcher.poll()
+        assert watcher.wait_idle(timeout=5)
+    finally:
+        watcher.stop()
+    assert watcher.incremental.patches == 1
+    assert watcher.incremental.full_renders == 0
+    assert "#123456" in (out_dir / "colors.svg").read_text(encoding="utf-8")